@@ -6,6 +6,8 @@ from typing import TYPE_CHECKING
 
 from dev_tools.utils.build_file_parsing_utils import find_rule_calls, rule_has_tag
 from dev_tools.utils.git_hook_utils import create_default_parser
+from dev_tools.utils.profiling import profiled
+from dev_tools.utils.result_cache import check_files
 
 if TYPE_CHECKING:
     import argparse
@@ -14,43 +16,50 @@ if TYPE_CHECKING:
 
 
 def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
-    parser = create_default_parser()
+    parser = create_default_parser(cacheable=True)
     parser.add_argument("--forbidden-tag", required=True)
     parser.add_argument("--allow-in-rule-kind")
     return parser.parse_args(argv)
 
 
-def find_files_with_forbidden_tags(
-    filenames: Sequence[Path],
+def has_forbidden_tag(
+    content: str,
     forbidden_tag: str,
     allowed_rule_kind_re: re.Pattern[str] | None,
-) -> list[Path]:
-    return [
-        filename
-        for filename in filenames
-        if any(
-            not (allowed_rule_kind_re and allowed_rule_kind_re.search(rule_call.rule_kind))
-            and rule_has_tag(rule_call.body, forbidden_tag)
-            for rule_call in find_rule_calls(filename.read_text())
-        )
-    ]
+) -> bool:
+    return any(
+        not (allowed_rule_kind_re and allowed_rule_kind_re.search(rule_call.rule_kind))
+        and rule_has_tag(rule_call.body, forbidden_tag)
+        for rule_call in find_rule_calls(content)
+    )
 
 
-def main(argv: Sequence[str] | None = None) -> int:
-    args = parse_args(argv)
+def check_file_content(filename: Path, content: str, args: argparse.Namespace) -> list[str]:
     allowed_rule_kind_re = re.compile(args.allow_in_rule_kind) if args.allow_in_rule_kind else None
-    invalid_files = find_files_with_forbidden_tags(args.filenames, args.forbidden_tag, allowed_rule_kind_re)
-
-    for filename in invalid_files:
-        if args.allow_in_rule_kind:
-            print(
+    if not has_forbidden_tag(content, args.forbidden_tag, allowed_rule_kind_re):
+        return []
+    if args.allow_in_rule_kind:
+        return [
+            (
                 f"Error: {filename} contains a rule with `tags` containing `{args.forbidden_tag}` outside "
                 f"a rule kind matching /{args.allow_in_rule_kind}/."
             )
-        else:
-            print(f"Error: {filename} contains a rule with `tags` containing `{args.forbidden_tag}`.")
+        ]
+    return [f"Error: {filename} contains a rule with `tags` containing `{args.forbidden_tag}`."]
+
+
+@profiled
+def main(argv: Sequence[str] | None = None) -> int:
+    args = parse_args(argv)
+    diagnostics = check_files(
+        args, "check-forbidden-tags", lambda filename: check_file_content(filename, filename.read_text(), args)
+    )
+
+    errors = [error for errors in diagnostics.values() for error in errors]
+    for error in errors:
+        print(error)
 
-    return 1 if invalid_files else 0
+    return 1 if errors else 0
 
 
 if __name__ == "__main__":
@@ -7,12 +7,18 @@ import re
 import sys
 from typing import TYPE_CHECKING, TypedDict
 
-from dev_tools.utils.git_hook_utils import parse_arguments
+from dev_tools.utils.git_diff_utils import filter_changed_files, get_changed_line_ranges, iter_lines_in_ranges
+from dev_tools.utils.git_hook_utils import create_default_parser
+from dev_tools.utils.profiling import profiled
+from dev_tools.utils.result_cache import check_files
 
 if TYPE_CHECKING:
+    import argparse
     from collections.abc import Sequence
     from pathlib import Path
 
+    from dev_tools.utils.git_diff_utils import LineRange
+
 
 class IncorrectTodo(TypedDict):
     """Incorrect Todo."""
@@ -30,29 +36,52 @@ def line_has_incorrect_todo(line: str) -> bool:
     )
 
 
-def find_files_with_incorrect_jira_reference_in_todo(files: list[Path]) -> list[IncorrectTodo]:
-    incorrect_files: list[IncorrectTodo] = []
-    for file in files:
-        lines = file.read_text(errors="ignore").splitlines()
-        for line_number, line in enumerate(lines, 1):
-            if line_has_incorrect_todo(line):
-                incorrect_files.append({"file_path": file, "line_number": line_number, "line_content": line.strip()})
+def find_incorrect_todos(
+    file: Path, content: str, line_ranges: Sequence[LineRange] | None = None
+) -> list[IncorrectTodo]:
+    lines = content.splitlines()
+    numbered_lines = enumerate(lines, 1) if line_ranges is None else iter_lines_in_ranges(lines, line_ranges)
+    return [
+        {"file_path": file, "line_number": line_number, "line_content": line.strip()}
+        for line_number, line in numbered_lines
+        if line_has_incorrect_todo(line)
+    ]
+
+
+def format_incorrect_todo(todo: IncorrectTodo) -> str:
+    return f"{todo['file_path']}:{todo['line_number']}: error: '{todo['line_content']}'"
+
 
-    return incorrect_files
+def check_file_content(file: Path, content: str, args: argparse.Namespace) -> list[str]:
+    line_ranges = get_changed_line_ranges(args.diff_base, file)
+    return [format_incorrect_todo(todo) for todo in find_incorrect_todos(file, content, line_ranges)]
 
 
-def has_any_file_incorrect_jira_reference_in_todo(files: list[Path]) -> bool:
-    if incorrect_files := find_files_with_incorrect_jira_reference_in_todo(files):
+def report_incorrect_todos(incorrect_todos: list[str]) -> bool:
+    if incorrect_todos:
         print("\nThe following TODOs do not correspond to the JIRA-Ticket TODO format 'TODO(ABC-1234):':")
-        for file in incorrect_files:
-            print(f"{file['file_path']}:{file['line_number']}: error: '{file['line_content']}'")
+        for incorrect_todo in incorrect_todos:
+            print(incorrect_todo)
         return True
 
     return False
 
 
+def parse_arguments(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    return create_default_parser(cacheable=True, diffable=True).parse_args(argv)
+
+
+@profiled
 def main(argv: Sequence[str] | None = None) -> int:
-    return 1 if has_any_file_incorrect_jira_reference_in_todo(parse_arguments(argv).filenames) else 0
+    args = parse_arguments(argv)
+    if args.diff_base:
+        args.filenames = filter_changed_files(args.diff_base, args.filenames)
+    diagnostics = check_files(
+        args,
+        "check-jira-reference-in-todo",
+        lambda file: check_file_content(file, file.read_text(errors="ignore"), args),
+    )
+    return 1 if report_incorrect_todos([todo for todos in diagnostics.values() for todo in todos]) else 0
 
 
 if __name__ == "__main__":
@@ -5,6 +5,8 @@ import sys
 from typing import TYPE_CHECKING
 
 from dev_tools.utils.git_hook_utils import create_default_parser
+from dev_tools.utils.profiling import profiled
+from dev_tools.utils.result_cache import check_files
 
 if TYPE_CHECKING:
     import argparse
@@ -13,7 +15,7 @@ if TYPE_CHECKING:
 
 
 def parse_arguments(argv: Sequence[str] | None = None) -> argparse.Namespace:
-    parser = create_default_parser()
+    parser = create_default_parser(cacheable=True)
     parser.add_argument("--rule-path", type=str, required=True)
     parser.add_argument("--rule-name", type=str, required=True)
     return parser.parse_args(argv)
@@ -24,21 +26,29 @@ def has_wrong_load_statement(content: str, rule_path: str, rule_name: str) -> bo
     return bool(re.search(invalid_pattern, content, re.MULTILINE))
 
 
+def check_file_content(filename: Path, content: str, args: argparse.Namespace) -> list[str]:
+    if has_wrong_load_statement(content, args.rule_path, args.rule_name):
+        return [
+            (
+                f"Error: {filename} does not use the correct load statement. "
+                f'Please use `load("{args.rule_path}", "{args.rule_name}")` to load the rule "{args.rule_name}".'
+            )
+        ]
+    return []
+
+
+@profiled
 def main(argv: Sequence[str] | None = None) -> int:
     args = parse_arguments(argv)
+    diagnostics = check_files(
+        args, "check-load-statement", lambda filename: check_file_content(filename, filename.read_text(), args)
+    )
+
+    errors = [error for errors in diagnostics.values() for error in errors]
+    for error in errors:
+        print(error)
 
-    invalid_files: list[Path] = [
-        filename
-        for filename in args.filenames
-        if has_wrong_load_statement(filename.read_text(), args.rule_path, args.rule_name)
-    ]
-    for filename in invalid_files:
-        print(
-            f"Error: {filename} does not use the correct load statement. "
-            f'Please use `load("{args.rule_path}", "{args.rule_name}")` to load the rule "{args.rule_name}".'
-        )
-
-    return 1 if invalid_files else 0
+    return 1 if errors else 0
 
 
 if __name__ == "__main__":
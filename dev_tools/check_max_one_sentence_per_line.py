@@ -1,16 +1,24 @@
 from __future__ import annotations
 
+import functools
+import itertools
 import sys
 from typing import TYPE_CHECKING
 
-import regex
-
-from dev_tools.utils.git_hook_utils import parse_arguments
+from dev_tools.utils.git_diff_utils import filter_changed_files, get_changed_line_ranges
+from dev_tools.utils.git_hook_utils import create_default_parser
+from dev_tools.utils.profiling import count_file, profiled
 
 if TYPE_CHECKING:
-    from collections.abc import Callable, Sequence
+    import argparse
+    from collections.abc import Sequence
     from pathlib import Path
 
+    import regex
+
+    from dev_tools.utils.git_diff_utils import LineRange
+
+CODE_BLOCK_FENCE = "```"
 COMMON_ABBREVIATIONS = {
     # keep-sorted start
     "Dr",
@@ -35,14 +43,22 @@ COMMON_ABBREVIATION_REGEXES = {
 }
 
 
+def parse_arguments(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    return create_default_parser(diffable=True).parse_args(argv)
+
+
+@profiled
 def main(argv: Sequence[str] | None = None) -> int:
     args = parse_arguments(argv)
-    changed = fix_files_with_multiple_sentences_per_line(args.filenames)
+    changed = fix_files_with_multiple_sentences_per_line(args.filenames, args.diff_base)
     return 1 if changed else 0
 
 
-def fix_files_with_multiple_sentences_per_line(files: list[Path]) -> bool:
-    code_block_pattern = r"```.*?```"
+@functools.cache
+def compile_sentence_boundary_pattern() -> regex.Pattern[str]:
+    import regex  # noqa: PLC0415
+
+    code_block_pattern = rf"{CODE_BLOCK_FENCE}.*?{CODE_BLOCK_FENCE}"
     table_cell_pattern = r"\|[^\n]*\|"
     abbreviations_pattern = "|".join(
         [
@@ -50,38 +66,81 @@ def fix_files_with_multiple_sentences_per_line(files: list[Path]) -> bool:
             *COMMON_ABBREVIATION_REGEXES,
         ]
     )
-    pattern = regex.compile(
+    return regex.compile(
         rf"({code_block_pattern})|({table_cell_pattern})|(?<!(?:{abbreviations_pattern})\.)(?<=[A-Za-z\)][.?!]) +(?=[A-Z])",
         regex.DOTALL,
     )
 
-    def replacement_function(match: regex.Match[str]) -> str:
-        # If code block matched (group 1), return it unchanged
-        if match.group(1):
-            return str(match.group(1))
-        # If table cell matched (group 2), return it unchanged
-        if match.group(2):
-            return str(match.group(2))
-        # Otherwise, it's a sentence boundary - replace with newline
-        return "\n"
-
-    files_changed_state = [
-        fix_file_with_multiple_sentences_per_line(file, pattern, replacement_function) for file in files
-    ]
+
+def replacement_function(match: regex.Match[str]) -> str:
+    # If code block matched (group 1), return it unchanged
+    if match.group(1):
+        return str(match.group(1))
+    # If table cell matched (group 2), return it unchanged
+    if match.group(2):
+        return str(match.group(2))
+    # Otherwise, it's a sentence boundary - replace with newline
+    return "\n"
+
+
+def fix_content(content: str, line_ranges: Sequence[LineRange] | None = None) -> str:
+    pattern = compile_sentence_boundary_pattern()
+    if line_ranges is None:
+        return pattern.sub(replacement_function, content)
+
+    # Git numbers lines by "\n" only, while str.splitlines also splits at e.g. form feeds.
+    line_offsets = [0, *itertools.accumulate(len(line) + 1 for line in content.split("\n")[:-1])]
+    if content and not content.endswith("\n"):
+        line_offsets.append(len(content))
+    fixed_parts = []
+    position = 0
+    for line_range in line_ranges:
+        start = line_offsets[min(line_range.start, len(line_offsets)) - 1]
+        end = line_offsets[min(line_range.end, len(line_offsets)) - 1]
+        start, end = expand_to_code_blocks(content, max(start, position), max(end, position))
+        fixed_parts.append(content[position:start])
+        fixed_parts.append(pattern.sub(replacement_function, content[start:end]))
+        position = end
+    fixed_parts.append(content[position:])
+    return "".join(fixed_parts)
+
+
+def expand_to_code_blocks(content: str, start: int, end: int) -> tuple[int, int]:
+    """Extend a region of the content to contain the code blocks it starts or ends in, which are never split."""
+    if content.count(CODE_BLOCK_FENCE, 0, start) % 2:
+        start = content.rfind(CODE_BLOCK_FENCE, 0, start)
+    if content.count(CODE_BLOCK_FENCE, start, end) % 2:
+        closing_fence = content.find(CODE_BLOCK_FENCE, end)
+        end = len(content) if closing_fence == -1 else closing_fence + len(CODE_BLOCK_FENCE)
+    return start, end
+
+
+def fix_files_with_multiple_sentences_per_line(files: list[Path], diff_base: str | None = None) -> bool:
+    if diff_base:
+        files = filter_changed_files(diff_base, files)
+    files_changed_state = []
+    for file in files:
+        count_file(file)
+        files_changed_state.append(
+            fix_file_with_multiple_sentences_per_line(file, file.read_text(), get_changed_line_ranges(diff_base, file))
+        )
     return any(files_changed_state)
 
 
 def fix_file_with_multiple_sentences_per_line(
-    file: Path, pattern: regex.Pattern[str], replacement_function: Callable[[regex.Match[str]], str]
+    file: Path, old_content: str, line_ranges: Sequence[LineRange] | None = None
 ) -> bool:
-    old_content = file.read_text()
-
-    if (new_content := pattern.sub(replacement_function, old_content)) != old_content:
+    if (new_content := fix_content(old_content, line_ranges)) != old_content:
         file.write_text(new_content)
         return True
 
     return False
 
 
+def check_file_content(file: Path, content: str, args: argparse.Namespace) -> list[str]:
+    line_ranges = get_changed_line_ranges(args.diff_base, file)
+    return [f"Fixing {file}"] if fix_file_with_multiple_sentences_per_line(file, content, line_ranges) else []
+
+
 if __name__ == "__main__":
     sys.exit(main())
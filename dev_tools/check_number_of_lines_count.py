@@ -3,18 +3,22 @@
 
 from __future__ import annotations
 
+import io
 import sys
 from typing import TYPE_CHECKING
 
 from dev_tools.utils.git_hook_utils import create_default_parser
+from dev_tools.utils.profiling import profiled
+from dev_tools.utils.result_cache import check_files
 
 if TYPE_CHECKING:
     import argparse
     from collections.abc import Sequence
+    from pathlib import Path
 
 
 def parse_arguments(argv: Sequence[str] | None = None) -> argparse.Namespace:
-    parser = create_default_parser()
+    parser = create_default_parser(cacheable=True)
     parser.add_argument(
         "--max-lines",
         default=30,
@@ -25,15 +29,24 @@ def parse_arguments(argv: Sequence[str] | None = None) -> argparse.Namespace:
     return parser.parse_args(argv)
 
 
+def check_file_content(filename: Path, content: str, args: argparse.Namespace) -> list[str]:
+    number_of_lines = len(io.StringIO(content).readlines())
+    if number_of_lines > args.max_lines:
+        return [f"{filename} ({number_of_lines} lines) exceeds {args.max_lines} lines."]
+    return []
+
+
+@profiled
 def main(argv: Sequence[str] | None = None) -> int:
     args = parse_arguments(argv)
 
     are_all_files_ok = True
-    for filename in args.filenames:
-        file_content = filename.open().readlines()
-        number_of_lines = len(file_content)
-        if number_of_lines > args.max_lines:
-            print(f"{filename} ({number_of_lines} lines) exceeds {args.max_lines} lines.")
+    diagnostics = check_files(
+        args, "check-number-of-lines-count", lambda filename: check_file_content(filename, filename.read_text(), args)
+    )
+    for errors in diagnostics.values():
+        for error in errors:
+            print(error)
             are_all_files_ok = False
 
     return 0 if are_all_files_ok else 1
@@ -17,6 +17,7 @@ from whoowns.ownership_utils import (
 )
 
 from dev_tools.utils.git_hook_utils import create_default_parser
+from dev_tools.utils.profiling import profiled, span
 
 if TYPE_CHECKING:
     from argparse import Namespace
@@ -164,7 +165,8 @@ def is_empty(iterable: Iterator[Path]) -> bool:
 
 
 def get_git_tracked_files(folder: Path) -> list[Path]:
-    files = check_git(f"ls-files {folder.relative_to(folder)}", folder)
+    with span("git ls-files", "subprocess"):
+        files = check_git(f"ls-files {folder.relative_to(folder)}", folder)
     return [folder / file for file in files.splitlines()]
 
 
@@ -205,6 +207,7 @@ def parse_arguments() -> Namespace:
     return parser.parse_args()
 
 
+@profiled
 def main() -> int:
     args = parse_arguments()
     repo_root = Path.cwd()
@@ -5,6 +5,8 @@ from typing import TYPE_CHECKING
 
 from dev_tools.utils.build_file_parsing_utils import find_rule_calls, rule_has_tag
 from dev_tools.utils.git_hook_utils import create_default_parser
+from dev_tools.utils.profiling import profiled
+from dev_tools.utils.result_cache import check_files
 
 if TYPE_CHECKING:
     import argparse
@@ -13,7 +15,7 @@ if TYPE_CHECKING:
 
 
 def parse_arguments(argv: Sequence[str] | None = None) -> argparse.Namespace:
-    parser = create_default_parser()
+    parser = create_default_parser(cacheable=True)
     parser.add_argument("--rule-name", type=str, required=True)
     parser.add_argument("--tag", type=str, required=True)
     return parser.parse_args(argv)
@@ -23,27 +25,33 @@ def is_rule_missing_tag(rule_body: str, tag: str) -> bool:
     return not rule_has_tag(rule_body, tag)
 
 
-def find_invalid_files(filenames: Sequence[Path], rule_name: str, tag: str) -> list[Path]:
-    return [
-        filename
-        for filename in filenames
-        if any(
-            is_rule_missing_tag(rule_call.body, tag) for rule_call in find_rule_calls(filename.read_text(), rule_name)
-        )
-    ]
+def is_content_invalid(content: str, rule_name: str, tag: str) -> bool:
+    return any(is_rule_missing_tag(rule_call.body, tag) for rule_call in find_rule_calls(content, rule_name))
 
 
+def check_file_content(filename: Path, content: str, args: argparse.Namespace) -> list[str]:
+    if is_content_invalid(content, args.rule_name, args.tag):
+        return [
+            (
+                f"Error: {filename} contains a `{args.rule_name}` rule without `tags` containing `{args.tag}`. "
+                f"Make sure you tag this rule with `{args.tag}`."
+            )
+        ]
+    return []
+
+
+@profiled
 def main(argv: Sequence[str] | None = None) -> int:
     args = parse_arguments(argv)
-    invalid_files = find_invalid_files(args.filenames, args.rule_name, args.tag)
+    diagnostics = check_files(
+        args, "check-rule-has-tag", lambda filename: check_file_content(filename, filename.read_text(), args)
+    )
 
-    for filename in invalid_files:
-        print(
-            f"Error: {filename} contains a `{args.rule_name}` rule without `tags` containing `{args.tag}`. "
-            f"Make sure you tag this rule with `{args.tag}`."
-        )
+    errors = [error for errors in diagnostics.values() for error in errors]
+    for error in errors:
+        print(error)
 
-    return 1 if invalid_files else 0
+    return 1 if errors else 0
 
 
 if __name__ == "__main__":
@@ -10,12 +10,16 @@ import sys
 from typing import TYPE_CHECKING
 
 from dev_tools.utils.git_hook_utils import create_default_parser
+from dev_tools.utils.profiling import profiled
+from dev_tools.utils.result_cache import check_files
 
 if TYPE_CHECKING:
     import argparse
     from collections.abc import Sequence
     from pathlib import Path
 
+UNKNOWN_SHELL_PREFIX = "Unknown shell in"
+
 
 def _is_executable(filename: Path) -> bool:
     return platform.system() in ("Linux", "Darwin") and filename.is_file() and os.access(filename, os.X_OK)
@@ -25,8 +29,8 @@ def _sets_options_or_is_nolint(line: str, expected_options: str) -> bool:
     return line.strip() in [expected_options, "# nolint(set_options)"]
 
 
-def _is_valid_shell_file(filename: Path, expected_options: str) -> bool:
-    lines = filename.read_text().splitlines()
+def _is_valid_shell_file(content: str, expected_options: str) -> bool:
+    lines = content.splitlines()
     return any(_sets_options_or_is_nolint(line, expected_options) for line in lines)
 
 
@@ -36,39 +40,35 @@ def _does_shebang_match(program: str, first_line: str) -> bool:
     return match is not None
 
 
-def _separate_bash_from_sh_files(filenames: Sequence[Path]) -> tuple[bool, list[Path], list[Path]]:
-    bash_files = []
-    sh_files = []
-    all_valid = True
-    for filename in filenames:
-        first_line = filename.open().readline()
-        if _does_shebang_match("bash", first_line) or filename.suffix == ".bash":
-            bash_files.append(filename)
-        elif _does_shebang_match("sh", first_line):
-            sh_files.append(filename)
-        elif not _is_executable(filename):
-            pass  # ignore non-executable files as we don't enforce a shebang for them
-        else:
-            all_valid = False
-            msg = f"Unknown shell in {filename}: {first_line.strip()}. Only use this hook in combination with 'check-executables-have-shebangs' from https://github.com/pre-commit/pre-commit-hooks"
-            print(msg, file=sys.stderr)
-
-    return all_valid, bash_files, sh_files
+def check_file_content(filename: Path, content: str, args: argparse.Namespace) -> list[str]:
+    first_line = content.partition("\n")[0]
+    if _does_shebang_match("bash", first_line) or filename.suffix == ".bash":
+        expected_options = args.bash_options
+    elif _does_shebang_match("sh", first_line):
+        expected_options = args.shell_options
+    elif not _is_executable(filename):
+        return []  # ignore non-executable files as we don't enforce a shebang for them
+    else:
+        return [
+            f"{UNKNOWN_SHELL_PREFIX} {filename}: {first_line.strip()}. Only use this hook in combination with 'check-executables-have-shebangs' from https://github.com/pre-commit/pre-commit-hooks"
+        ]
 
+    if _is_valid_shell_file(content, expected_options):
+        return []
+    return [f"Error: {filename} does not contain '{expected_options}'"]
 
-def _are_shell_files_valid(shell_files: list[Path], expected_options: str) -> bool:
-    invalid_shell_files = [filename for filename in shell_files if not _is_valid_shell_file(filename, expected_options)]
-    for filename in invalid_shell_files:
-        print(f"Error: {filename} does not contain '{expected_options}'")
 
-    return bool(not invalid_shell_files)
+def report_errors(errors: list[str]) -> None:
+    for error in errors:
+        # Unknown shells point to a misconfiguration rather than to an error in the checked file
+        print(error, file=sys.stderr if error.startswith(UNKNOWN_SHELL_PREFIX) else sys.stdout)
 
 
 def parse_arguments(argv: Sequence[str] | None = None) -> argparse.Namespace:
     default_bash_options = "set -euxo pipefail"
     default_sh_options = "set -eux"
 
-    parser = create_default_parser()
+    parser = create_default_parser(cacheable=True)
     parser.add_argument(
         "--bash-options",
         default=default_bash_options,
@@ -82,14 +82,19 @@ def parse_arguments(argv: Sequence[str] | None = None) -> argparse.Namespace:
     return parser.parse_args(argv)
 
 
+@profiled
 def main(argv: Sequence[str] | None = None) -> int:
     args = parse_arguments(argv)
 
-    are_all_files_valid, bash_files, sh_files = _separate_bash_from_sh_files(args.filenames)
-    are_all_files_valid &= _are_shell_files_valid(bash_files, args.bash_options)
-    are_all_files_valid &= _are_shell_files_valid(sh_files, args.shell_options)
+    diagnostics = check_files(
+        args,
+        "check-shellscript-set-options",
+        lambda filename: check_file_content(filename, filename.read_text(), args),
+    )
+    errors = [error for errors in diagnostics.values() for error in errors]
+    report_errors(errors)
 
-    return 0 if are_all_files_valid else 1
+    return 1 if errors else 0
 
 
 if __name__ == "__main__":
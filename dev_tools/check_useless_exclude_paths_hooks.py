@@ -2,46 +2,101 @@
 # Licensed under the MIT License.
 
 import sys
+from argparse import ArgumentParser, Namespace
 from pathlib import Path
 from typing import Any
 
-from pre_commit_excludes.hook_utils import load_hooks
+from pre_commit_excludes.hook_utils import Hook, load_hooks
+from pre_commit_excludes.path_index import PathIndex
+
+from dev_tools.utils.cache_utils import get_cache_directory
+from dev_tools.utils.profiling import add_profile_argument, profiled, span
 
 CONFIG_FILE = ".pre-commit-config.yaml"
 
 
-def have_non_existent_paths_or_duplicates(hooks_list: list[Any]) -> bool:
+def parse_arguments() -> Namespace:
+    parser = ArgumentParser()
+    parser.add_argument(
+        "--evaluate-regex",
+        action="store_true",
+        help="Match the full exclude regex against the tracked files and report alternatives that match nothing.",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Parse the pre-commit config even if it didn't change since the last run.",
+    )
+    add_profile_argument(parser)
+    return parser.parse_args()
+
+
+def have_non_existent_paths_or_duplicates(hooks_list: list[Any], path_index: PathIndex | None = None) -> bool:
     non_existing_paths: list[tuple[str, str]] = [
         (hook_instance.id, path)
         for hook_instance in hooks_list
-        if hook_instance.has_non_existing_paths()
-        for path in hook_instance.find_non_existing_paths()
+        for path in hook_instance.find_non_existing_paths(path_index)
+    ]
+    duplicates = find_duplicates(hooks_list)
+
+    if non_existing_paths:
+        print(f"Remove the following non-existing exclusions in {CONFIG_FILE}:")
+        for hook_id, path in non_existing_paths:
+            print(f"In hook {hook_id}: {str(path).split('Repo/', 1)[-1]}")
+
+    print_duplicates(duplicates)
+
+    return bool(non_existing_paths or duplicates)
+
+
+def have_unmatched_patterns_or_duplicates(hooks_list: list[Hook], path_index: PathIndex) -> bool:
+    unmatched_patterns: list[tuple[str, str]] = [
+        (hook_instance.id, pattern)
+        for hook_instance in hooks_list
+        for pattern in hook_instance.evaluate_exclude_regex(path_index).unmatched_patterns
     ]
-    duplicates: list[tuple[str, str]] = [
+    duplicates = find_duplicates(hooks_list)
+
+    if unmatched_patterns:
+        print(f"Remove the following exclusions matching no tracked file in {CONFIG_FILE}:")
+        for hook_id, pattern in unmatched_patterns:
+            print(f"In hook {hook_id}: {pattern}")
+
+    print_duplicates(duplicates)
+
+    return bool(unmatched_patterns or duplicates)
+
+
+def find_duplicates(hooks_list: list[Any]) -> list[tuple[str, str]]:
+    return [
         (hook_instance.id, duplicate)
         for hook_instance in hooks_list
         if hook_instance.has_duplicates()
         for duplicate in hook_instance.find_duplicates()
     ]
 
-    if non_existing_paths:
-        print(f"Remove the following non-existing exclusions in {CONFIG_FILE}:")
-        for hook_id, path in non_existing_paths:
-            print(f"In hook {hook_id}: {str(path).split('Repo/', 1)[-1]}")
 
+def print_duplicates(duplicates: list[tuple[str, str]]) -> None:
     if duplicates:
         print(f"Remove the following duplicates from the exclusions in {CONFIG_FILE}:")
         for hook_id, duplicate in duplicates:
             print(f"In hook {hook_id}: {str(duplicate).split('Repo/', 1)[-1]}")
 
-    return bool(non_existing_paths or duplicates)
-
 
+@profiled
 def main() -> int:
+    args = parse_arguments()
     repo_root = Path.cwd()
     pre_commit_config = repo_root / CONFIG_FILE
-    hooks_list = load_hooks(repo_root, pre_commit_config)
-    return 1 if have_non_existent_paths_or_duplicates(hooks_list) else 0
+    with span("load hooks"):
+        hooks_list = load_hooks(
+            repo_root, pre_commit_config, None if args.no_cache else get_cache_directory("pre-commit-excludes")
+        )
+    with span("git ls-files", "subprocess"):
+        path_index = PathIndex.from_git_ls_files(repo_root)
+    if args.evaluate_regex:
+        return 1 if have_unmatched_patterns_or_duplicates(hooks_list, path_index) else 0
+    return 1 if have_non_existent_paths_or_duplicates(hooks_list, path_index) else 0
 
 
 if __name__ == "__main__":
@@ -3,34 +3,48 @@
 
 from __future__ import annotations
 
-import re
 import sys
 from pathlib import Path
 
-from pre_commit.clientlib import load_manifest
-from pre_commit.constants import MANIFEST_FILE
+from dev_tools.utils.pre_commit_utils import MANIFEST_FILE, load_hook_manifest
+from dev_tools.utils.profiling import profiled, span
+
+HOOKS_DOC_START = "<!-- hooks-doc start -->\n"
+HOOKS_DOC_END = "<!-- hooks-doc end -->"
 
 
 def generate_hooks_documentation(hooks: list[dict]) -> str:
     return "\n".join([f"### `{hook['id']}`\n\n{hook['description']}\n" for hook in hooks])
 
 
-def update_hooks_documentation_in_readme(readme: Path, docs: str) -> None:
-    content = readme.read_text()
-    content = re.sub(
-        r"(<!-- hooks-doc start -->\n)(.*?)(<!-- hooks-doc end -->)",
-        lambda match: f"{match.group(1)}\n{docs}{match.group(3)}",
-        content,
-        flags=re.DOTALL,
-    )
-    readme.write_text(content)
-
+def update_hooks_documentation_in_readme(readme: Path, docs: str) -> bool:
+    """Replace the documentation between the markers and return whether the README changed.
 
+    The README is not written if the documentation is up to date, which would trigger the hooks formatting it.
+    """
+    content = readme.read_text()
+    start = content.find(HOOKS_DOC_START)
+    if start == -1:
+        return False
+    start += len(HOOKS_DOC_START)
+    end = content.find(HOOKS_DOC_END, start)
+    if end == -1:
+        return False
+
+    new_section = f"\n{docs}"
+    if content[start:end] == new_section:
+        return False
+    readme.write_text(f"{content[:start]}{new_section}{content[end:]}")
+    return True
+
+
+@profiled
 def main() -> int:
     repo_root = Path.cwd()
     readme = repo_root / "README.md"
     hooks_manifest = repo_root / MANIFEST_FILE
-    hooks = list(load_manifest(hooks_manifest))
+    with span("load manifest"):
+        hooks = load_hook_manifest(hooks_manifest).hooks
     docs = generate_hooks_documentation(hooks)
     update_hooks_documentation_in_readme(readme, docs)
     return 0
@@ -1,26 +1,78 @@
 from __future__ import annotations
 
+import contextlib
 import json
 import sys
 from argparse import ArgumentParser, Namespace
 from pathlib import Path
 
-from pre_commit.constants import CONFIG_FILE
-from pre_commit_excludes.hook_utils import Hook, load_hooks
+from pre_commit_excludes.exclude_matrix import ExcludeMatrix
+from pre_commit_excludes.hook_utils import ExcludedFilesCounter, Hook, load_hooks
+from pre_commit_excludes.path_index import PathIndex
+
+from dev_tools.utils.cache_utils import get_cache_directory
+from dev_tools.utils.profiling import add_profile_argument, profiled, span
+
+CONFIG_FILE = ".pre-commit-config.yaml"
 
 
 def parse_arguments() -> Namespace:
     parser = ArgumentParser()
     parser.add_argument("--output-file", type=Path, default=None)
+    parser.add_argument(
+        "--evaluate-regex",
+        action="store_true",
+        help="Count the files matched by the full exclude regex instead of only the literal paths.",
+    )
+    parser.add_argument(
+        "--hotspots",
+        type=int,
+        default=0,
+        help="Also report this many tracked files that are excluded by the most hooks.",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Parse the pre-commit config even if it didn't change since the last run.",
+    )
+    add_profile_argument(parser)
     return parser.parse_args()
 
 
-def create_excluded_files_report(hooks_list: list[Hook]) -> dict:
-    hook_metrics_with_excluded_files: list[dict] = [
-        {"hook_id": hook.id, "excluded_files_count": hook.count_excluded_files()}
-        for hook in hooks_list
-        if hook.count_excluded_files() > 0
-    ]
+def create_excluded_files_report(hooks_list: list[Hook], path_index: PathIndex | None = None) -> dict:
+    counter = ExcludedFilesCounter(path_index)
+    hook_metrics_with_excluded_files: list[dict] = []
+    for hook in hooks_list:
+        excluded_files_per_path = hook.count_excluded_files_per_path(counter)
+        excluded_files_count = sum(excluded_files_per_path.values())
+        if excluded_files_count > 0:
+            hook_metrics_with_excluded_files.append(
+                {
+                    "hook_id": hook.id,
+                    "excluded_files_count": excluded_files_count,
+                    "excluded_paths": {_to_report_path(path): count for path, count in excluded_files_per_path.items()},
+                }
+            )
+    return {
+        "total_excluded_files": sum(
+            hook_metric["excluded_files_count"] for hook_metric in hook_metrics_with_excluded_files
+        ),
+        "hooks": hook_metrics_with_excluded_files,
+    }
+
+
+def create_regex_excluded_files_report(hooks_list: list[Hook], path_index: PathIndex) -> dict:
+    hook_metrics_with_excluded_files: list[dict] = []
+    for hook in hooks_list:
+        evaluation = hook.evaluate_exclude_regex(path_index)
+        if evaluation.excluded_files_count > 0:
+            hook_metrics_with_excluded_files.append(
+                {
+                    "hook_id": hook.id,
+                    "excluded_files_count": evaluation.excluded_files_count,
+                    "excluded_patterns": evaluation.matches_per_pattern,
+                }
+            )
     return {
         "total_excluded_files": sum(
             hook_metric["excluded_files_count"] for hook_metric in hook_metrics_with_excluded_files
@@ -29,17 +81,40 @@ def create_excluded_files_report(hooks_list: list[Hook]) -> dict:
     }
 
 
+def create_exclude_hotspots_report(hooks_list: list[Hook], path_index: PathIndex, limit: int) -> list[dict]:
+    exclude_matrix = ExcludeMatrix.from_hooks(hooks_list, path_index)
+    return [{"file": file, "hook_ids": hook_ids} for file, hook_ids in exclude_matrix.hotspots(limit)]
+
+
+def _to_report_path(path: Path) -> str:
+    with contextlib.suppress(ValueError):
+        path = path.absolute().relative_to(Path.cwd())
+    return path.as_posix()
+
+
 def write_pre_commit_metrics(output_data: dict, output_file: Path) -> None:
     output_file.parent.mkdir(parents=True, exist_ok=True)
     output_file.write_text(json.dumps(output_data, indent=2))
 
 
+@profiled
 def main() -> int:
     args = parse_arguments()
     repo_root = Path.cwd()
     pre_commit_config = repo_root / CONFIG_FILE
-    hooks_list = load_hooks(repo_root, pre_commit_config)
-    output_data = create_excluded_files_report(hooks_list)
+    with span("load hooks"):
+        hooks_list = load_hooks(
+            repo_root, pre_commit_config, None if args.no_cache else get_cache_directory("pre-commit-excludes")
+        )
+    with span("git ls-files", "subprocess"):
+        path_index = PathIndex.from_git_ls_files(repo_root)
+    output_data = (
+        create_regex_excluded_files_report(hooks_list, path_index)
+        if args.evaluate_regex
+        else create_excluded_files_report(hooks_list, path_index)
+    )
+    if args.hotspots > 0:
+        output_data["hotspots"] = create_exclude_hotspots_report(hooks_list, path_index, args.hotspots)
 
     json_output = json.dumps(output_data, indent=2)
     print(json_output)
@@ -0,0 +1,290 @@
+from __future__ import annotations
+
+import argparse
+import io
+import os
+import re
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from pre_commit_excludes.hook_utils import load_config
+
+from dev_tools import (
+    check_forbidden_tags,
+    check_jira_reference_in_todo,
+    check_load_statement,
+    check_max_one_sentence_per_line,
+    check_number_of_lines_count,
+    check_rule_has_tag,
+    check_shellscript_set_options,
+)
+from dev_tools.utils.profiling import accumulate, add_profile_argument, count_file, profiled, span
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+    from typing import Any
+
+CONFIG_FILE = ".pre-commit-config.yaml"
+NON_FILE_CHECK_REPOS = {"local", "meta"}
+# Same as pre_commit.constants.STAGES, which is not imported to keep the startup fast
+HOOK_STAGES = (
+    "commit-msg",
+    "post-checkout",
+    "post-commit",
+    "post-merge",
+    "post-rewrite",
+    "pre-commit",
+    "pre-merge-commit",
+    "pre-push",
+    "pre-rebase",
+    "prepare-commit-msg",
+    "manual",
+)
+# Stage names before pre-commit 3.2, which pre-commit still accepts in configs
+LEGACY_HOOK_STAGES = {"commit": "pre-commit", "merge-commit": "pre-merge-commit", "push": "pre-push"}
+
+
+def print_diagnostics(diagnostics: list[str]) -> None:
+    for diagnostic in diagnostics:
+        print(diagnostic)
+
+
+@dataclass(frozen=True)
+class FileCheck:
+    """A hook checking one file at a time, which can therefore run in-process together with other hooks.
+
+    The arguments and file filters are the defaults of the hook in `.pre-commit-hooks.yaml`.
+    """
+
+    parse_arguments: Callable[[Sequence[str]], argparse.Namespace]
+    check_file_content: Callable[[Path, str, argparse.Namespace], list[str]]
+    report: Callable[[list[str]], object] = print_diagnostics
+    args: tuple[str, ...] = ()
+    stages: tuple[str, ...] = ()
+    types: tuple[str, ...] = ("file",)
+    types_or: tuple[str, ...] = ()
+    exclude_types: tuple[str, ...] = ()
+    exclude: str = "^$"
+    decode_errors: str = "strict"
+
+
+FILE_CHECKS = {
+    "check-number-of-lines-count": FileCheck(
+        check_number_of_lines_count.parse_arguments,
+        check_number_of_lines_count.check_file_content,
+        args=("--max-lines=50",),
+        types_or=("shell",),
+    ),
+    "check-shellscript-set-options": FileCheck(
+        check_shellscript_set_options.parse_arguments,
+        check_shellscript_set_options.check_file_content,
+        report=check_shellscript_set_options.report_errors,
+        types_or=("shell",),
+    ),
+    "check-jira-reference-in-todo": FileCheck(
+        check_jira_reference_in_todo.parse_arguments,
+        check_jira_reference_in_todo.check_file_content,
+        report=check_jira_reference_in_todo.report_incorrect_todos,
+        exclude_types=("svg",),
+        exclude=".pre-commit-config.yaml",
+        decode_errors="ignore",
+    ),
+    "check-load-statement": FileCheck(
+        check_load_statement.parse_arguments,
+        check_load_statement.check_file_content,
+        types=("bazel",),
+    ),
+    "check-rule-has-tag": FileCheck(
+        check_rule_has_tag.parse_arguments,
+        check_rule_has_tag.check_file_content,
+        types=("bazel",),
+    ),
+    "check-forbidden-tags": FileCheck(
+        check_forbidden_tags.parse_args,
+        check_forbidden_tags.check_file_content,
+        types=("bazel",),
+    ),
+    "check-max-one-sentence-per-line": FileCheck(
+        check_max_one_sentence_per_line.parse_arguments,
+        check_max_one_sentence_per_line.check_file_content,
+        types_or=("asciidoc", "markdown", "rst", "tex"),
+    ),
+}
+
+
+@dataclass
+class ConfiguredHook:
+    """A file check with the arguments and file filters of its hook in the pre-commit config."""
+
+    id: str
+    check: FileCheck
+    args: argparse.Namespace
+    files: re.Pattern[str]
+    exclude: re.Pattern[str]
+    types: frozenset[str]
+    types_or: frozenset[str]
+    exclude_types: frozenset[str]
+    diagnostics: list[str] = field(default_factory=list)
+
+    @classmethod
+    def from_hook_config(cls: type[ConfiguredHook], hook_config: dict[str, Any]) -> ConfiguredHook:
+        check = FILE_CHECKS[hook_config["id"]]
+        return cls(
+            hook_config["id"],
+            check,
+            check.parse_arguments(hook_config.get("args", check.args)),
+            re.compile(hook_config.get("files", "")),
+            re.compile(hook_config.get("exclude", check.exclude)),
+            frozenset(hook_config.get("types", check.types)),
+            frozenset(hook_config.get("types_or", check.types_or)),
+            frozenset(hook_config.get("exclude_types", check.exclude_types)),
+        )
+
+    def applies_to(self, filename: str, tags: set[str]) -> bool:
+        """Filter files by name and identify tags like pre-commit does."""
+        return (
+            bool(self.files.search(filename))
+            and not self.exclude.search(filename)
+            and self.types <= tags
+            and (not self.types_or or bool(self.types_or & tags))
+            and not self.exclude_types & tags
+        )
+
+
+def load_configured_hooks(config: dict[str, Any], hook_stage: str = "pre-commit") -> list[ConfiguredHook]:
+    return [
+        ConfiguredHook.from_hook_config(hook_config)
+        for repo in config.get("repos", [])
+        if repo["repo"] not in NON_FILE_CHECK_REPOS
+        for hook_config in repo["hooks"]
+        if hook_config["id"] in FILE_CHECKS and runs_in_stage(hook_config, config, hook_stage)
+    ]
+
+
+def runs_in_stage(hook_config: dict[str, Any], config: dict[str, Any], hook_stage: str) -> bool:
+    """Select the stages of a hook like pre-commit: its own, the manifest ones, the `default_stages` or all."""
+    stages = (
+        hook_config.get("stages")
+        or FILE_CHECKS[hook_config["id"]].stages
+        or config.get("default_stages")
+        or HOOK_STAGES
+    )
+    return hook_stage in {LEGACY_HOOK_STAGES.get(stage, stage) for stage in stages}
+
+
+def get_files(*, all_files: bool) -> list[str]:
+    command = (
+        ["git", "ls-files", "-z"] if all_files else ["git", "diff", "--staged", "--name-only", "--no-ext-diff", "-z"]
+    )
+    with span(" ".join(command[:2]), "subprocess"):
+        output = subprocess.check_output(command)
+    return [filename for filename in output.decode().split("\0") if filename]
+
+
+def filter_files(filenames: Sequence[str], config: dict[str, Any]) -> list[str]:
+    files = re.compile(config.get("files", ""))
+    exclude = re.compile(config.get("exclude", "^$"))
+    return [filename for filename in filenames if files.search(filename) and not exclude.search(filename)]
+
+
+def get_file_tags(filename: Path, content: bytes) -> set[str]:
+    """Identify a regular file like `identify.tags_from_path`, but from its content already read into memory."""
+    from identify import identify  # noqa: PLC0415
+
+    executable = os.access(filename, os.X_OK)
+    tags = {"file", "executable" if executable else "non-executable"}
+    if filename_tags := identify.tags_from_filename(filename.name):
+        tags |= filename_tags
+    elif executable and (shebang := identify.parse_shebang(io.BytesIO(content))):
+        tags |= identify.tags_from_interpreter(shebang[0])
+    if not tags & identify.ENCODING_TAGS:
+        tags.add("text" if identify.is_text(io.BytesIO(content)) else "binary")
+    return tags
+
+
+def decode(content: bytes, errors: str = "strict") -> str:
+    """Decode the content of a file with universal newlines just like `Path.read_text`."""
+    return content.decode("utf-8", errors).replace("\r\n", "\n").replace("\r", "\n")
+
+
+def run_hooks_on_file(hooks: Sequence[ConfiguredHook], filename: str) -> None:
+    path = Path(filename)
+    if path.is_symlink() or not path.is_file():
+        return
+
+    content = path.read_bytes()
+    count_file(path)
+    tags = get_file_tags(path, content)
+    applicable_hooks = [hook for hook in hooks if hook.applies_to(filename, tags)]
+    if not applicable_hooks:
+        return
+
+    try:
+        decoded_content = decode(content)
+    except UnicodeDecodeError:
+        # Only checks ignoring decoding errors can check the file, all others fail like the standalone hooks.
+        if any(hook.check.decode_errors == "strict" for hook in applicable_hooks):
+            raise
+        decoded_content = decode(content, "ignore")
+
+    for hook in applicable_hooks:
+        with accumulate(hook.id):
+            hook.diagnostics.extend(hook.check.check_file_content(path, decoded_content, hook.args))
+
+
+def run(args: argparse.Namespace) -> int:
+    with span("load config"):
+        config = load_config(args.config)
+        hooks = load_configured_hooks(config, args.hook_stage)
+    filenames = args.filenames or get_files(all_files=args.all_files)
+    with span("run hooks", hooks=len(hooks)):
+        for filename in filter_files(filenames, config):
+            run_hooks_on_file(hooks, filename)
+
+    failed_hooks = [hook for hook in hooks if hook.diagnostics]
+    for hook in failed_hooks:
+        print(f"- hook id: {hook.id}")
+        hook.check.report(hook.diagnostics)
+        print()
+
+    return 1 if failed_hooks else 0
+
+
+def parse_arguments(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="dev-tools")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser(
+        "run",
+        help="Run all file checks of the pre-commit config in a single process, reading every file only once.",
+    )
+    run_parser.add_argument("filenames", nargs="*", help="Files to check. Defaults to the staged files.")
+    run_parser.add_argument("--all-files", action="store_true", help="Check all files tracked by git.")
+    run_parser.add_argument(
+        "--config",
+        default=Path(CONFIG_FILE),
+        type=Path,
+        help=f"Path to the pre-commit config. Defaults to {CONFIG_FILE}.",
+    )
+    run_parser.add_argument(
+        "--hook-stage",
+        default="pre-commit",
+        choices=HOOK_STAGES,
+        help="Run the hooks of this stage like `pre-commit run --hook-stage`. Defaults to pre-commit.",
+    )
+    add_profile_argument(run_parser)
+
+    return parser.parse_args(argv)
+
+
+@profiled
+def main(argv: Sequence[str] | None = None) -> int:
+    args = parse_arguments(argv)
+    return run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
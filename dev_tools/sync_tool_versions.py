@@ -7,9 +7,8 @@ from glob import has_magic
 from pathlib import Path
 from typing import TYPE_CHECKING
 
-from ruamel.yaml import YAML
-
 from dev_tools.utils.git_hook_utils import create_default_parser
+from dev_tools.utils.profiling import profiled, span
 
 if TYPE_CHECKING:
     import argparse
@@ -66,6 +65,11 @@ def parse_arguments(argv: Sequence[str] | None = None) -> argparse.Namespace:
         default=Path.cwd() / DEFAULT_CONFIG_FILE,
         help=f"Path to the versions config file (default: {DEFAULT_CONFIG_FILE})",
     )
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Only report mismatched versions as unified diff without writing any file",
+    )
     return parser.parse_args(argv)
 
 
@@ -137,6 +141,8 @@ def _parse_version_spec(entry: dict, base_dir: Path, config_path: Path) -> Versi
 
 
 def _load_config(config_path: Path) -> list[VersionSyncSpec]:
+    from ruamel.yaml import YAML  # noqa: PLC0415
+
     yaml = YAML(typ="safe")
     data = yaml.load(config_path.read_text())
     data = _require_mapping(data, f"Top-level config must be a mapping in {config_path}")
@@ -211,19 +217,50 @@ def _resolve_sync_entry(entry: SyncEntry) -> ResolvedSyncEntry:
     return ResolvedSyncEntry(paths=paths, is_glob=True)
 
 
-def _sync_file(path: Path, regex: re.Pattern[str], replacement_version: str) -> tuple[bool, bool]:
-    content = path.read_text()
+def _print_diff(path: Path, content: str, new_content: str) -> None:
+    import difflib  # noqa: PLC0415
+
+    diff = difflib.unified_diff(
+        content.splitlines(keepends=True),
+        new_content.splitlines(keepends=True),
+        fromfile=f"a/{path.as_posix()}",
+        tofile=f"b/{path.as_posix()}",
+    )
+    print("".join(diff), end="")
+
+
+def _sync_file(
+    path: Path,
+    regex: re.Pattern[str],
+    replacement_version: str,
+    file_contents: dict[Path, str],
+    *,
+    check: bool,
+) -> tuple[bool, bool]:
+    if path not in file_contents:
+        file_contents[path] = path.read_text()
+    content = file_contents[path]
     if not regex.search(content):
         return False, False
 
     new_content, _ = regex.subn(_make_replacer(replacement_version), content)
     if new_content != content:
-        path.write_text(new_content)
+        file_contents[path] = new_content
+        if check:
+            _print_diff(path, content, new_content)
+        else:
+            path.write_text(new_content)
 
     return True, new_content != content
 
 
-def _sync_entry(spec: VersionSyncSpec, entry: SyncEntry) -> tuple[bool, list[str]]:
+def _sync_entry(
+    spec: VersionSyncSpec,
+    entry: SyncEntry,
+    file_contents: dict[Path, str],
+    *,
+    check: bool,
+) -> tuple[bool, list[str]]:
     regex, errors = _compile_pattern(spec, entry)
     if regex is None:
         return False, errors
@@ -243,7 +280,9 @@ def _sync_entry(spec: VersionSyncSpec, entry: SyncEntry) -> tuple[bool, list[str
         return False, errors
 
     replacement_version = entry.version_override or spec.version
-    sync_results = [_sync_file(path, regex, replacement_version) for path in resolved_entry.paths]
+    sync_results = [
+        _sync_file(path, regex, replacement_version, file_contents, check=check) for path in resolved_entry.paths
+    ]
 
     if not any(matched_file for matched_file, _ in sync_results):
         if resolved_entry.is_glob:
@@ -260,13 +299,14 @@ def _sync_entry(spec: VersionSyncSpec, entry: SyncEntry) -> tuple[bool, list[str
     return any(changed_file for _, changed_file in sync_results), errors
 
 
-def sync_versions(specs: list[VersionSyncSpec]) -> tuple[bool, list[str]]:
+def sync_versions(specs: list[VersionSyncSpec], *, check: bool = False) -> tuple[bool, list[str]]:
     changed = False
     errors: list[str] = []
+    file_contents: dict[Path, str] = {}
 
     for spec in specs:
         for entry in spec.entries:
-            entry_changed, entry_errors = _sync_entry(spec, entry)
+            entry_changed, entry_errors = _sync_entry(spec, entry, file_contents, check=check)
             changed = changed or entry_changed
             errors.extend(entry_errors)
 
@@ -287,15 +327,18 @@ def _load_and_validate_config(config_path: Path) -> list[VersionSyncSpec] | None
     return specs
 
 
+@profiled
 def main(argv: Sequence[str] | None = None) -> int:
     args = parse_arguments(argv)
     config_path = args.config
 
-    specs = _load_and_validate_config(config_path)
+    with span("load config"):
+        specs = _load_and_validate_config(config_path)
     if specs is None:
         return 1
 
-    changed, errors = sync_versions(specs)
+    with span("sync versions", specs=len(specs)):
+        changed, errors = sync_versions(specs, check=args.check)
     if errors:
         for error in errors:
             print(error)
@@ -4,6 +4,8 @@
 from __future__ import annotations
 
 import argparse
+import contextlib
+import hashlib
 import json  # for writing JSON, we need a pretty printer. PyJSON5 doesn't support this: https://github.com/Kijewski/pyjson5/issues/19#issuecomment-970504400
 import logging
 import sys
@@ -11,12 +13,15 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
-import pyjson5  # for parsing comments, we need JSON5
+from dev_tools.utils.cache_utils import get_cache_directory, get_tool_version
+from dev_tools.utils.profiling import add_profile_argument, count, profiled, span
 
 if TYPE_CHECKING:
     from collections.abc import Sequence
 
 DEFAULT_INDENT = 4
+SYNC_STATE_VERSION = 1
+MAX_REPORTED_OVERWRITES = 20
 
 
 @dataclass
@@ -26,25 +31,49 @@ class DictOverwriteRecord:
     key: str
     old_value: Any
     new_value: Any
+    parent_keys: tuple[str, ...] = ()
+    added: bool = False
 
+    @property
+    def key_path(self) -> tuple[str, ...]:
+        return (*self.parent_keys, self.key)
 
-def load_devcontainer_config(devcontainer_json_path: Path) -> Any:  # noqa: ANN401
-    return pyjson5.loads(devcontainer_json_path.read_text())["customizations"]["vscode"]
 
+def load_json5(json_path: Path) -> Any:  # noqa: ANN401
+    # for parsing comments, we need JSON5
+    import pyjson5  # noqa: PLC0415
+
+    return pyjson5.loads(json_path.read_text())
 
-def get_and_set(dict: Any, key: Any, value: Any) -> Any:  # noqa: ANN401
-    old_value = dict.get(key, None)
-    dict[key] = value
-    return old_value
 
+def load_devcontainer_config(devcontainer_json_path: Path) -> Any:  # noqa: ANN401
+    return load_json5(devcontainer_json_path)["customizations"]["vscode"]
 
-def update_dict_overwriting_values(dict: Any, new_values_dict: dict) -> list[DictOverwriteRecord]:  # noqa: ANN401
-    overwrite_records = []
-    for key, value in new_values_dict.items():
-        old_value = get_and_set(dict, key, value)
-        if old_value is not None and old_value != value:
-            overwrite_records.append(DictOverwriteRecord(key, old_value, value))
-    return overwrite_records
+
+def merge_dicts_recursively(
+    target: dict,
+    new_values: dict,
+    parent_keys: tuple[str, ...] = (),
+    records: list[DictOverwriteRecord] | None = None,
+) -> list[DictOverwriteRecord]:
+    """Merge new_values into target in place and record every added or overwritten value by its key path.
+
+    Nested objects are merged key by key, so only the changed leaves are set and recorded, while all other values
+    are lists or scalars and replaced as a whole. Values equal to the existing ones are neither set nor recorded.
+    """
+    records = [] if records is None else records
+    for key, value in new_values.items():
+        if key not in target:
+            target[key] = value
+            records.append(DictOverwriteRecord(key, None, value, parent_keys, added=True))
+            continue
+        old_value = target[key]
+        if isinstance(old_value, dict) and isinstance(value, dict):
+            merge_dicts_recursively(old_value, value, (*parent_keys, key), records)
+        elif old_value != value or type(old_value) is not type(value):
+            target[key] = value
+            records.append(DictOverwriteRecord(key, old_value, value, parent_keys))
+    return records
 
 
 def combine_lists_without_duplicates(
@@ -60,14 +89,28 @@ def write_vscode_json(json_path: Path, json_dict: dict, indent: int) -> None:
     json_path.write_text(json.dumps(json_dict, indent=indent, ensure_ascii=False) + "\n")
 
 
+def write_vscode_json_if_changed(json_path: Path, json_dict: dict, old_json_dict: dict, indent: int) -> bool:
+    """Write json_dict unless the file already has this content, so its modification time stays unchanged."""
+    if json_path.is_file() and json_dict == old_json_dict:
+        msg = f"{json_path} is up to date"
+        logging.info(msg)
+        return False
+    write_vscode_json(json_path, json_dict, indent=indent)
+    return True
+
+
 def update_vscode_settings_json(
     settings_json: Path, settings_dict: dict, indent: int = DEFAULT_INDENT
 ) -> list[DictOverwriteRecord]:
-    old_settings_dict = pyjson5.loads(settings_json.read_text()) if settings_json.is_file() else {}
-    overwrite_records = update_dict_overwriting_values(old_settings_dict, settings_dict)
-    write_vscode_json(settings_json, old_settings_dict, indent=indent)
+    settings = load_json5(settings_json) if settings_json.is_file() else {}
+    merge_records = merge_dicts_recursively(settings, settings_dict)
+    if merge_records or not settings_json.is_file():
+        write_vscode_json(settings_json, settings, indent=indent)
+    else:
+        msg = f"{settings_json} is up to date"
+        logging.info(msg)
 
-    return overwrite_records
+    return [record for record in merge_records if not record.added]
 
 
 def get_extension_recommendations(extensions_dict: Any) -> list[str]:  # noqa: ANN401
@@ -90,20 +133,69 @@ def filter_out_unwanted_recommendations(recommendations: list[str]) -> list[str]
 def update_vscode_extensions_json(
     extensions_json: Path, extensions_list: list[str], indent: int = DEFAULT_INDENT
 ) -> None:
-    old_extensions_dict = pyjson5.loads(extensions_json.read_text()) if extensions_json.is_file() else {}
+    old_extensions_dict = load_json5(extensions_json) if extensions_json.is_file() else {}
     old_extensions_list = get_extension_recommendations(old_extensions_dict)
-    old_extensions_dict["recommendations"] = combine_lists_without_duplicates(
-        old_extensions_list, filter_out_unwanted_recommendations(extensions_list)
-    )
-    write_vscode_json(extensions_json, old_extensions_dict, indent=indent)
+    new_extensions_dict = {
+        **old_extensions_dict,
+        "recommendations": combine_lists_without_duplicates(
+            old_extensions_list, filter_out_unwanted_recommendations(extensions_list)
+        ),
+    }
+    write_vscode_json_if_changed(extensions_json, new_extensions_dict, old_extensions_dict, indent=indent)
+
+
+def compute_sync_fingerprint(paths: Sequence[Path], options: Sequence[object]) -> str:
+    """Hash the content of all files taking part in a sync together with the options changing its result.
+
+    The dev-tools version is part of the fingerprint, since an upgrade can change the synced settings.
+    """
+    fingerprint = hashlib.sha256(json.dumps([SYNC_STATE_VERSION, get_tool_version(), *map(str, options)]).encode())
+    for path in paths:
+        fingerprint.update(f"\0{path.absolute()}\0".encode())
+        try:
+            fingerprint.update(path.read_bytes())
+        except OSError:
+            fingerprint.update(b"\0missing")
+    return fingerprint.hexdigest()
+
+
+class SyncState:
+    """Remember the fingerprint of the files after the last sync of every devcontainer.json."""
+
+    def __init__(self, state_file: Path) -> None:
+        self.__state_file = state_file
+
+    def is_up_to_date(self, devcontainer_json: Path, fingerprint: str) -> bool:
+        return self._load().get(str(devcontainer_json.absolute())) == fingerprint
+
+    def save(self, devcontainer_json: Path, fingerprint: str) -> None:
+        state = self._load()
+        state[str(devcontainer_json.absolute())] = fingerprint
+        with contextlib.suppress(OSError):
+            self.__state_file.parent.mkdir(parents=True, exist_ok=True)
+            self.__state_file.write_text(json.dumps(state))
+
+    def _load(self) -> dict[str, str]:
+        with contextlib.suppress(OSError, ValueError):
+            state = json.loads(self.__state_file.read_text())
+            if isinstance(state, dict):
+                return state
+        return {}
+
+
+def format_key_path(key_path: Sequence[str]) -> str:
+    return " > ".join(f"'{key}'" for key in key_path)
 
 
 def report_settings_findings(findings: list[DictOverwriteRecord], settings_json: Path) -> None:
     if any(findings):
         msg = f"Updated {settings_json}"
         logging.info(msg)
-        for finding in findings:
-            msg = f"In {settings_json}, '{finding.key}' was overwritten from '{finding.old_value}' to '{finding.new_value}'"
+        for finding in findings[:MAX_REPORTED_OVERWRITES]:
+            msg = f"In {settings_json}, {format_key_path(finding.key_path)} was overwritten from '{finding.old_value}' to '{finding.new_value}'"
+            logging.warning(msg)
+        if len(findings) > MAX_REPORTED_OVERWRITES:
+            msg = f"In {settings_json}, {len(findings) - MAX_REPORTED_OVERWRITES} more values were overwritten"
             logging.warning(msg)
 
 
@@ -132,6 +224,18 @@ def parse_arguments(args: Sequence[str] | None = None) -> argparse.Namespace:
         help="Path to extensions.json which will contain merged settings",
     )
     parser.add_argument("--indent", type=int, default=DEFAULT_INDENT, help="Indentation level for JSON output")
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Sync even if devcontainer.json and the target files didn't change since the last sync",
+    )
+    parser.add_argument(
+        "--state-file",
+        type=Path,
+        default=get_cache_directory("sync-vscode-config") / "state.json",
+        help="Path to the file storing the hashes of the files after the last sync",
+    )
+    add_profile_argument(parser)
     return parser.parse_args(args)
 
 
@@ -143,15 +247,37 @@ def _should_sync_extensions(args: argparse.Namespace) -> bool:
     return not args.no_sync_extensions
 
 
+def _get_synced_paths(args: argparse.Namespace) -> list[Path]:
+    return [
+        args.devcontainer_json,
+        *([args.settings_path] if _should_sync_settings(args) else []),
+        *([args.extensions_path] if _should_sync_extensions(args) else []),
+    ]
+
+
+def _get_sync_fingerprint(args: argparse.Namespace) -> str:
+    options = [args.indent, _should_sync_settings(args), _should_sync_extensions(args)]
+    return compute_sync_fingerprint(_get_synced_paths(args), options)
+
+
+@profiled
 def main() -> int:
     args = parse_arguments()
     lvl = logging.INFO if args.verbose else logging.WARNING
     logging.basicConfig(level=lvl, format="%(asctime)s [%(levelname)s] %(message)s")
 
+    sync_state = None if args.no_cache else SyncState(args.state_file)
+    if sync_state is not None and sync_state.is_up_to_date(args.devcontainer_json, _get_sync_fingerprint(args)):
+        count("sync_state_hits")
+        msg = f"Nothing changed since the last sync from {args.devcontainer_json}"
+        logging.info(msg)
+        return 0
+
     msg = f"Syncing VS Code settings and extensions from {args.devcontainer_json} to {args.settings_path} and {args.extensions_path}"
     logging.info(msg)
 
-    devcontainer_config = load_devcontainer_config(args.devcontainer_json)
+    with span("load devcontainer config"):
+        devcontainer_config = load_devcontainer_config(args.devcontainer_json)
     if _should_sync_settings(args):
         settings_findings = update_vscode_settings_json(
             args.settings_path, devcontainer_config.get("settings", {}), indent=args.indent
@@ -163,6 +289,8 @@ def main() -> int:
             args.extensions_path, devcontainer_config.get("extensions", []), indent=args.indent
         )
 
+    if sync_state is not None:
+        sync_state.save(args.devcontainer_json, _get_sync_fingerprint(args))
     return 0
 
 
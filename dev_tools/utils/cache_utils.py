@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+import os
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+
+
+def get_cache_directory(name: str) -> Path:
+    """Return the cache directory of a tool in `$XDG_CACHE_HOME`, which defaults to `~/.cache`."""
+    cache_home = os.environ.get("XDG_CACHE_HOME")
+    return (Path(cache_home) if cache_home else Path.home() / ".cache") / name
+
+
+def get_tool_version() -> str:
+    """Return the installed dev-tools version, so that cached results of an older version are not reused."""
+    try:
+        return version("dev-tools")
+    except PackageNotFoundError:
+        return "unknown"
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import codecs
+import functools
+import re
+import subprocess
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from dev_tools.utils.profiling import span
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator, Sequence
+
+HUNK_HEADER_PATTERN = re.compile(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@")
+
+
+@dataclass(frozen=True)
+class LineRange:
+    """Lines `start` up to `end` (exclusive) of a file, counted from 1."""
+
+    start: int
+    end: int
+
+
+@functools.cache
+def get_changed_lines(diff_base: str) -> dict[Path, list[LineRange]]:
+    """Return the lines added or modified since `diff_base` per file, using a single `git diff` for all files."""
+    command = ["git", "-c", "core.quotePath=false", "diff", "-U0", "--no-color", "--no-ext-diff", "--relative"]
+    with span("git diff", "subprocess", diff_base=diff_base):
+        output = subprocess.check_output([*command, diff_base, "--"])
+    return parse_changed_lines(output.decode(errors="replace"))
+
+
+def parse_changed_lines(diff: str) -> dict[Path, list[LineRange]]:
+    changed_lines: dict[Path, list[LineRange]] = {}
+    line_ranges: list[LineRange] = []
+    in_file_header = False
+    for line in diff.splitlines():
+        if line.startswith("diff --git "):
+            in_file_header = True
+            line_ranges = []
+        elif in_file_header and line.startswith("+++ "):
+            # Deleted files have no new lines to check
+            if (path := parse_diff_path(line[4:])).startswith("b/"):
+                line_ranges = changed_lines.setdefault(Path(path[2:]), [])
+        elif match := HUNK_HEADER_PATTERN.match(line):
+            in_file_header = False
+            start = int(match.group(1))
+            count = 1 if match.group(2) is None else int(match.group(2))
+            if count:
+                line_ranges.append(LineRange(start, start + count))
+    return changed_lines
+
+
+def parse_diff_path(path: str) -> str:
+    """Undo the tab git appends to paths with whitespace and the C-style quoting of paths with special characters."""
+    path = path.removesuffix("\t")
+    if path.startswith('"') and path.endswith('"'):
+        return codecs.escape_decode(path[1:-1].encode())[0].decode()
+    return path
+
+
+def get_changed_line_ranges(diff_base: str | None, filename: Path) -> list[LineRange] | None:
+    """Return the changed lines of a file or None to check the whole file if no diff base is given."""
+    return None if diff_base is None else get_changed_lines(diff_base).get(filename, [])
+
+
+def filter_changed_files(diff_base: str, filenames: Sequence[Path]) -> list[Path]:
+    changed_lines = get_changed_lines(diff_base)
+    return [filename for filename in filenames if changed_lines.get(filename)]
+
+
+def iter_lines_in_ranges(lines: Sequence[str], line_ranges: Sequence[LineRange]) -> Iterator[tuple[int, str]]:
+    """Yield the line numbers and lines within the ranges, skipping everything in between."""
+    for line_range in line_ranges:
+        for line_number in range(line_range.start, min(line_range.end, len(lines) + 1)):
+            yield line_number, lines[line_number - 1]
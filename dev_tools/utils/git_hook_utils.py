@@ -7,6 +7,8 @@ from argparse import ArgumentParser, Namespace
 from pathlib import Path
 from typing import TYPE_CHECKING
 
+from dev_tools.utils.profiling import add_profile_argument
+
 if TYPE_CHECKING:
     from collections.abc import Sequence
 
@@ -15,7 +17,25 @@ def parse_arguments(argv: Sequence[str] | None) -> Namespace:
     return create_default_parser().parse_args(argv)
 
 
-def create_default_parser() -> ArgumentParser:
+def create_default_parser(*, cacheable: bool = False, diffable: bool = False) -> ArgumentParser:
     parser = ArgumentParser()
     parser.add_argument("filenames", nargs="*", type=Path)
+    add_profile_argument(parser)
+    if cacheable:
+        parser.add_argument(
+            "--cache",
+            action="store_true",
+            help="Replay the results of files checked with the same content and arguments by a previous run.",
+        )
+        parser.add_argument(
+            "--cache-file",
+            type=Path,
+            help="SQLite database of the result cache. Defaults to $XDG_CACHE_HOME/dev-tools/results.sqlite.",
+        )
+    if diffable:
+        parser.add_argument(
+            "--diff-base",
+            metavar="REV",
+            help="Only check the lines added or modified since the git revision REV, e.g. origin/main.",
+        )
     return parser
@@ -2,21 +2,57 @@ from __future__ import annotations
 
 from pathlib import Path
 
-from pre_commit.clientlib import load_manifest
-from pre_commit.constants import MANIFEST_FILE
+# Same as pre_commit.constants.MANIFEST_FILE, which is not imported to keep the startup of the hooks fast
+MANIFEST_FILE = ".pre-commit-hooks.yaml"
+
+
+class HookManifest:
+    """The hooks of a `.pre-commit-hooks.yaml` indexed by their id."""
+
+    def __init__(self, hooks: list[dict]) -> None:
+        self.__hooks = hooks
+        self.__hooks_by_id = {hook["id"]: hook for hook in hooks}
+
+    @property
+    def hooks(self) -> list[dict]:
+        return list(self.__hooks)
+
+    def get_hook(self, hook_id: str) -> dict:
+        try:
+            return self.__hooks_by_id[hook_id]
+        except KeyError:
+            msg = f"{hook_id} not found in hooks manifest"
+            raise ValueError(msg) from None
+
+
+# Parsed manifests per resolved path with the modification time and size they were parsed at
+_loaded_manifests: dict[Path, tuple[tuple[int, int], HookManifest]] = {}
+
+
+def load_hook_manifest(manifest_file: Path) -> HookManifest:
+    """Parse and validate the manifest once per process and again only if the file changed."""
+    file_stat = manifest_file.stat()
+    version = (file_stat.st_mtime_ns, file_stat.st_size)
+    resolved_manifest_file = manifest_file.resolve()
+    if (loaded_manifest := _loaded_manifests.get(resolved_manifest_file)) and loaded_manifest[0] == version:
+        return loaded_manifest[1]
+
+    from pre_commit.clientlib import load_manifest  # noqa: PLC0415
+
+    manifest = HookManifest(list(load_manifest(manifest_file)))
+    _loaded_manifests[resolved_manifest_file] = (version, manifest)
+    return manifest
 
 
 def get_hooks_manifest(repo_root: Path | None = None) -> list[dict]:
     if repo_root is None:
         repo_root = Path.cwd()
 
-    hooks_manifest = repo_root / MANIFEST_FILE
-    return list(load_manifest(hooks_manifest))
+    return load_hook_manifest(repo_root / MANIFEST_FILE).hooks
 
 
-def get_hook_by_id(hook_id: str) -> dict:
-    for hook in get_hooks_manifest():
-        if hook["id"] == hook_id:
-            return hook
-    msg = f"{hook_id} not found in hooks manifest"
-    raise ValueError(msg)
+def get_hook_by_id(hook_id: str, repo_root: Path | None = None) -> dict:
+    if repo_root is None:
+        repo_root = Path.cwd()
+
+    return load_hook_manifest(repo_root / MANIFEST_FILE).get_hook(hook_id)
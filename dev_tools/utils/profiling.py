@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import contextlib
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from argparse import ArgumentParser
+from collections import Counter
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator, Sequence
+
+PROFILE_ENVIRONMENT_VARIABLE = "DEV_TOOLS_PROFILE"
+# Files with this suffix are written as Chrome trace, all others get one trace event per line appended
+CHROME_TRACE_SUFFIX = ".json"
+
+
+class Profiler:
+    """Record phases, subprocesses and counters of a hook run as Chrome trace events."""
+
+    def __init__(self, output: Path) -> None:
+        self.__output = output
+        self.__events: list[dict[str, Any]] = []
+        self.__counters: Counter[str] = Counter()
+        # Absolute timestamps allow merging the traces of hooks running in parallel processes
+        self.__epoch_offset = time.time() - time.perf_counter()
+
+    @property
+    def counters(self) -> dict[str, float]:
+        return dict(self.__counters)
+
+    @property
+    def events(self) -> list[dict[str, Any]]:
+        return [*self.__events, self._create_event("counters", "counter", "C", time.perf_counter(), self.counters)]
+
+    @contextlib.contextmanager
+    def span(self, name: str, category: str, **args: object) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            event = self._create_event(name, category, "X", start, args)
+            event["dur"] = (time.perf_counter() - start) * 1e6
+            self.__events.append(event)
+
+    def count(self, name: str, value: float = 1) -> None:
+        self.__counters[name] += value
+
+    def write(self) -> None:
+        # Profiling must never fail the hook it observes.
+        with contextlib.suppress(OSError):
+            self.__output.parent.mkdir(parents=True, exist_ok=True)
+            if self.__output.suffix == CHROME_TRACE_SUFFIX:
+                self.__output.write_text(json.dumps({"traceEvents": self.events}))
+            else:
+                with self.__output.open("a") as output_file:
+                    output_file.write("".join(json.dumps(event) + "\n" for event in self.events))
+
+    def _create_event(self, name: str, category: str, phase: str, start: float, args: dict) -> dict[str, Any]:
+        return {
+            "name": name,
+            "cat": category,
+            "ph": phase,
+            "ts": (self.__epoch_offset + start) * 1e6,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "args": args,
+        }
+
+
+# The profilers of the running entry points, usually at most one
+_active_profilers: list[Profiler] = []
+
+
+def get_profiler() -> Profiler | None:
+    return _active_profilers[-1] if _active_profilers else None
+
+
+def span(name: str, category: str = "phase", **args: object) -> contextlib.AbstractContextManager[None]:
+    """Time a block if profiling is enabled, e.g. a phase of a hook or a subprocess."""
+    profiler = get_profiler()
+    return contextlib.nullcontext() if profiler is None else profiler.span(name, category, **args)
+
+
+def count(name: str, value: float = 1) -> None:
+    if profiler := get_profiler():
+        profiler.count(name, value)
+
+
+@contextlib.contextmanager
+def accumulate(name: str) -> Iterator[None]:
+    """Sum up the seconds spent in a block into a counter, for blocks running too often for a span each."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        count(f"{name}_seconds", time.perf_counter() - start)
+
+
+def count_file(filename: Path) -> None:
+    """Count a file and its size as bytes read."""
+    if profiler := get_profiler():
+        profiler.count("files")
+        with contextlib.suppress(OSError):
+            profiler.count("bytes_read", filename.stat().st_size)
+
+
+def add_profile_argument(parser: ArgumentParser) -> None:
+    parser.add_argument(
+        "--profile",
+        type=Path,
+        metavar="FILE",
+        help=(
+            f"Append timings and counters to FILE as JSON lines or write a Chrome trace if it ends with "
+            f"{CHROME_TRACE_SUFFIX}. Defaults to ${PROFILE_ENVIRONMENT_VARIABLE}."
+        ),
+    )
+
+
+def find_profile_output(argv: Sequence[str]) -> Path | None:
+    parser = ArgumentParser(add_help=False, allow_abbrev=False)
+    add_profile_argument(parser)
+    profile_output = parser.parse_known_args(argv)[0].profile
+    if profile_output is None and (environment_output := os.environ.get(PROFILE_ENVIRONMENT_VARIABLE)):
+        return Path(environment_output)
+    return profile_output
+
+
+def profiled(main: Callable[..., int]) -> Callable[..., int]:
+    """Profile an entry point if enabled by `--profile` or the `DEV_TOOLS_PROFILE` environment variable."""
+
+    @functools.wraps(main)
+    def profiled_main(*args: Any, **kwargs: Any) -> int:  # noqa: ANN401
+        argv = args[0] if args and args[0] is not None else sys.argv[1:]
+        profile_output = find_profile_output(argv)
+        if profile_output is None or _active_profilers:
+            return main(*args, **kwargs)
+
+        profiler = Profiler(profile_output)
+        _active_profilers.append(profiler)
+        name = Path(sys.argv[0]).stem if main.__module__ == "__main__" else main.__module__
+        try:
+            with profiler.span(name, "main", argv=list(map(str, argv))):
+                return main(*args, **kwargs)
+        finally:
+            _active_profilers.pop()
+            profiler.write()
+
+    return profiled_main
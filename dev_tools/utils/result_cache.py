@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import sqlite3
+import stat
+from typing import TYPE_CHECKING
+
+from dev_tools.utils.cache_utils import get_cache_directory, get_tool_version
+from dev_tools.utils.profiling import count, count_file, span
+
+if TYPE_CHECKING:
+    from argparse import Namespace
+    from collections.abc import Callable
+    from pathlib import Path
+
+# Bump to invalidate all stored results, e.g. when the format of the stored diagnostics changes
+RESULT_CACHE_VERSION = 1
+_CACHE_ARGUMENTS = frozenset({"filenames", "cache", "cache_file", "profile"})
+
+
+def compute_cache_key(hook_id: str, args: Namespace) -> str:
+    """Hash everything except the file content which changes the result of a hook."""
+    arguments = {name: value for name, value in vars(args).items() if name not in _CACHE_ARGUMENTS}
+    return hashlib.sha256(
+        json.dumps([RESULT_CACHE_VERSION, get_tool_version(), hook_id, arguments], sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+
+def compute_blob_hash(filename: Path) -> str:
+    """Hash the content and the executable bit of a file, just like git identifies a file in a tree."""
+    mode = "100755" if filename.stat().st_mode & stat.S_IXUSR else "100644"
+    return f"{mode}:{hashlib.sha256(filename.read_bytes()).hexdigest()}"
+
+
+class ResultCache:
+    """Diagnostics of a hook per file path and content, stored in a SQLite database shared by all hooks."""
+
+    def __init__(self, cache_file: Path, key: str) -> None:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        # pre-commit runs several processes of a hook in parallel, which wait for each other's writes
+        self.__connection = sqlite3.connect(cache_file, timeout=30)
+        self.__connection.execute(
+            "CREATE TABLE IF NOT EXISTS results "
+            "(key TEXT, path TEXT, blob TEXT, diagnostics TEXT, PRIMARY KEY (key, path, blob))"
+        )
+        self.__key = key
+        self.__new_results: list[tuple[str, str, str, str]] = []
+
+    def save(self) -> None:
+        """Write the results added since opening the cache and close it."""
+        # The cache is an optimization only, failing to write it must not fail the hook.
+        with contextlib.suppress(sqlite3.Error), self.__connection:
+            self.__connection.executemany("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)", self.__new_results)
+        self.__connection.close()
+
+    def get(self, filename: Path, blob: str) -> list[str] | None:
+        try:
+            row = self.__connection.execute(
+                "SELECT diagnostics FROM results WHERE key = ? AND path = ? AND blob = ?",
+                (self.__key, str(filename), blob),
+            ).fetchone()
+        except sqlite3.Error:
+            return None
+        return json.loads(row[0]) if row else None
+
+    def put(self, filename: Path, blob: str, diagnostics: list[str]) -> None:
+        """Remember the diagnostics of a file, which are written on save."""
+        self.__new_results.append((self.__key, str(filename), blob, json.dumps(diagnostics)))
+
+
+def check_files(args: Namespace, hook_id: str, check: Callable[[Path], list[str]]) -> dict[Path, list[str]]:
+    """Return the diagnostics of check for every file, replayed from the result cache if enabled by `--cache`."""
+    with span("check files", files=len(args.filenames)):
+        return _check_files(args, hook_id, check)
+
+
+def _check_files(args: Namespace, hook_id: str, check: Callable[[Path], list[str]]) -> dict[Path, list[str]]:
+    for filename in args.filenames:
+        count_file(filename)
+    # With a diff base, the result depends on the changed lines and not only on the file content.
+    if not args.cache or getattr(args, "diff_base", None):
+        return {filename: check(filename) for filename in args.filenames}
+
+    try:
+        cache = ResultCache(
+            args.cache_file or get_cache_directory("dev-tools") / "results.sqlite", compute_cache_key(hook_id, args)
+        )
+    except (OSError, sqlite3.Error):
+        return {filename: check(filename) for filename in args.filenames}
+
+    diagnostics: dict[Path, list[str]] = {}
+    try:
+        for filename in args.filenames:
+            blob = compute_blob_hash(filename)
+            cached_diagnostics = cache.get(filename, blob)
+            count("cache_hits" if cached_diagnostics is not None else "cache_misses")
+            if cached_diagnostics is None:
+                cached_diagnostics = check(filename)
+                cache.put(filename, blob, cached_diagnostics)
+            diagnostics[filename] = cached_diagnostics
+    finally:
+        cache.save()
+    return diagnostics
@@ -0,0 +1,86 @@
+"""Collect and cache the `bazel info` values needed to generate the VS Code configuration."""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+BAZEL_INFO_KEYS = ("workspace", "execution_root", "bazel-bin")
+DEFAULT_BIN_DIR = "bazel-out/k8-dbg/bin"
+WORKSPACE_BOUNDARY_FILES = ("MODULE.bazel", "REPO.bazel", "WORKSPACE.bazel", "WORKSPACE")
+# Files in the workspace root that can change the values reported by `bazel info`.
+BAZEL_INFO_INPUT_FILES = (".bazelrc", ".bazelversion")
+
+
+@dataclass(frozen=True)
+class BazelInfo:
+    """Paths of a Bazel workspace as reported by a single `bazel info` call."""
+
+    workspace: Path
+    execution_root: Path
+    bazel_bin: Path
+
+    @classmethod
+    def from_info_output(cls: type[BazelInfo], output: str) -> BazelInfo:
+        values = dict(line.split(": ", 1) for line in output.splitlines() if ": " in line)
+        return cls(*(Path(values[key].strip()) for key in BAZEL_INFO_KEYS))
+
+    @property
+    def bin_dir(self) -> str:
+        """Return the `bazel-bin` directory relative to the workspace, i.e. via the `bazel-out` symlink.
+
+        Falls back to the default if `bazel-bin` is outside the execution root, e.g. for some remote output layouts.
+        """
+        try:
+            return self.bazel_bin.relative_to(self.execution_root).as_posix()
+        except ValueError:
+            return DEFAULT_BIN_DIR
+
+
+def find_workspace_root(start: Path) -> Path | None:
+    """Find the workspace root like Bazel does, by searching upwards for a workspace boundary file."""
+    for directory in (start, *start.parents):
+        if any((directory / boundary_file).is_file() for boundary_file in WORKSPACE_BOUNDARY_FILES):
+            return directory
+    return None
+
+
+class BazelInfoCache:
+    """Persist the `bazel info` values of a workspace per set of Bazel arguments."""
+
+    def __init__(self, workspace_root: Path, cache_file: Path) -> None:
+        self.__workspace_root = workspace_root
+        self.__cache_file = cache_file
+
+    def get(self, bazel_args: Sequence[str]) -> BazelInfo | None:
+        with contextlib.suppress(OSError, ValueError, KeyError, TypeError):
+            entry = json.loads(self.__cache_file.read_text())[self._key(bazel_args)]
+            info = BazelInfo(**{field: Path(value) for field, value in entry.items()})
+            # A removed output base, e.g. after `bazel clean --expunge`, invalidates the entry.
+            if info.execution_root.is_dir():
+                return info
+        return None
+
+    def save(self, bazel_args: Sequence[str], info: BazelInfo) -> None:
+        entries = {}
+        with contextlib.suppress(OSError, ValueError):
+            entries = json.loads(self.__cache_file.read_text())
+        entries[self._key(bazel_args)] = {field: str(value) for field, value in asdict(info).items()}
+        with contextlib.suppress(OSError):
+            self.__cache_file.parent.mkdir(parents=True, exist_ok=True)
+            self.__cache_file.write_text(json.dumps(entries))
+
+    def _key(self, bazel_args: Sequence[str]) -> str:
+        key = hashlib.sha256(json.dumps(list(bazel_args)).encode())
+        for input_file in BAZEL_INFO_INPUT_FILES:
+            key.update(input_file.encode())
+            with contextlib.suppress(OSError):
+                key.update((self.__workspace_root / input_file).read_bytes())
+        return key.hexdigest()
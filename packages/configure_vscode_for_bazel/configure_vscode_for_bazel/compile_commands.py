@@ -0,0 +1,72 @@
+"""Split the `compile_commands.json` generation into shards and merge their outputs."""
+
+from __future__ import annotations
+
+import logging
+import re
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Sequence
+    from pathlib import Path
+
+COMPILE_COMMANDS_FILE = "compile_commands.json"
+REFRESH_TARGET_NAME = "refresh_compile_commands"
+ROOT_SHARD = "root"
+_INVALID_TARGET_NAME_CHARACTERS = re.compile(r"[^A-Za-z0-9_]")
+
+
+def get_shard_name(pattern: str) -> str:
+    """Return the top-level package or external repository of a pattern as valid part of a target name."""
+    repository, _, package = pattern.lstrip("@").partition("//")
+    top_level_package = package.split(":", 1)[0].split("/", 1)[0]
+    if top_level_package in {"", "..."}:
+        top_level_package = ""
+    name = "_".join(part for part in (repository, top_level_package) if part) or ROOT_SHARD
+    return _INVALID_TARGET_NAME_CHARACTERS.sub("_", name)
+
+
+def group_patterns_into_shards(patterns: Sequence[str]) -> dict[str, list[str]]:
+    shards: dict[str, list[str]] = {}
+    for pattern in patterns:
+        shards.setdefault(get_shard_name(pattern), []).append(pattern)
+    return shards
+
+
+def get_shard_target_name(shard: str) -> str:
+    return f"{REFRESH_TARGET_NAME}_{shard}"
+
+
+def get_shard_from_target(target: str) -> str | None:
+    name = target.rsplit(":", 1)[-1]
+    prefix = f"{REFRESH_TARGET_NAME}_"
+    return name.removeprefix(prefix) if name.startswith(prefix) else None
+
+
+def store_compile_commands_shard(workspace_root: Path, shard_directory: Path, shard: str) -> None:
+    """Move the `compile_commands.json` file written by the refresh of a shard into the shard directory."""
+    shard_directory.mkdir(parents=True, exist_ok=True)
+    (workspace_root / COMPILE_COMMANDS_FILE).replace(shard_directory / f"{shard}.json")
+
+
+def merge_compile_commands(shard_files: Iterable[Path], output: Path) -> int:
+    """Concatenate the JSON arrays of all shard files into output without parsing them.
+
+    Only one shard is held in memory at a time. Missing shard files are skipped.
+    Return the number of merged shards.
+    """
+    merged_shards = 0
+    with output.open("w") as output_file:
+        output_file.write("[")
+        for shard_file in shard_files:
+            try:
+                entries = shard_file.read_text().strip().removeprefix("[").removesuffix("]").strip()
+            except OSError:
+                logging.warning("Skipping missing compile commands shard %s", shard_file)
+                continue
+            if entries:
+                output_file.write(",\n" if merged_shards else "\n")
+                output_file.write(entries)
+                merged_shards += 1
+        output_file.write("\n]\n")
+    return merged_shards
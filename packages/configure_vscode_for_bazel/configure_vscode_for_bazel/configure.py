@@ -11,17 +11,42 @@ from __future__ import annotations
 import argparse
 import json
 import logging
+import re
 import shutil
 import subprocess
 import sys
 import textwrap
+import time
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
+from configure_vscode_for_bazel.bazel_info import (
+    BAZEL_INFO_KEYS,
+    DEFAULT_BIN_DIR,
+    BazelInfo,
+    BazelInfoCache,
+    find_workspace_root,
+)
+from configure_vscode_for_bazel.compile_commands import (
+    COMPILE_COMMANDS_FILE,
+    REFRESH_TARGET_NAME,
+    get_shard_from_target,
+    get_shard_target_name,
+    group_patterns_into_shards,
+    merge_compile_commands,
+    store_compile_commands_shard,
+)
+from configure_vscode_for_bazel.query_cache import QueryCache
+
 if TYPE_CHECKING:
-    from collections.abc import Sequence
+    from collections.abc import Callable, Iterable, Iterator, Sequence
 
 MAX_TARGETS_WITHOUT_CONFIRMATION = 20
+QUERY_CACHE_FILE = ".bazel_query_cache.json"
+BAZEL_INFO_CACHE_FILE = ".bazel_info_cache.json"
+GENERATED_BY = "configure-vscode-for-bazel"
+EXECUTABLE_RULE_KINDS = ("cc_binary", "cc_test")
+COMPILE_COMMANDS_SHARDS_DIR = "compile_commands"
 
 
 def parse_arguments(argv: Sequence[str] | None = None) -> argparse.Namespace:
@@ -41,7 +66,7 @@ def parse_arguments(argv: Sequence[str] | None = None) -> argparse.Namespace:
     parser.add_argument(
         "--build",
         action="store_true",
-        help="Run recommended bazel build/run actions.",
+        help="Run recommended bazel build/run actions. Targets with the same flags are built by a single `bazel build`.",
     )
     parser.add_argument(
         "--additional-debug-arg",
@@ -51,6 +76,28 @@ def parse_arguments(argv: Sequence[str] | None = None) -> argparse.Namespace:
         action="extend",
         help="Additional arguments to pass to the bazel build command when building targets for the `launch.json` and `tasks.json`.",
     )
+    parser.add_argument(
+        "--combined-query",
+        action="store_true",
+        help="Query all patterns with a single `bazel query` that only returns executable rules.",
+    )
+    parser.add_argument(
+        "--query-cache",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help=f"Reuse the labels of a previous query from `.vscode/{QUERY_CACHE_FILE}` if no BUILD or .bzl file in scope changed. This is the default.",
+    )
+    parser.add_argument(
+        "--info-cache",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help=f"Reuse the `bazel info` values of a previous run from `.vscode/{BAZEL_INFO_CACHE_FILE}`. This is the default.",
+    )
+    parser.add_argument(
+        "--merge",
+        action="store_true",
+        help="Only add and remove generated entries in existing `launch.json` and `tasks.json` files and keep all other entries. Files are only written if their content changes.",
+    )
     parser.add_argument(
         "-f",
         "--force",
@@ -65,6 +112,19 @@ def parse_arguments(argv: Sequence[str] | None = None) -> argparse.Namespace:
         action="extend",
         help="Additional arguments to pass to the `compile_commands.json` refresh template.",
     )
+    parser.add_argument(
+        "--shard-compile-commands",
+        action="store_true",
+        help=f"Generate one refresh target per top-level package and merge their outputs into `{COMPILE_COMMANDS_FILE}`. The outputs are merged when running with `--build`.",
+    )
+    parser.add_argument(
+        "--compile-commands-shard",
+        type=str,
+        nargs="*",
+        default=[],
+        action="extend",
+        help=f"Only refresh these shards and reuse the stored output of all others from `.vscode/{COMPILE_COMMANDS_SHARDS_DIR}`. Implies `--shard-compile-commands`.",
+    )
     parser.add_argument(
         "--generate-debug-config",
         action=argparse.BooleanOptionalAction,
@@ -93,18 +153,40 @@ def run_bazel_command(command: str, *args: str, verbose: bool = False) -> None:
     """
     cmd = build_bazel_command(command, *args, verbose=verbose)
     logging.debug("Running command: %s", " ".join(cmd))
+    start = time.perf_counter()
     subprocess.check_call(cmd)
+    logging.debug("Command took %.3fs: %s", time.perf_counter() - start, " ".join(cmd))
 
 
 def run_bazel_command_output(command: str, *args: str) -> str:
     """Run a Bazel command and return its output as a string."""
     cmd = build_bazel_command(command, *args)
     logging.debug("Running command: %s", " ".join(cmd))
-    return subprocess.check_output(cmd).decode(sys.stdout.encoding)
+    start = time.perf_counter()
+    output = subprocess.check_output(cmd)
+    logging.debug("Command took %.3fs: %s", time.perf_counter() - start, " ".join(cmd))
+    return output.decode(sys.stdout.encoding)
+
+
+def stream_bazel_command_output(command: str, *args: str) -> Iterator[str]:
+    """Run a Bazel command and yield its output line by line while it is running.
+
+    Raises `subprocess.CalledProcessError` once the output is consumed if the command failed.
+    """
+    cmd = build_bazel_command(command, *args)
+    logging.debug("Running command: %s", " ".join(cmd))
+    with subprocess.Popen(cmd, stdout=subprocess.PIPE, encoding=sys.stdout.encoding) as process:
+        try:
+            yield from (line.rstrip("\n") for line in process.stdout or ())
+        except GeneratorExit:
+            process.kill()
+            raise
+    if process.returncode != 0:
+        raise subprocess.CalledProcessError(process.returncode, cmd)
 
 
 def is_executable_rule(kind: str, entity: str) -> bool:
-    return entity == "rule" and kind in ["cc_binary", "cc_test"]
+    return entity == "rule" and kind in EXECUTABLE_RULE_KINDS
 
 
 def confirm_or_abort(message: str = "") -> bool:
@@ -128,8 +210,18 @@ def confirm_config_overwrite(config_location: Path, force: bool) -> bool:  # noq
     return True
 
 
-def query_bazel_for_labels(pattern: str) -> str:
-    return run_bazel_command_output("query", f"'{pattern}'", "--output=label_kind")
+def query_bazel_for_labels(pattern: str) -> Iterator[str]:
+    return stream_bazel_command_output("query", f"'{pattern}'", "--output=label_kind")
+
+
+def build_combined_query(patterns: Sequence[str]) -> str:
+    """Build one query for the union of all patterns, filtered to executable rules by Bazel itself."""
+    targets = " ".join(f"'{pattern}'" for pattern in patterns)
+    return f"kind('^({'|'.join(EXECUTABLE_RULE_KINDS)}) rule$', set({targets}))"
+
+
+def query_bazel_for_executable_labels(patterns: Sequence[str]) -> Iterator[str]:
+    return stream_bazel_command_output("query", build_combined_query(patterns), "--output=label_kind")
 
 
 def get_label_from_bazel_query_line(line: str) -> str | None:
@@ -138,21 +230,40 @@ def get_label_from_bazel_query_line(line: str) -> str | None:
     return label if is_executable_rule(kind, entity) else None
 
 
-def get_labels_from_bazel_query_output(output: str, pattern: str) -> set[str]:
+def get_labels_from_bazel_query_output(output_lines: Iterable[str], pattern: str) -> set[str]:
     labels = {
-        label for label in (get_label_from_bazel_query_line(line) for line in output.splitlines()) if label is not None
+        label for label in (get_label_from_bazel_query_line(line) for line in output_lines if line) if label is not None
     }
     if not labels:
         logging.warning("No executable targets found for %s", pattern)
     return labels
 
 
-def find_executable_labels(patterns: Sequence[str], force: bool) -> set[str]:  # noqa: FBT001
-    logging.info("Searching for executable targets to generate launch.json...")
+def query_executable_labels(patterns: Sequence[str], *, combined_query: bool) -> set[str]:
+    if combined_query:
+        return get_labels_from_bazel_query_output(query_bazel_for_executable_labels(patterns), " ".join(patterns))
+
     labels_nested = (
         get_labels_from_bazel_query_output(query_bazel_for_labels(pattern), pattern) for pattern in patterns
     )
-    labels = {label for labels in labels_nested for label in labels}
+    return {label for labels in labels_nested for label in labels}
+
+
+def find_executable_labels(
+    patterns: Sequence[str],
+    force: bool,  # noqa: FBT001
+    *,
+    combined_query: bool = False,
+    query_cache: QueryCache | None = None,
+) -> set[str]:
+    logging.info("Searching for executable targets to generate launch.json...")
+    if query_cache is None:
+        labels = query_executable_labels(patterns, combined_query=combined_query)
+    else:
+        query_flags = ["--output=label_kind", *EXECUTABLE_RULE_KINDS, *(["--combined-query"] if combined_query else [])]
+        labels = query_cache.get_or_query(
+            patterns, query_flags, lambda: query_executable_labels(patterns, combined_query=combined_query)
+        )
 
     logging.info("Found %d executable target(s).", len(labels))
     logging.debug("Executable labels: %s", labels)
@@ -171,7 +282,7 @@ def get_build_task_label(bazel_label: str) -> str:
     return f"bazel: build {bazel_label}"
 
 
-def get_new_launch_config(executable_labels: set[str]) -> dict[str, Any]:
+def get_new_launch_config(executable_labels: set[str], bin_dir: str = DEFAULT_BIN_DIR) -> dict[str, Any]:
     return {
         "version": "0.2.0",
         "configurations": [
@@ -179,7 +290,7 @@ def get_new_launch_config(executable_labels: set[str]) -> dict[str, Any]:
                 "name": f"(gdb) {label}",
                 "type": "cppdbg",
                 "request": "launch",
-                "program": r"${workspaceFolder}/bazel-out/k8-dbg/bin/${binary_path}",
+                "program": f"${{workspaceFolder}}/{bin_dir}/${{binary_path}}",
                 "args": [],
                 "stopAtEntry": False,
                 "cwd": r"${workspaceFolder}",
@@ -196,11 +307,11 @@ def get_new_launch_config(executable_labels: set[str]) -> dict[str, Any]:
                 "miDebuggerPath": "/usr/bin/gdb",
                 "variables": {
                     "binary_path": get_path_from_label(label),
-                    "generated_by": "configure-vscode-for-bazel",
+                    "generated_by": GENERATED_BY,
                 },
                 "preLaunchTask": get_build_task_label(label),
             }
-            for label in executable_labels
+            for label in sorted(executable_labels)
         ],
     }
 
@@ -220,14 +331,14 @@ def get_new_task_config(label: str, additional_debug_args: list[str] | None = No
             "clear": True,
         },
         "problemMatcher": "$gcc",
-        "detail": f"{' '.join(debug_args_list)} (generated by configure-vscode-for-bazel)",
+        "detail": f"{' '.join(debug_args_list)} (generated by {GENERATED_BY})",
     }
 
 
 def get_new_tasks_config(executable_labels: set[str], additional_debug_args: list[str] | None = None) -> dict[str, Any]:
     return {
         "version": "2.0.0",
-        "tasks": [get_new_task_config(label, additional_debug_args) for label in executable_labels],
+        "tasks": [get_new_task_config(label, additional_debug_args) for label in sorted(executable_labels)],
     }
 
 
@@ -244,46 +355,175 @@ def save_new_json_config(new_config: dict[str, Any], config_location: Path, forc
     return True
 
 
-def update_launch_json(executable_labels: set[str], config_location: Path, *, force: bool = False) -> bool:
+def is_generated_launch_configuration(configuration: dict[str, Any]) -> bool:
+    return configuration.get("variables", {}).get("generated_by") == GENERATED_BY
+
+
+def is_generated_task(task: dict[str, Any]) -> bool:
+    return str(task.get("detail", "")).endswith(f"(generated by {GENERATED_BY})")
+
+
+def merge_generated_entries(
+    existing_entries: list[dict[str, Any]],
+    generated_entries: list[dict[str, Any]],
+    is_generated: Callable[[dict[str, Any]], bool],
+    key: str,
+) -> list[dict[str, Any]]:
+    """Replace the generated entries in place, drop outdated ones and append new ones after all existing entries."""
+    generated_by_key = {entry[key]: entry for entry in generated_entries}
+    merged_entries = []
+    for entry in existing_entries:
+        if not is_generated(entry):
+            merged_entries.append(entry)
+        elif entry.get(key) in generated_by_key:
+            merged_entries.append(generated_by_key.pop(entry[key]))
+    merged_entries.extend(generated_by_key.values())
+    return merged_entries
+
+
+# Strings are matched first so that comment markers and commas inside of them are kept
+JSONC_COMMENT_PATTERN = re.compile(r'("(?:\\.|[^"\\])*")|//[^\n]*|/\*[\s\S]*?\*/')
+JSONC_TRAILING_COMMA_PATTERN = re.compile(r'("(?:\\.|[^"\\])*")|,(\s*[}\]])')
+
+
+def load_jsonc(text: str) -> Any:  # noqa: ANN401
+    """Parse JSON with comments and trailing commas like the `launch.json` and `tasks.json` of VS Code."""
+    text = JSONC_COMMENT_PATTERN.sub(lambda match: match.group(1) or "", text)
+    text = JSONC_TRAILING_COMMA_PATTERN.sub(lambda match: match.group(1) or match.group(2), text)
+    return json.loads(text)
+
+
+def merge_json_config(
+    new_config: dict[str, Any],
+    config_location: Path,
+    entries_key: str,
+    is_generated: Callable[[dict[str, Any]], bool],
+    key: str,
+) -> bool:
+    """Merge the generated entries of new_config into config_location and keep all user entries.
+
+    The file is only written if the merged configuration differs from the existing one, which drops its comments.
+    """
+    if not config_location.exists():
+        return save_new_json_config(new_config, config_location, force=True)
+
+    try:
+        existing_config = load_jsonc(config_location.read_text())
+    except ValueError:
+        logging.warning("Can't merge into %s since it is no valid JSON.", config_location.resolve())
+        return False
+
+    merged_config = {
+        **existing_config,
+        entries_key: merge_generated_entries(
+            existing_config.get(entries_key, []), new_config[entries_key], is_generated, key
+        ),
+    }
+    if merged_config == existing_config:
+        logging.info("Configuration in %s is up to date", config_location)
+        return True
+
+    config_location.write_text(json.dumps(merged_config, indent=4))
+    logging.info("Merged new configuration into %s", config_location)
+    return True
+
+
+def update_launch_json(
+    executable_labels: set[str],
+    config_location: Path,
+    *,
+    force: bool = False,
+    merge: bool = False,
+    bin_dir: str = DEFAULT_BIN_DIR,
+) -> bool:
     if not executable_labels:
         return False
-    new_config = get_new_launch_config(executable_labels)
+    new_config = get_new_launch_config(executable_labels, bin_dir)
+    if merge:
+        return merge_json_config(
+            new_config, config_location, "configurations", is_generated_launch_configuration, "name"
+        )
     return save_new_json_config(new_config, config_location, force)
 
 
 def update_tasks_json(
-    executable_labels: set[str], config_location: Path, additional_debug_args: list[str], *, force: bool = False
+    executable_labels: set[str],
+    config_location: Path,
+    additional_debug_args: list[str],
+    *,
+    force: bool = False,
+    merge: bool = False,
 ) -> bool:
     if not executable_labels:
         return False
     new_config = get_new_tasks_config(executable_labels, additional_debug_args)
+    if merge:
+        return merge_json_config(new_config, config_location, "tasks", is_generated_task, "label")
     return save_new_json_config(new_config, config_location, force)
 
 
-def update_cc_build_file(bazel_patterns: list[str], bazel_args: list[str], config_location: Path, force: bool) -> bool:  # noqa: FBT001
+def get_refresh_target_patterns(bazel_patterns: Sequence[str], *, sharded: bool = False) -> dict[str, list[str]]:
+    """Map the name of every refresh target to the patterns it generates the compile commands for."""
+    if not sharded:
+        return {REFRESH_TARGET_NAME: list(bazel_patterns)}
+    return {
+        get_shard_target_name(shard): patterns for shard, patterns in group_patterns_into_shards(bazel_patterns).items()
+    }
+
+
+def update_cc_build_file(
+    bazel_patterns: list[str],
+    bazel_args: list[str],
+    config_location: Path,
+    force: bool,  # noqa: FBT001
+    *,
+    sharded: bool = False,
+) -> bool:
     if not confirm_config_overwrite(config_location, force):
         return False
 
     args = " ".join(bazel_args)
-    targets = dict.fromkeys(bazel_patterns, args)
-    config_location.write_text(
-        textwrap.dedent(
-            f"""
-            load("@hedron_compile_commands//:refresh_compile_commands.bzl", "refresh_compile_commands")
-
-            refresh_compile_commands(
-                name = "refresh_compile_commands",
-                targets = {targets},
-            )
-            """
-        ).strip()
-    )
+    blocks = [
+        'load("@hedron_compile_commands//:refresh_compile_commands.bzl", "refresh_compile_commands")',
+        *(
+            textwrap.dedent(
+                f"""
+                refresh_compile_commands(
+                    name = "{name}",
+                    targets = {dict.fromkeys(patterns, args)},
+                )
+                """
+            ).strip()
+            for name, patterns in get_refresh_target_patterns(bazel_patterns, sharded=sharded).items()
+        ),
+    ]
+    config_location.write_text("\n\n".join(blocks))
     logging.info("Saved new BUILD.bazel to %s", config_location)
     return True
 
 
-def get_workspace_root() -> Path:
-    return Path(run_bazel_command_output("info", "workspace").strip())
+def query_bazel_info(bazel_args: Sequence[str]) -> BazelInfo:
+    """Fetch all required `bazel info` values with a single call."""
+    return BazelInfo.from_info_output(run_bazel_command_output("info", *bazel_args, *BAZEL_INFO_KEYS))
+
+
+def get_bazel_info(bazel_args: Sequence[str], *, use_cache: bool) -> BazelInfo:
+    """Get the `bazel info` values, reusing the ones cached for the workspace if possible.
+
+    The cache is found without starting Bazel by searching the workspace root from the current directory.
+    """
+    workspace_root = find_workspace_root(Path.cwd()) if use_cache else None
+    if workspace_root is None:
+        return query_bazel_info(bazel_args)
+
+    cache = BazelInfoCache(workspace_root, workspace_root / ".vscode" / BAZEL_INFO_CACHE_FILE)
+    info = cache.get(bazel_args)
+    if info is None:
+        info = query_bazel_info(bazel_args)
+        cache.save(bazel_args, info)
+    else:
+        logging.debug("Using cached bazel info for %s", workspace_root)
+    return info
 
 
 def configure_logging(*, verbose: bool) -> None:
@@ -304,58 +544,122 @@ def setup_vscode_directory(vscode_dir: Path) -> None:
         vscode_dir.mkdir(parents=True)
 
 
-def generate_executable_labels(args: argparse.Namespace) -> set[str]:
-    return find_executable_labels(args.bazel_pattern, args.force) if args.generate_debug_config else set()
+def generate_executable_labels(args: argparse.Namespace, workspace_root: Path) -> set[str]:
+    if not args.generate_debug_config:
+        return set()
+    query_cache = (
+        QueryCache(workspace_root / ".vscode" / QUERY_CACHE_FILE, workspace_root) if args.query_cache else None
+    )
+    return find_executable_labels(
+        args.bazel_pattern, args.force, combined_query=args.combined_query, query_cache=query_cache
+    )
 
 
 def handle_tasks_json_generation(args: argparse.Namespace, executable_labels: set[str], vscode_dir: Path) -> bool:
     if not args.generate_debug_config:
         return True
 
-    if update_tasks_json(executable_labels, vscode_dir / "tasks.json", args.additional_debug_arg, force=args.force):
-        logging.info(
-            "Build targets generated in `tasks.json`. Bonus: you can use Run Build Task from the Command Palette."
-        )
-        return True
+    if not executable_labels:
+        logging.error("No executable targets found, no `tasks.json` generated.")
+        return False
 
-    logging.error("No executable targets found, no `tasks.json` generated.")
-    return False
+    # Without the generated build tasks, a launch.json would point at tasks that don't exist.
+    if not update_tasks_json(
+        executable_labels, vscode_dir / "tasks.json", args.additional_debug_arg, force=args.force, merge=args.merge
+    ):
+        return False
+
+    logging.info("Build targets generated in `tasks.json`. Bonus: you can use Run Build Task from the Command Palette.")
+    return True
 
 
-def handle_launch_json_generation(args: argparse.Namespace, executable_labels: set[str], vscode_dir: Path) -> None:
+def handle_launch_json_generation(
+    args: argparse.Namespace, executable_labels: set[str], vscode_dir: Path, bazel_info: BazelInfo
+) -> None:
     if not args.generate_debug_config:
         return
 
+    if not executable_labels:
+        logging.error("No executable targets found, no `launch.json` generated.")
+        return
+
     if update_launch_json(
         executable_labels,
         vscode_dir / "launch.json",
         force=args.force,
+        merge=args.merge,
+        bin_dir=bazel_info.bin_dir,
     ):
         logging.info("You can now run the debug target(s) in VS Code.")
-        return
-    logging.error("No executable targets found, no `launch.json` generated.")
 
 
-def handle_compile_commands_generation(
-    args: argparse.Namespace, vscode_dir: Path, recommended_actions: list[tuple[str, ...]]
-) -> None:
+def handle_compile_commands_generation(args: argparse.Namespace, vscode_dir: Path) -> bool:
     if not args.generate_compile_commands:
-        return
+        return False
 
     success = update_cc_build_file(
-        args.bazel_pattern, args.additional_compile_commands_arg, vscode_dir / "BUILD.bazel", args.force
+        args.bazel_pattern,
+        args.additional_compile_commands_arg,
+        vscode_dir / "BUILD.bazel",
+        args.force,
+        sharded=is_sharded(args),
     )
     if success:
         logging.info("Run the suggested commands in case you need to refresh the `compile_commands.json` file.")
-        recommended_actions.extend(
-            [
-                ("bazel", "build", *args.additional_compile_commands_arg, *args.bazel_pattern),
-                ("bazel", "run", "//.vscode:refresh_compile_commands"),
-            ]
-        )
+    return success
+
+
+def is_sharded(args: argparse.Namespace) -> bool:
+    return args.shard_compile_commands or bool(args.compile_commands_shard)
+
+
+def get_refresh_targets(args: argparse.Namespace) -> dict[str, list[str]]:
+    """Map the labels of the refresh targets to run to the patterns they depend on."""
+    refresh_target_patterns = get_refresh_target_patterns(args.bazel_pattern, sharded=is_sharded(args))
+    if args.compile_commands_shard:
+        selected = {get_shard_target_name(shard) for shard in args.compile_commands_shard}
+        refresh_target_patterns = {
+            name: patterns for name, patterns in refresh_target_patterns.items() if name in selected
+        }
+    return {f"//.vscode:{name}": patterns for name, patterns in refresh_target_patterns.items()}
+
 
+def plan_recommended_actions(
+    args: argparse.Namespace, executable_labels: set[str], refresh_targets: dict[str, list[str]]
+) -> list[tuple[str, ...]]:
+    """Plan the Bazel commands building the debug targets and refreshing the `compile_commands.json` file.
 
-def execute_recommended_actions(args: argparse.Namespace, recommended_actions: list[tuple[str, ...]]) -> None:
+    Targets built with the same flags share one `bazel build`, so Bazel analyzes them only once. The refresh target is
+    part of the last build and run with the same flags afterwards, so `bazel run` reuses the analysis cache and
+    starts the refresh right away instead of analyzing and building again.
+    """
+    targets_per_flags: dict[tuple[str, ...], list[str]] = {}
+    if executable_labels:
+        targets_per_flags[tuple(args.additional_debug_arg)] = sorted(executable_labels)
+    compile_commands_flags = tuple(args.additional_compile_commands_arg)
+    if refresh_targets:
+        targets = targets_per_flags.pop(compile_commands_flags, [])
+        for refresh_target, patterns in refresh_targets.items():
+            targets.extend([*patterns, refresh_target])
+        targets_per_flags[compile_commands_flags] = targets
+
+    actions = [("bazel", "build", *flags, *dict.fromkeys(targets)) for flags, targets in targets_per_flags.items()]
+    actions.extend(("bazel", "run", *compile_commands_flags, refresh_target) for refresh_target in refresh_targets)
+    return actions
+
+
+def merge_compile_commands_shards(args: argparse.Namespace, workspace_root: Path) -> None:
+    shard_directory = workspace_root / ".vscode" / COMPILE_COMMANDS_SHARDS_DIR
+    shards = group_patterns_into_shards(args.bazel_pattern)
+    merged_shards = merge_compile_commands(
+        (shard_directory / f"{shard}.json" for shard in shards), workspace_root / COMPILE_COMMANDS_FILE
+    )
+    logging.info("Merged %d of %d shard(s) into %s", merged_shards, len(shards), COMPILE_COMMANDS_FILE)
+
+
+def execute_recommended_actions(
+    args: argparse.Namespace, recommended_actions: list[tuple[str, ...]], workspace_root: Path
+) -> None:
     if not recommended_actions:
         return
 
@@ -363,10 +667,19 @@ def execute_recommended_actions(args: argparse.Namespace, recommended_actions: l
         for action in recommended_actions:
             # action format is ("bazel", "command", "arg1", "arg2", ...)
             run_bazel_command(*action[1:], verbose=args.verbose)
+            shard = get_shard_from_target(action[-1]) if action[1] == "run" else None
+            if shard is not None:
+                store_compile_commands_shard(
+                    workspace_root, workspace_root / ".vscode" / COMPILE_COMMANDS_SHARDS_DIR, shard
+                )
+        if is_sharded(args):
+            merge_compile_commands_shards(args, workspace_root)
     else:
         # If not building immediately, provide suggestions to the user
         suggested_cmds = "\n".join(" ".join(cmd) for cmd in recommended_actions)
         logging.info("Remember to re-build the target(s) with:\n\n%s", suggested_cmds)
+        if is_sharded(args):
+            logging.info("Run with `--build` to merge the shards into `%s`.", COMPILE_COMMANDS_FILE)
 
 
 def main() -> int:
@@ -376,18 +689,21 @@ def main() -> int:
     if not check_dependencies():
         return 1
 
-    vscode_dir = get_workspace_root() / ".vscode"
+    bazel_info = get_bazel_info(args.additional_debug_arg, use_cache=args.info_cache)
+    vscode_dir = bazel_info.workspace / ".vscode"
     setup_vscode_directory(vscode_dir)
 
-    executable_labels = generate_executable_labels(args)
+    executable_labels = generate_executable_labels(args, bazel_info.workspace)
 
-    recommended_actions: list[tuple[str, ...]] = []
     tasks_generated = handle_tasks_json_generation(args, executable_labels, vscode_dir)
     if tasks_generated:
-        handle_launch_json_generation(args, executable_labels, vscode_dir)
-    handle_compile_commands_generation(args, vscode_dir, recommended_actions)
+        handle_launch_json_generation(args, executable_labels, vscode_dir, bazel_info)
+    compile_commands_generated = handle_compile_commands_generation(args, vscode_dir)
 
-    execute_recommended_actions(args, recommended_actions)
+    recommended_actions = plan_recommended_actions(
+        args, executable_labels, get_refresh_targets(args) if compile_commands_generated else {}
+    )
+    execute_recommended_actions(args, recommended_actions, bazel_info.workspace)
     return 0
 
 
@@ -0,0 +1,103 @@
+"""Cache Bazel query results keyed by the patterns, the query flags and the state of the workspace."""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import logging
+import subprocess
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+    from pathlib import Path
+
+MAX_QUERY_CACHE_ENTRIES = 32
+# Files outside the queried packages that can change the result of any query.
+GLOBAL_FINGERPRINT_PATHSPECS = (
+    ":(glob)**/*.bzl",
+    "MODULE.bazel",
+    "MODULE.bazel.lock",
+    "WORKSPACE",
+    "WORKSPACE.bazel",
+    ".bazelrc",
+)
+
+
+class QueryCache:
+    """Persist the labels returned for a set of patterns as long as no relevant file in the workspace changed."""
+
+    def __init__(self, cache_file: Path, workspace_root: Path) -> None:
+        self.__cache_file = cache_file
+        self.__workspace_root = workspace_root
+
+    def get_or_query(
+        self, patterns: Sequence[str], query_flags: Sequence[str], query: Callable[[], set[str]]
+    ) -> set[str]:
+        fingerprint = get_workspace_fingerprint(self.__workspace_root, patterns)
+        if fingerprint is None:
+            return query()
+
+        key = hashlib.sha256(
+            json.dumps({"patterns": sorted(patterns), "flags": list(query_flags), "fingerprint": fingerprint}).encode()
+        ).hexdigest()
+        entries = self._load_entries()
+        if key in entries:
+            logging.debug("Using cached query result from %s", self.__cache_file)
+            return set(entries[key])
+
+        labels = query()
+        entries[key] = sorted(labels)
+        self._save_entries(dict(list(entries.items())[-MAX_QUERY_CACHE_ENTRIES:]))
+        return labels
+
+    def _load_entries(self) -> dict[str, list[str]]:
+        with contextlib.suppress(OSError, ValueError):
+            entries = json.loads(self.__cache_file.read_text())
+            if isinstance(entries, dict):
+                return entries
+        return {}
+
+    def _save_entries(self, entries: dict[str, list[str]]) -> None:
+        with contextlib.suppress(OSError):
+            self.__cache_file.write_text(json.dumps(entries))
+
+
+def get_package_pathspecs(pattern: str) -> list[str]:
+    """Return the git pathspecs of the BUILD files a target pattern depends on."""
+    package = pattern.removeprefix("//").split(":", 1)[0]
+    if package == "..." or package.endswith("/..."):
+        prefix = package.removesuffix("...")
+        return [f":(glob){prefix}**/BUILD", f":(glob){prefix}**/BUILD.bazel"]
+    prefix = f"{package}/" if package else ""
+    return [f"{prefix}BUILD", f"{prefix}BUILD.bazel"]
+
+
+def get_workspace_fingerprint(workspace_root: Path, patterns: Sequence[str]) -> str | None:
+    """Hash the git blob ids of all BUILD and .bzl files in scope, including uncommitted changes.
+
+    Return None if the patterns refer to external repositories or the workspace isn't a git repository.
+    """
+    if any(pattern.startswith("@") for pattern in patterns):
+        return None
+
+    pathspecs = [
+        *GLOBAL_FINGERPRINT_PATHSPECS,
+        *(spec for pattern in patterns for spec in get_package_pathspecs(pattern)),
+    ]
+    try:
+        staged_files = subprocess.check_output(["git", "ls-files", "-s", "--", *pathspecs], cwd=workspace_root)  # noqa: S607
+        changed_files = subprocess.check_output(
+            ["git", "ls-files", "-z", "-m", "-o", "--exclude-standard", "--", *pathspecs],  # noqa: S607
+            cwd=workspace_root,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+    fingerprint = hashlib.sha256(staged_files)
+    for changed_file in sorted(set(changed_files.decode().split("\0")) - {""}):
+        fingerprint.update(changed_file.encode())
+        with contextlib.suppress(OSError):
+            fingerprint.update((workspace_root / changed_file).read_bytes())
+    return fingerprint.hexdigest()
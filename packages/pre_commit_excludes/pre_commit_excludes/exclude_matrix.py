@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import re
+from bisect import bisect_left
+from typing import TYPE_CHECKING
+
+from pre_commit_excludes.hook_utils import INLINE_FLAGS_PATTERN, split_exclude_alternatives
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from pre_commit_excludes.hook_utils import Hook
+    from pre_commit_excludes.path_index import PathIndex
+
+_REGEX_METACHARACTERS = frozenset(".^$*+?{}[]|()\\")
+_OPTIONAL_QUANTIFIERS = frozenset("*?{")
+
+
+class ExcludeMatrix:
+    """Record for every tracked file which hooks exclude it.
+
+    The hooks excluding a file are stored as a bitset, where bit `i` is set if the `i`-th hook excludes the file.
+    """
+
+    def __init__(self, hook_ids: list[str], files: list[str], bitsets: list[int]) -> None:
+        self.__hook_ids = hook_ids
+        self.__files = files
+        self.__bitsets = bitsets
+
+    @classmethod
+    def from_hooks(cls: type[ExcludeMatrix], hooks: list[Hook], path_index: PathIndex) -> ExcludeMatrix:
+        r"""Match every hook's exclude regex once per candidate file.
+
+        If every alternative of an exclude regex is anchored at the start and begins with a literal prefix, like
+        `^(third_party/|docs/.*\\.md)$`, only the files below these prefixes in the sorted index can match, so the
+        regex is searched in these ranges only. All other regexes are searched in every file.
+        """
+        files = path_index.files
+        bitsets = [0] * len(files)
+        for index, hook in enumerate(hooks):
+            if not hook.exclude_regex:
+                continue
+            exclude = re.compile(hook.exclude_regex)
+            bit = 1 << index
+            for file_index in _candidate_file_indices(hook.exclude_regex, files):
+                if exclude.search(files[file_index]):
+                    bitsets[file_index] |= bit
+        return cls([hook.id for hook in hooks], files, bitsets)
+
+    @property
+    def hook_ids(self) -> list[str]:
+        return self.__hook_ids
+
+    @property
+    def files(self) -> list[str]:
+        return self.__files
+
+    @property
+    def bitsets(self) -> list[int]:
+        return self.__bitsets
+
+    def excluding_hooks(self, file: str) -> list[str]:
+        index = bisect_left(self.__files, file)
+        if index == len(self.__files) or self.__files[index] != file:
+            return []
+        return self._hook_ids_of(self.__bitsets[index])
+
+    def excluded_files_count(self) -> dict[str, int]:
+        counts = dict.fromkeys(self.__hook_ids, 0)
+        for bitset in self.__bitsets:
+            for hook_id in self._hook_ids_of(bitset):
+                counts[hook_id] += 1
+        return counts
+
+    def hotspots(self, limit: int) -> list[tuple[str, list[str]]]:
+        """Return the files excluded by the most hooks, skipping files that no hook excludes."""
+        ranked = sorted(
+            (index for index, bitset in enumerate(self.__bitsets) if bitset),
+            key=lambda index: self.__bitsets[index].bit_count(),
+            reverse=True,
+        )
+        return [(self.__files[index], self._hook_ids_of(self.__bitsets[index])) for index in ranked[:limit]]
+
+    def _hook_ids_of(self, bitset: int) -> list[str]:
+        return [hook_id for index, hook_id in enumerate(self.__hook_ids) if bitset >> index & 1]
+
+
+def _candidate_file_indices(exclude_regex: str, files: list[str]) -> Iterable[int]:
+    prefixes = _anchored_literal_prefixes(exclude_regex)
+    if prefixes is None:
+        return range(len(files))
+
+    ranges = []
+    for prefix in prefixes:
+        begin = bisect_left(files, prefix)
+        ranges.append((begin, bisect_left(files, f"{prefix[:-1]}{chr(ord(prefix[-1]) + 1)}", lo=begin)))
+    # Merge overlapping ranges of nested prefixes like `a/` and `a/b/`, so no file is matched twice.
+    indices: list[int] = []
+    for begin, end in sorted(ranges):
+        indices.extend(range(max(begin, indices[-1] + 1 if indices else 0), end))
+    return indices
+
+
+def _anchored_literal_prefixes(exclude_regex: str) -> list[str] | None:
+    """Return the literal prefix every path matched by an alternative starts with, or None if any has none."""
+    flags_match = INLINE_FLAGS_PATTERN.match(exclude_regex)
+    flags = flags_match.group(0).strip() if flags_match else ""
+    # Case-insensitive prefixes don't sort together and in multiline mode `^` also matches after a newline.
+    if "i" in flags or "m" in flags:
+        return None
+
+    prefixes = []
+    for alternative in split_exclude_alternatives(exclude_regex).values():
+        prefix = _literal_prefix(alternative[len(flags) :], verbose="x" in flags)
+        if not prefix:
+            return None
+        prefixes.append(prefix)
+    return prefixes
+
+
+def _literal_prefix(regex: str, *, verbose: bool) -> str:
+    """Return the literal characters following the `^` anchor of a single alternative as split from an exclude."""
+    if verbose:
+        regex = "".join(regex.split())
+    # The anchor either precedes the group enclosing all alternatives or starts the alternative itself.
+    anchored = regex.startswith("^")
+    regex = regex.removeprefix("^").removeprefix("(?:")
+    if regex.startswith("^"):
+        anchored = True
+        regex = regex[1:]
+    if not anchored:
+        return ""
+
+    prefix = ""
+    index = 0
+    while index < len(regex):
+        character = regex[index]
+        if character == "\\" and index + 1 < len(regex) and not regex[index + 1].isalnum():
+            prefix += regex[index + 1]
+            index += 2
+            continue
+        if character in _REGEX_METACHARACTERS:
+            break
+        prefix += character
+        index += 1
+
+    following = regex[index : index + 2]
+    # A quantifier may repeat the last literal zero times, just like a quantifier after the closing group.
+    if following[:1] in _OPTIONAL_QUANTIFIERS:
+        return prefix[:-1]
+    if following[:1] == ")" and following[1:] in _OPTIONAL_QUANTIFIERS:
+        return ""
+    return prefix
@@ -1,19 +1,47 @@
 from __future__ import annotations
 
+import contextlib
+import hashlib
 import itertools
+import json
+import os
+import re
 from collections import Counter
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-from ruamel.yaml import YAML
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from pre_commit_excludes.path_index import PathIndex
+
+
+INLINE_FLAGS_PATTERN = re.compile(r"^\s*\(\?[aiLmsux]+\)")
+# Bump whenever the cached hook format or the exclude processing changes to invalidate existing cache files.
+HOOK_CACHE_VERSION = 1
+MAX_HOOK_CACHE_ENTRIES = 32
+
+
+@dataclass(frozen=True)
+class ExcludeEvaluation:
+    """Result of matching a hook's exclude regex against the tracked files."""
+
+    excluded_files_count: int
+    matches_per_pattern: dict[str, int]
+
+    @property
+    def unmatched_patterns(self) -> list[str]:
+        return [pattern for pattern, count in self.matches_per_pattern.items() if count == 0]
 
 
 class Hook:
     """Represent a pre-commit hook with its excluded paths."""
 
-    def __init__(self, id: str, exclude_paths: list[Path]) -> None:
+    def __init__(self, id: str, exclude_paths: list[Path], exclude_regex: str | None = None) -> None:
         self.__id = id
         self.__exclude_paths = exclude_paths
+        self.__exclude_regex = exclude_regex
 
     @classmethod
     def from_hook_config(cls: type[Hook], root_directory: Path, hook_config: dict[str, str]) -> Hook:
@@ -21,7 +49,7 @@ class Hook:
             root_directory / Path(exclude) for exclude in extract_literal_exclude_paths(hook_config["exclude"])
         ]
 
-        return cls(hook_config["id"], excluded_paths_list)
+        return cls(hook_config["id"], excluded_paths_list, hook_config["exclude"])
 
     @property
     def id(self) -> str:
@@ -31,28 +59,82 @@ class Hook:
     def exclude_paths(self) -> list[Path]:
         return self.__exclude_paths
 
+    @property
+    def exclude_regex(self) -> str | None:
+        return self.__exclude_regex
+
     def find_duplicates(self) -> list[Path]:
         counter = Counter(self.exclude_paths)
 
         return [path for path in counter if counter[path] > 1]
 
-    def find_non_existing_paths(self) -> list[Path]:
+    def find_non_existing_paths(self, path_index: PathIndex | None = None) -> list[Path]:
+        if path_index is not None:
+            return [path for path in self.exclude_paths if not path_index.exists(path)]
         return [path for path in self.exclude_paths if not path.resolve().exists()]
 
     def has_duplicates(self) -> bool:
         return bool(self.find_duplicates())
 
-    def has_non_existing_paths(self) -> bool:
-        return bool(self.find_non_existing_paths())
+    def has_non_existing_paths(self, path_index: PathIndex | None = None) -> bool:
+        return bool(self.find_non_existing_paths(path_index))
 
-    def count_excluded_files(self) -> int:
-        existing_paths = [path for path in self.exclude_paths if path.exists()]
-        total_file_count = sum(1 for path in existing_paths if path.is_file())
-        excluded_dirs = [path for path in existing_paths if path.is_dir()]
-        total_dir_count = sum(
-            sum(1 for file in excluded_dir.rglob("*") if file.is_file()) for excluded_dir in excluded_dirs
-        )
-        return total_file_count + total_dir_count
+    def count_excluded_files(self, path_index: PathIndex | None = None) -> int:
+        if path_index is not None:
+            return sum(path_index.count_files(path) for path in self.exclude_paths)
+        return sum(count_files_on_disk(path) for path in self.exclude_paths)
+
+    def count_excluded_files_per_path(self, counter: ExcludedFilesCounter | None = None) -> dict[Path, int]:
+        if counter is None:
+            counter = ExcludedFilesCounter()
+        return {path: counter.count(path) for path in self.exclude_paths}
+
+    def evaluate_exclude_regex(self, path_index: PathIndex) -> ExcludeEvaluation:
+        """Match the full exclude regex once against every indexed file, like pre-commit does.
+
+        Only files excluded by the full regex are matched again against the single alternatives to attribute them.
+        """
+        if self.exclude_regex is None:
+            return ExcludeEvaluation(0, {})
+
+        exclude = re.compile(self.exclude_regex)
+        alternatives = {
+            pattern: re.compile(regex) for pattern, regex in split_exclude_alternatives(self.exclude_regex).items()
+        }
+        matches_per_pattern = dict.fromkeys(alternatives, 0)
+        excluded_files_count = 0
+        for file in path_index.files:
+            if not exclude.search(file):
+                continue
+            excluded_files_count += 1
+            for pattern, alternative in alternatives.items():
+                if alternative.search(file):
+                    matches_per_pattern[pattern] += 1
+
+        return ExcludeEvaluation(excluded_files_count, matches_per_pattern)
+
+
+class ExcludedFilesCounter:
+    """Count the files below excluded paths once and share the counts across hooks."""
+
+    def __init__(self, path_index: PathIndex | None = None) -> None:
+        self.__path_index = path_index
+        self.__counts: dict[Path, int] = {}
+
+    def count(self, path: Path) -> int:
+        if path not in self.__counts:
+            self.__counts[path] = (
+                count_files_on_disk(path) if self.__path_index is None else self.__path_index.count_files(path)
+            )
+        return self.__counts[path]
+
+
+def count_files_on_disk(path: Path) -> int:
+    if path.is_file():
+        return 1
+    if path.is_dir():
+        return sum(1 for file in path.rglob("*") if file.is_file())
+    return 0
 
 
 def is_regex_pattern(exclude: str) -> bool:
@@ -74,6 +156,81 @@ def extract_literal_exclude_paths(exclude_regex: str) -> list[str]:
     return [exclude for exclude in exclude_list if not is_regex_pattern(exclude)]
 
 
+def split_exclude_alternatives(exclude_regex: str) -> dict[str, str]:
+    """Split an exclude regex into its top-level alternatives.
+
+    Map each alternative as written in the config to a standalone regex that keeps the inline flags,
+    the leading `^` and anything following the enclosing group, e.g. `(?x)^(a|b/.*)$` yields `a` and `b/.*`.
+    """
+    flags_match = INLINE_FLAGS_PATTERN.match(exclude_regex)
+    flags = flags_match.group(0).strip() if flags_match else ""
+    body = exclude_regex[len(flags_match.group(0)) :] if flags_match else exclude_regex
+    if "x" in flags:
+        body = _remove_verbose_regex_comments(body)
+    body = body.strip()
+
+    anchor, suffix = "", ""
+    group = body.removeprefix("^").strip()
+    group_start = 3 if group.startswith("(?:") else 1
+    is_group = group.startswith("(?:") or (group.startswith("(") and not group.startswith("(?"))
+    group_end = _find_closing_parenthesis(group) if is_group else None
+    if group_end is not None and len(_split_top_level(group[group_end + 1 :], "|")) == 1:
+        anchor = "^" if body.startswith("^") else ""
+        body, suffix = group[group_start:group_end], group[group_end + 1 :].strip()
+
+    return {
+        alternative.strip(): f"{flags}{anchor}(?:{alternative}){suffix}"
+        for alternative in _split_top_level(body, "|")
+        if alternative.strip()
+    }
+
+
+def _find_closing_parenthesis(regex: str) -> int | None:
+    depth = 0
+    for index, character in _iter_unescaped(regex):
+        if character == "(":
+            depth += 1
+        elif character == ")":
+            depth -= 1
+            if depth == 0:
+                return index
+    return None
+
+
+def _split_top_level(regex: str, separator: str) -> list[str]:
+    parts = []
+    depth = 0
+    start = 0
+    for index, character in _iter_unescaped(regex):
+        if character == "(":
+            depth += 1
+        elif character == ")":
+            depth -= 1
+        elif character == separator and depth == 0:
+            parts.append(regex[start:index])
+            start = index + 1
+    parts.append(regex[start:])
+    return parts
+
+
+def _iter_unescaped(regex: str) -> Iterator[tuple[int, str]]:
+    """Yield the characters of a regex that are neither escaped nor part of a character class."""
+    index = 0
+    in_character_class = False
+    while index < len(regex):
+        character = regex[index]
+        if character == "\\":
+            index += 2
+            continue
+        if in_character_class:
+            in_character_class = character != "]"
+        elif character == "[":
+            in_character_class = True
+        else:
+            yield index, character
+        index += 1
+
+
 def _remove_verbose_regex_comments(exclude: str) -> str:
     return "\n".join(line.split("#", 1)[0] for line in exclude.splitlines())
 
@@ -83,14 +240,72 @@ def has_excludes(hook_config: dict[str, str]) -> bool:
 
 
 def load_config(config_file: Path) -> dict[str, Any]:
+    from ruamel.yaml import YAML  # noqa: PLC0415
+
     yaml = YAML(typ="safe")
     config = yaml.load(config_file.read_text(encoding="utf-8"))
 
     return config if isinstance(config, dict) else {}
 
 
-def load_hooks(root_directory: Path, config_file: Path) -> list[Hook]:
+def load_hooks(root_directory: Path, config_file: Path, cache_directory: Path | None = None) -> list[Hook]:
+    return list(iter_hooks(root_directory, config_file, cache_directory))
+
+
+def iter_hooks(root_directory: Path, config_file: Path, cache_directory: Path | None = None) -> Iterator[Hook]:
+    """Lazily create the hooks with excludes from a pre-commit config.
+
+    With a `cache_directory`, the parsed hooks are stored keyed by the hash of the config content,
+    so an unchanged config is neither parsed as YAML nor are its excludes processed again.
+    """
+    if cache_directory is None:
+        yield from (
+            Hook.from_hook_config(root_directory, hook) for hook in _iter_hook_configs_with_excludes(config_file)
+        )
+        return
+
+    for cached_hook in _load_cached_hooks(config_file, cache_directory):
+        yield Hook(
+            cached_hook["id"],
+            [root_directory / Path(exclude) for exclude in cached_hook["exclude_paths"]],
+            cached_hook["exclude"],
+        )
+
+
+def _iter_hook_configs_with_excludes(config_file: Path) -> Iterator[dict[str, str]]:
     config = load_config(config_file)
     hook_configs = itertools.chain(*[repo["hooks"] for repo in config["repos"]])
+    return (hook for hook in hook_configs if has_excludes(hook))
+
+
+def _load_cached_hooks(config_file: Path, cache_directory: Path) -> list[dict[str, Any]]:
+    content = config_file.read_bytes()
+    cache_key = hashlib.sha256(f"{HOOK_CACHE_VERSION}\0".encode() + content).hexdigest()
+    cache_file = cache_directory / f"{cache_key}.json"
+    with contextlib.suppress(OSError, ValueError):
+        hooks = json.loads(cache_file.read_text(encoding="utf-8"))
+        with contextlib.suppress(OSError):
+            # The modification time orders the cache files by their last use for pruning.
+            os.utime(cache_file)
+        return hooks
+
+    cached_hooks = [
+        {
+            "id": hook["id"],
+            "exclude": hook["exclude"],
+            "exclude_paths": extract_literal_exclude_paths(hook["exclude"]),
+        }
+        for hook in _iter_hook_configs_with_excludes(config_file)
+    ]
+    with contextlib.suppress(OSError):
+        cache_directory.mkdir(parents=True, exist_ok=True)
+        cache_file.write_text(json.dumps(cached_hooks), encoding="utf-8")
+        _prune_cache_directory(cache_directory)
+    return cached_hooks
+
 
-    return [Hook.from_hook_config(root_directory, hook) for hook in hook_configs if has_excludes(hook)]
+def _prune_cache_directory(cache_directory: Path) -> None:
+    """Delete all but the most recently used cache files, one of which is written per config revision."""
+    cache_files = sorted(cache_directory.glob("*.json"), key=lambda file: file.stat().st_mtime_ns, reverse=True)
+    for cache_file in cache_files[MAX_HOOK_CACHE_ENTRIES:]:
+        cache_file.unlink(missing_ok=True)
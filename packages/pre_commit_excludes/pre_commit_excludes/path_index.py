@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import subprocess
+from bisect import bisect_left
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from pathlib import Path
+
+# "0" is the character directly following "/" so every path below a directory
+# prefix sorts into the half-open range ["dir/", "dir0").
+_DIRECTORY_SEPARATOR_SUCCESSOR = chr(ord("/") + 1)
+
+
+class PathIndex:
+    """Sorted index of all files below a root directory.
+
+    The index is built once and shared by all hooks so that existence checks and
+    file counts below a directory are answered by a binary search instead of
+    walking the filesystem for every hook.
+    """
+
+    def __init__(self, root_directory: Path, files: Iterable[str]) -> None:
+        self.__root_directory = root_directory.absolute()
+        self.__files = sorted(set(files))
+
+    @classmethod
+    def from_git_ls_files(cls: type[PathIndex], root_directory: Path) -> PathIndex:
+        output = subprocess.check_output(["git", "ls-files", "-z"], cwd=root_directory)  # noqa: S607
+        return cls(root_directory, (file for file in output.decode("utf-8").split("\0") if file))
+
+    @classmethod
+    def from_directory_walk(cls: type[PathIndex], root_directory: Path) -> PathIndex:
+        return cls(
+            root_directory,
+            (file.relative_to(root_directory).as_posix() for file in root_directory.rglob("*") if file.is_file()),
+        )
+
+    @property
+    def root_directory(self) -> Path:
+        return self.__root_directory
+
+    @property
+    def files(self) -> list[str]:
+        return self.__files
+
+    def exists(self, path: Path) -> bool:
+        key = self._to_key(path)
+        if key is None:
+            return False
+        if key == "":
+            return bool(self.__files)
+        return self._is_file(key) or self._count_below(key) > 0
+
+    def count_files(self, path: Path) -> int:
+        key = self._to_key(path)
+        if key is None:
+            return 0
+        if key == "":
+            return len(self.__files)
+        return 1 if self._is_file(key) else self._count_below(key)
+
+    def _to_key(self, path: Path) -> str | None:
+        absolute_path = path.absolute()
+        try:
+            key = absolute_path.relative_to(self.__root_directory).as_posix()
+        except ValueError:
+            return None
+        return "" if key == "." else key
+
+    def _is_file(self, key: str) -> bool:
+        index = bisect_left(self.__files, key)
+        return index < len(self.__files) and self.__files[index] == key
+
+    def _count_below(self, key: str) -> int:
+        begin = bisect_left(self.__files, f"{key}/")
+        end = bisect_left(self.__files, f"{key}{_DIRECTORY_SEPARATOR_SUCCESSOR}", lo=begin)
+        return end - begin
@@ -11,13 +11,16 @@ import argparse
 import sys
 from pathlib import Path
 
-from whoowns.ownership_utils import GithubOwnerShip, check_git, find_codeowners_file
+from whoowns.ownership_utils import GithubOwnerShip, OwnerShipStatistics, check_git, find_codeowners_file
 
 
 def main() -> int:
     args = parse_arguments()
 
-    owners = get_owners(args.item, args.level)
+    statistics = OwnerShipStatistics() if args.statistics else None
+    owners = get_owners(args.item, args.level, statistics)
+    if statistics is not None:
+        print(statistics.report(), file=sys.stderr)
     if not owners:
         print(
             "No ownership assigned.\nGo to https://docs.github.com/articles/about-code-owners to learn how to assign code ownership."
@@ -42,6 +45,11 @@ def parse_arguments() -> argparse.Namespace:
         help="Level/depth to descend into the folder",
         default=0,
     )
+    parser.add_argument(
+        "--statistics",
+        action="store_true",
+        help="Print how often and how long the CODEOWNERS rules were matched to stderr",
+    )
 
     return parser.parse_args()
 
@@ -53,7 +61,7 @@ def get_subitems(item: Path, level: int) -> list[Path]:
     return sorted(item.resolve() for item in item.glob(pattern))
 
 
-def get_owners(item: Path, level: int) -> dict[str, tuple[str, ...]]:
+def get_owners(item: Path, level: int, statistics: OwnerShipStatistics | None = None) -> dict[str, tuple[str, ...]]:
     if not item.exists():
         msg = f"Item {item} does not exist. Please provide a valid path to an existing file or folder as item."
         raise FileNotFoundError(msg)
@@ -64,7 +72,7 @@ def get_owners(item: Path, level: int) -> dict[str, tuple[str, ...]]:
         return {}
 
     items = get_subitems(item, level)
-    ownership = GithubOwnerShip(repo_dir, codeowners_file)
+    ownership = GithubOwnerShip(repo_dir, codeowners_file, statistics)
     return {str(item.relative_to(repo_dir)): ownership.get_owners(item) for item in items}
 
 
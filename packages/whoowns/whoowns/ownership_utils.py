@@ -3,15 +3,21 @@
 
 from __future__ import annotations
 
+import logging
 import re
 import subprocess
 import sys
+import time
+from array import array
+from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
-    from collections.abc import Generator
+    from collections.abc import Generator, Iterator
     from pathlib import Path
 
+ESCAPABLE_CHARACTERS = frozenset(" \t#\\")
+
 
 def find_codeowners_file(repo_dir: Path) -> Path | None:
     """Try to find the codeowners file in predefined locations.
@@ -39,19 +45,120 @@ def find_codeowners_file(repo_dir: Path) -> Path | None:
 class OwnerShipEntry:
     """Represent a single entry in a CODEOWNERS file."""
 
+    __slots__ = ("line_number", "owners", "pattern")
+
     def __init__(self, pattern: str, owners: tuple[str, ...], line_number: int) -> None:
         self.pattern: str = pattern
         self.owners: tuple[str, ...] = owners
         self.line_number: int = line_number
 
 
+class OwnerShipRules:
+    """All rules of a CODEOWNERS file stored column-wise.
+
+    Rules with the same owners share one owners tuple, which keeps files with many rules compact.
+    """
+
+    def __init__(self) -> None:
+        self._patterns: list[str] = []
+        self._owner_ids = array("I")
+        self._line_numbers = array("I")
+        self._owners: list[tuple[str, ...]] = []
+        self._owner_ids_by_owners: dict[tuple[str, ...], int] = {}
+
+    @classmethod
+    def from_file(cls: type[OwnerShipRules], codeowners_file: Path) -> OwnerShipRules:
+        rules = cls()
+        for line_number, pattern, owners in iter_codeowners_rules(codeowners_file):
+            rules.append(pattern, owners, line_number)
+        return rules
+
+    @property
+    def rule_count(self) -> int:
+        return len(self._patterns)
+
+    def get_entry(self, index: int) -> OwnerShipEntry:
+        return OwnerShipEntry(self.get_pattern(index), self.get_owners(index), self._line_numbers[index])
+
+    def iter_entries_by_precedence(self) -> Iterator[OwnerShipEntry]:
+        """Yield the entries from the last to the first, since the last matching rule takes precedence."""
+        return (self.get_entry(index) for index in reversed(range(self.rule_count)))
+
+    def append(self, pattern: str, owners: tuple[str, ...], line_number: int) -> None:
+        if (owner_id := self._owner_ids_by_owners.get(owners)) is None:
+            owner_id = self._owner_ids_by_owners[owners] = len(self._owners)
+            self._owners.append(owners)
+        self._patterns.append(pattern)
+        self._owner_ids.append(owner_id)
+        self._line_numbers.append(line_number)
+
+    def get_pattern(self, index: int) -> str:
+        return self._patterns[index]
+
+    def get_owners(self, index: int) -> tuple[str, ...]:
+        return self._owners[self._owner_ids[index]]
+
+
+@dataclass
+class RuleStatistics:
+    """Match attempts, hits and time spent matching files against a single CODEOWNERS rule."""
+
+    pattern: str
+    line_number: int
+    attempts: int = 0
+    hits: int = 0
+    seconds: float = 0.0
+
+
+class OwnerShipStatistics:
+    """Collect how often and how long the CODEOWNERS rules are matched during ownership lookups."""
+
+    def __init__(self) -> None:
+        self.lookups: int = 0
+        self.regex_evaluations: int = 0
+        self.regex_compilations: int = 0
+        self._rules: dict[int, RuleStatistics] = {}
+
+    @property
+    def rules(self) -> list[RuleStatistics]:
+        return list(self._rules.values())
+
+    def record_match(self, entry: OwnerShipEntry, *, hit: bool, seconds: float) -> None:
+        if (rule := self._rules.get(entry.line_number)) is None:
+            rule = self._rules[entry.line_number] = RuleStatistics(entry.pattern, entry.line_number)
+        rule.attempts += 1
+        rule.hits += hit
+        rule.seconds += seconds
+
+    def most_expensive_rules(self, limit: int) -> list[RuleStatistics]:
+        return sorted(self._rules.values(), key=lambda rule: rule.seconds, reverse=True)[:limit]
+
+    def report(self, limit: int = 10) -> str:
+        regex_evaluations_per_lookup = self.regex_evaluations / self.lookups if self.lookups else 0.0
+        lines = [
+            f"Ownership lookups: {self.lookups}",
+            f"Regex evaluations: {self.regex_evaluations} ({regex_evaluations_per_lookup:.1f} per lookup)",
+            f"Regex compilations: {self.regex_compilations}",
+            f"Most expensive rules (top {limit}):",
+        ]
+        lines.extend(
+            f"  line {rule.line_number} {rule.pattern}: {rule.seconds * 1e3:.3f}ms, {rule.attempts} attempts, {rule.hits} hits"
+            for rule in self.most_expensive_rules(limit)
+        )
+        return "\n".join(lines)
+
+
 class GithubOwnerShip:
-    """Query GitHub CODEOWNERS rules for a repository."""
+    """Query GitHub CODEOWNERS rules for a repository.
+
+    Pass `statistics` to collect per rule counters and timings, which slows down every lookup.
+    """
 
-    def __init__(self, repo_dir: Path, codeowners_file: Path) -> None:
-        self._ownerships = parse_ownership(codeowners_file)
+    def __init__(self, repo_dir: Path, codeowners_file: Path, statistics: OwnerShipStatistics | None = None) -> None:
+        self._rules = OwnerShipRules.from_file(codeowners_file)
         self._repo_dir = repo_dir
-        self._cached_regex = CachedRegex()
+        self._statistics = statistics
+        self._cached_regex = CachedRegex(statistics)
 
     def is_owned_by(self, file: Path, codeowner: str) -> bool:
         return codeowner in self.get_owners(file)
@@ -62,8 +169,22 @@ class GithubOwnerShip:
 
     def get_owners(self, file: Path) -> tuple[str, ...]:
         file_relative = file.relative_to(self._repo_dir)
-        for ownership in self._ownerships:
-            if self.is_file_covered_by_pattern(file_relative, ownership.pattern):
+        if self._statistics is not None:
+            return self._get_owners_with_statistics(file_relative, self._statistics)
+        # Order is important, the last matching pattern in CODEOWNERS takes the most precedence.
+        for index in reversed(range(self._rules.rule_count)):
+            if self.is_file_covered_by_pattern(file_relative, self._rules.get_pattern(index)):
+                return self._rules.get_owners(index)
+
+        return ()
+
+    def _get_owners_with_statistics(self, file_relative: Path, statistics: OwnerShipStatistics) -> tuple[str, ...]:
+        statistics.lookups += 1
+        for ownership in self._rules.iter_entries_by_precedence():
+            start = time.perf_counter()
+            hit = self.is_file_covered_by_pattern(file_relative, ownership.pattern)
+            statistics.record_match(ownership, hit=hit, seconds=time.perf_counter() - start)
+            if hit:
                 return ownership.owners
 
         return ()
@@ -105,15 +226,20 @@ class GithubOwnerShip:
 class CachedRegex:
     """A wrapper around re.match to compile and cache regex patterns.
 
-    It has unlimited size.
+    It has unlimited size. Pass `statistics` to count the evaluations and compilations.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, statistics: OwnerShipStatistics | None = None) -> None:
         self._cache: dict[str, re.Pattern[str]] = {}
+        self._statistics = statistics
 
     def match(self, needle: str, haystack: str, flags: int = 0) -> re.Match | None:
         if needle not in self._cache:
             self._cache[needle] = re.compile(needle, flags)
+            if self._statistics is not None:
+                self._statistics.regex_compilations += 1
+        if self._statistics is not None:
+            self._statistics.regex_evaluations += 1
         return self._cache[needle].match(haystack)
 
 
@@ -123,21 +249,55 @@ def parse_ownership(codeowners_file: Path) -> tuple[OwnerShipEntry, ...]:
     Order is important. Last matching pattern in CODEOWNERS takes the most
     precedence.
     """
-    return tuple(reversed(tuple(get_ownership_entries(codeowners_file))))
+    return tuple(OwnerShipRules.from_file(codeowners_file).iter_entries_by_precedence())
 
 
 def get_ownership_entries(codeowners_file: Path) -> Generator[OwnerShipEntry]:
+    for line_number, pattern, owners in iter_codeowners_rules(codeowners_file):
+        yield OwnerShipEntry(pattern, owners, line_number)
+
+
+def iter_codeowners_rules(codeowners_file: Path) -> Iterator[tuple[int, str, tuple[str, ...]]]:
+    """Yield the line number, pattern and owners of every rule, reading the file line by line."""
     with codeowners_file.open() as file:
-        for line_number, line in enumerate(file.readlines(), start=1):
-            current_line = line.strip()
+        for line_number, line in enumerate(file, start=1):
+            if fields := split_codeowners_line(line):
+                yield line_number, fields[0], tuple(fields[1:])
 
-            if current_line.startswith("#"):  # comment
-                continue
 
-            match = re.findall(r"(\S+)", current_line)
-            if match:
-                yield OwnerShipEntry(match[0], tuple(match[1:]), line_number)
+def split_codeowners_line(line: str) -> list[str]:
+    r"""Split a line into its pattern and owners, dropping comments.
+
+    A `#` starts a comment at the beginning of a field. `\\ ` and `\\#` escape spaces and `#` within a pattern.
+    """
+    if "\\" not in line:
+        fields = line.split()
+        comment_start = next((index for index, field in enumerate(fields) if field.startswith("#")), None)
+        return fields[:comment_start]
+
+    fields = []
+    field: list[str] = []
+    characters = iter(line.rstrip("\r\n"))
+    for character in characters:
+        if character == "\\":
+            # A trailing backslash escapes nothing and stays part of the field.
+            escaped_character = next(characters, "")
+            field.append(escaped_character if escaped_character in ESCAPABLE_CHARACTERS else f"\\{escaped_character}")
+        elif character.isspace():
+            if field:
+                fields.append("".join(field))
+                field = []
+        elif character == "#" and not field:
+            break
+        else:
+            field.append(character)
+    if field:
+        fields.append("".join(field))
+    return fields
 
 
 def check_git(command: str, repo_dir: Path) -> str:
-    return subprocess.check_output(f"git {command}".split(), cwd=repo_dir).decode(sys.stdout.encoding)
+    start = time.perf_counter()
+    output = subprocess.check_output(f"git {command}".split(), cwd=repo_dir)
+    logging.debug("git %s took %.3fs", command, time.perf_counter() - start)
+    return output.decode(sys.stdout.encoding)
@@ -0,0 +1 @@
+"""Benchmarks of all hooks on synthetic repositories."""
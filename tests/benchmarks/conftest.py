@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import tracemalloc
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import Path
+
+    from pytest_benchmark.fixture import BenchmarkFixture
+
+# Scales the size of the synthetic repository, e.g. BENCHMARK_SCALE=10 for a monorepo sized run.
+BENCHMARK_SCALE_VARIABLE = "BENCHMARK_SCALE"
+# Peak memory of a warm call per unit of BENCHMARK_SCALE, about twice of what the benchmarks need at the moment.
+MEMORY_BUDGETS_KIB = {
+    "test__benchmark__entry_point[check-jira-reference-in-todo]": 512,
+    "test__benchmark__entry_point[check-load-statement]": 64,
+    "test__benchmark__entry_point[check-rule-has-tag]": 64,
+    "test__benchmark__entry_point[check-forbidden-tags]": 64,
+    "test__benchmark__entry_point[check-number-of-lines-count]": 512,
+    "test__benchmark__entry_point[check-ownership]": 256,
+    "test__benchmark__entry_point[check-shellscript-set-options]": 64,
+    "test__benchmark__entry_point[check-useless-exclude-paths-hooks]": 256,
+    "test__benchmark__entry_point[check-useless-exclude-paths-hooks --evaluate-regex]": 256,
+    "test__benchmark__entry_point[print-pre-commit-metrics]": 384,
+    "test__benchmark__entry_point[print-pre-commit-metrics --evaluate-regex --hotspots]": 384,
+    "test__benchmark__entry_point[sync-tool-versions]": 384,
+    "test__benchmark__entry_point[sync-vscode-config]": 128,
+    "test__benchmark__entry_point[generate-hook-docs]": 64,
+    "test__benchmark__entry_point[whoowns]": 192,
+    "test__benchmark__github_ownership_get_owners": 64,
+    "test__benchmark__find_rule_calls": 256,
+    "test__benchmark__hook_count_excluded_files": 64,
+    "test__benchmark__exclude_matrix_from_hooks": 64,
+    "test__benchmark__exclude_matrix_search_every_file": 64,
+    "test__benchmark__sync_versions": 256,
+}
+
+
+@dataclass(frozen=True)
+class SyntheticRepoSize:
+    """Size of a generated repository, scaled linearly by a single factor."""
+
+    packages: int
+    files_per_package: int
+    codeowners_rules: int
+    rules_per_build_file: int
+    markdown_lines: int
+    todo_lines: int
+    hooks: int
+
+    @classmethod
+    def from_scale(cls: type[SyntheticRepoSize], scale: int) -> SyntheticRepoSize:
+        return cls(
+            packages=20 * scale,
+            files_per_package=25,
+            codeowners_rules=50 * scale,
+            rules_per_build_file=20,
+            markdown_lines=500 * scale,
+            todo_lines=500 * scale,
+            hooks=30 * scale,
+        )
+
+    @property
+    def files(self) -> int:
+        return self.packages * self.files_per_package
+
+
+def create_synthetic_repo(root: Path, size: SyntheticRepoSize) -> None:
+    """Create a git repository with sources, BUILD files and configs of all hooks of the given size."""
+    for package in range(size.packages):
+        _create_package(root / f"pkg{package}", size)
+    _create_codeowners(root, size)
+    _create_markdown(root / "docs", size)
+    _create_pre_commit_config(root, size)
+    _create_versions_config(root, size)
+    _create_devcontainer_json(root, size)
+    _create_hooks_manifest(root, size)
+    subprocess.check_call(["git", "init", "-q"], cwd=root)  # noqa: S607
+    subprocess.check_call(["git", "add", "-A"], cwd=root)  # noqa: S607
+
+
+def _create_package(package_dir: Path, size: SyntheticRepoSize) -> None:
+    for module in range(size.files_per_package - 3):
+        source = package_dir / f"sub{module % 5}" / f"module{module}.cc"
+        source.parent.mkdir(parents=True, exist_ok=True)
+        source.write_text(f'#include "module{module}.h"\n\nint module{module}() {{ return {module}; }}\n')
+
+    rules = "\n".join(
+        f"""cc_library(
+    name = "lib{rule}",
+    srcs = glob(["sub{rule % 5}/*.cc"]),  # sources of lib{rule}
+    tags = ["manual", "team{rule % 3}"],
+    deps = [":lib{rule - 1}"] if {rule} else [],
+)
+"""
+        for rule in range(size.rules_per_build_file)
+    )
+    (package_dir / "BUILD.bazel").write_text(f'load("@rules_cc//cc:defs.bzl", "cc_library")\n\n{rules}')
+    (package_dir / "setup.sh").write_text("#!/bin/bash\nset -euxo pipefail\n\necho setup\n")
+    (package_dir / "README.md").write_text(f"# Package {package_dir.name}\n\nThe package. It builds libraries.\n")
+
+
+def _create_codeowners(root: Path, size: SyntheticRepoSize) -> None:
+    rules = ["* @org/everyone", "*.md @org/docs"]
+    rules.extend(
+        f"/pkg{rule % size.packages}/sub{rule // size.packages % 5}/ @org/team{rule}"
+        for rule in range(size.codeowners_rules)
+    )
+    codeowners = root / ".github" / "CODEOWNERS"
+    codeowners.parent.mkdir(parents=True, exist_ok=True)
+    codeowners.write_text("\n".join(rules) + "\n")
+
+
+def _create_markdown(docs_dir: Path, size: SyntheticRepoSize) -> None:
+    docs_dir.mkdir(parents=True, exist_ok=True)
+    (docs_dir / "guide.md").write_text(
+        "\n".join(f"Line {line} has a sentence. It also has a second one." for line in range(size.markdown_lines))
+    )
+    (docs_dir / "todos.cc").write_text(
+        "\n".join(
+            f"// TODO(ABC-{line}): fix this" if line % 2 else f"// TODO: fix this as well {line}"
+            for line in range(size.todo_lines)
+        )
+    )
+
+
+def _create_pre_commit_config(root: Path, size: SyntheticRepoSize) -> None:
+    hooks = []
+    for hook in range(size.hooks):
+        excluded_packages = "|".join(f"pkg{(hook + offset) % size.packages}/sub{offset % 5}/" for offset in range(5))
+        hooks.append(
+            {
+                "id": f"hook{hook}",
+                "name": f"Hook {hook}",
+                "entry": "true",
+                "language": "system",
+                "exclude": f"(?x)^({excluded_packages}|pkg{hook % size.packages}/setup\\.sh)$",
+            }
+        )
+    # JSON is a subset of YAML, which saves a YAML dependency for writing the config.
+    (root / ".pre-commit-config.yaml").write_text(json.dumps({"repos": [{"repo": "local", "hooks": hooks}]}))
+
+
+def _create_versions_config(root: Path, size: SyntheticRepoSize) -> None:
+    entries = [
+        {"path": f"pkg{package}/BUILD.bazel", "pattern": 'load\\("@rules_cc//cc:(defs)\\.bzl"'}
+        for package in range(size.packages)
+    ]
+    entries.append({"path": "pkg*/sub0/*.cc", "pattern": "return (0);"})
+    (root / ".versions.yaml").write_text(
+        json.dumps(
+            {"name": "tool-versions", "sync_versions": [{"name": "rules_cc", "version": "defs", "entries": entries}]}
+        )
+    )
+
+
+def _create_devcontainer_json(root: Path, size: SyntheticRepoSize) -> None:
+    excludes = {f"pkg{package}/sub{sub}/**": True for package in range(size.packages) for sub in range(5)}
+    settings = {"files.exclude": excludes, "search.exclude": excludes, "[python]": {"editor.tabSize": 4}}
+    devcontainer_json = root / ".devcontainer" / "devcontainer.json"
+    devcontainer_json.parent.mkdir(parents=True, exist_ok=True)
+    devcontainer_json.write_text(
+        json.dumps({"customizations": {"vscode": {"settings": settings, "extensions": ["ms-python.python"]}}})
+    )
+
+
+def _create_hooks_manifest(root: Path, size: SyntheticRepoSize) -> None:
+    hooks = [
+        {"id": f"hook{hook}", "name": f"Hook {hook}", "entry": "true", "language": "system", "description": "A hook."}
+        for hook in range(size.hooks)
+    ]
+    (root / ".pre-commit-hooks.yaml").write_text(json.dumps(hooks))
+    (root / "README.md").write_text("# Hooks\n\n<!-- hooks-doc start -->\n<!-- hooks-doc end -->\n")
+
+
+@pytest.fixture(scope="session")
+def synthetic_repo_size() -> SyntheticRepoSize:
+    return SyntheticRepoSize.from_scale(int(os.environ.get(BENCHMARK_SCALE_VARIABLE, "1")))
+
+
+@pytest.fixture(scope="session")
+def synthetic_repo(tmp_path_factory: pytest.TempPathFactory, synthetic_repo_size: SyntheticRepoSize) -> Path:
+    root = tmp_path_factory.mktemp("synthetic_repo")
+    create_synthetic_repo(root, synthetic_repo_size)
+    return root
+
+
+@pytest.fixture
+def in_synthetic_repo(synthetic_repo: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.chdir(synthetic_repo)
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    return synthetic_repo
+
+
+@pytest.fixture
+def benchmark_with_memory(benchmark: BenchmarkFixture, request: pytest.FixtureRequest) -> Callable[..., Any]:
+    """Benchmark a function and fail if its peak memory exceeds the budget of the benchmark.
+
+    The peak memory of an extra, already warm call is traced, so imports and caches filled by the first call don't
+    count. It's also checked with disabled benchmarks, as in the regular test run, and recorded in the `extra_info`.
+    """
+    budget_kib = MEMORY_BUDGETS_KIB.get(request.node.name)
+    if budget_kib is None:
+        pytest.fail(f"No memory budget for {request.node.name} in MEMORY_BUDGETS_KIB")
+    scale = int(os.environ.get(BENCHMARK_SCALE_VARIABLE, "1"))
+
+    def run(function: Callable[..., Any], *args: Any) -> Any:  # noqa: ANN401
+        result = benchmark(function, *args)
+        tracemalloc.start()
+        try:
+            function(*args)
+            peak_memory_kib = tracemalloc.get_traced_memory()[1] // 1024
+        finally:
+            tracemalloc.stop()
+        benchmark.extra_info["peak_memory_kib"] = peak_memory_kib
+        assert peak_memory_kib <= budget_kib * scale, f"Peak memory {peak_memory_kib} KiB exceeds the budget"
+        return result
+
+    return run
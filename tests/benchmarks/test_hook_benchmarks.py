@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import re
+import subprocess
+import sys
+from typing import TYPE_CHECKING, Any
+
+import pytest
+from pre_commit_excludes.exclude_matrix import ExcludeMatrix
+from pre_commit_excludes.hook_utils import load_hooks
+from pre_commit_excludes.path_index import PathIndex
+from whoowns import find_owner
+from whoowns.ownership_utils import GithubOwnerShip
+
+from dev_tools import (
+    check_forbidden_tags,
+    check_jira_reference_in_todo,
+    check_load_statement,
+    check_max_one_sentence_per_line,
+    check_number_of_lines_count,
+    check_ownership,
+    check_rule_has_tag,
+    check_shellscript_set_options,
+    check_useless_exclude_paths_hooks,
+    generate_hook_docs,
+    print_pre_commit_metrics,
+    sync_tool_versions,
+    sync_vscode_config,
+)
+from dev_tools.sync_tool_versions import _load_config, sync_versions
+from dev_tools.utils.build_file_parsing_utils import find_rule_calls
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import Path
+
+    from pytest_benchmark.fixture import BenchmarkFixture
+
+
+def tracked_files(repo: Path, suffix: str = "") -> list[str]:
+    output = subprocess.check_output(["git", "ls-files", "-z"], cwd=repo)  # noqa: S607
+    return [file for file in output.decode().split("\0") if file and file.endswith(suffix)]
+
+
+ENTRY_POINTS: dict[str, tuple[Callable[[], int], Callable[[Path], list[str]]]] = {
+    "check-jira-reference-in-todo": (check_jira_reference_in_todo.main, tracked_files),
+    "check-load-statement": (
+        check_load_statement.main,
+        lambda repo: [
+            "--rule-path=@rules_cc//cc:defs.bzl",
+            "--rule-name=cc_library",
+            *tracked_files(repo, "BUILD.bazel"),
+        ],
+    ),
+    "check-rule-has-tag": (
+        check_rule_has_tag.main,
+        lambda repo: ["--rule-name=cc_library", "--tag=manual", *tracked_files(repo, "BUILD.bazel")],
+    ),
+    "check-forbidden-tags": (
+        check_forbidden_tags.main,
+        lambda repo: ["--forbidden-tag=team0", *tracked_files(repo, "BUILD.bazel")],
+    ),
+    "check-number-of-lines-count": (check_number_of_lines_count.main, tracked_files),
+    "check-ownership": (check_ownership.main, tracked_files),
+    "check-shellscript-set-options": (
+        check_shellscript_set_options.main,
+        lambda repo: tracked_files(repo, ".sh"),
+    ),
+    "check-useless-exclude-paths-hooks": (check_useless_exclude_paths_hooks.main, lambda _: []),
+    "check-useless-exclude-paths-hooks --evaluate-regex": (
+        check_useless_exclude_paths_hooks.main,
+        lambda _: ["--evaluate-regex"],
+    ),
+    "print-pre-commit-metrics": (print_pre_commit_metrics.main, lambda _: []),
+    "print-pre-commit-metrics --evaluate-regex --hotspots": (
+        print_pre_commit_metrics.main,
+        lambda _: ["--evaluate-regex", "--hotspots=10"],
+    ),
+    "sync-tool-versions": (sync_tool_versions.main, lambda _: ["--check"]),
+    "sync-vscode-config": (
+        sync_vscode_config.main,
+        lambda repo: [
+            "--no-cache",
+            f"--devcontainer-json={repo / '.devcontainer' / 'devcontainer.json'}",
+            f"--settings-path={repo / '.vscode' / 'settings.json'}",
+            f"--extensions-path={repo / '.vscode' / 'extensions.json'}",
+        ],
+    ),
+    "generate-hook-docs": (generate_hook_docs.main, lambda _: []),
+    "whoowns": (find_owner.main, lambda _: ["--level=2", "."]),
+}
+
+
+@pytest.mark.parametrize("entry_point", ENTRY_POINTS)
+def test__benchmark__entry_point(
+    entry_point: str,
+    in_synthetic_repo: Path,
+    benchmark_with_memory: Callable[..., Any],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    main, create_arguments = ENTRY_POINTS[entry_point]
+    monkeypatch.setattr(sys, "argv", [entry_point, *create_arguments(in_synthetic_repo)])
+
+    benchmark_with_memory(main)
+
+
+def test__benchmark__check_max_one_sentence_per_line(in_synthetic_repo: Path, benchmark: BenchmarkFixture) -> None:
+    markdown_files = [in_synthetic_repo / file for file in tracked_files(in_synthetic_repo, ".md")]
+    original_contents = [file.read_text() for file in markdown_files]
+
+    def restore_markdown_files() -> None:
+        for file, content in zip(markdown_files, original_contents, strict=True):
+            file.write_text(content)
+
+    # The hook fixes the files in place, so every round starts from the original content.
+    benchmark.pedantic(
+        check_max_one_sentence_per_line.main,
+        args=([str(file) for file in markdown_files],),
+        setup=restore_markdown_files,
+        rounds=5,
+    )
+    restore_markdown_files()
+
+
+def test__benchmark__github_ownership_get_owners(in_synthetic_repo: Path, benchmark_with_memory: Callable) -> None:
+    ownership = GithubOwnerShip(in_synthetic_repo, in_synthetic_repo / ".github" / "CODEOWNERS")
+    files = [in_synthetic_repo / file for file in tracked_files(in_synthetic_repo)]
+
+    benchmark_with_memory(lambda: [ownership.get_owners(file) for file in files])
+
+
+def test__benchmark__find_rule_calls(in_synthetic_repo: Path, benchmark_with_memory: Callable) -> None:
+    contents = [(in_synthetic_repo / file).read_text() for file in tracked_files(in_synthetic_repo, "BUILD.bazel")]
+
+    benchmark_with_memory(lambda: [list(find_rule_calls(content, "cc_library")) for content in contents])
+
+
+def test__benchmark__hook_count_excluded_files(in_synthetic_repo: Path, benchmark_with_memory: Callable) -> None:
+    hooks = load_hooks(in_synthetic_repo, in_synthetic_repo / ".pre-commit-config.yaml")
+    path_index = PathIndex.from_git_ls_files(in_synthetic_repo)
+
+    benchmark_with_memory(lambda: [hook.count_excluded_files(path_index) for hook in hooks])
+
+
+@pytest.mark.benchmark(group="exclude-matrix")
+def test__benchmark__exclude_matrix_from_hooks(in_synthetic_repo: Path, benchmark_with_memory: Callable) -> None:
+    hooks = load_hooks(in_synthetic_repo, in_synthetic_repo / ".pre-commit-config.yaml")
+    path_index = PathIndex.from_git_ls_files(in_synthetic_repo)
+
+    benchmark_with_memory(lambda: ExcludeMatrix.from_hooks(hooks, path_index))
+
+
+@pytest.mark.benchmark(group="exclude-matrix")
+def test__benchmark__exclude_matrix_search_every_file(in_synthetic_repo: Path, benchmark_with_memory: Callable) -> None:
+    """Baseline for `ExcludeMatrix.from_hooks`, which searches every exclude regex in every file."""
+    hooks = load_hooks(in_synthetic_repo, in_synthetic_repo / ".pre-commit-config.yaml")
+    path_index = PathIndex.from_git_ls_files(in_synthetic_repo)
+    regexes = [(re.compile(hook.exclude_regex), 1 << index) for index, hook in enumerate(hooks) if hook.exclude_regex]
+
+    benchmark_with_memory(
+        lambda: [sum(bit for regex, bit in regexes if regex.search(file)) for file in path_index.files]
+    )
+
+
+def test__benchmark__sync_versions(in_synthetic_repo: Path, benchmark_with_memory: Callable) -> None:
+    specs = _load_config(in_synthetic_repo / ".versions.yaml")
+
+    benchmark_with_memory(lambda: sync_versions(specs, check=True))
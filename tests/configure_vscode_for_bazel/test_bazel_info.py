@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import TYPE_CHECKING
+from unittest.mock import MagicMock, patch
+
+from configure_vscode_for_bazel.bazel_info import DEFAULT_BIN_DIR, BazelInfo, BazelInfoCache, find_workspace_root
+from configure_vscode_for_bazel.configure import get_bazel_info, get_new_launch_config
+
+if TYPE_CHECKING:
+    from pyfakefs.fake_filesystem import FakeFilesystem
+
+EXECUTION_ROOT = "/home/user/.cache/bazel/_bazel_user/1234/execroot/_main"
+BAZEL_INFO_OUTPUT = f"""workspace: /home/user/repo
+execution_root: {EXECUTION_ROOT}
+bazel-bin: {EXECUTION_ROOT}/bazel-out/k8-fastbuild/bin
+"""
+
+
+def _bazel_info() -> BazelInfo:
+    return BazelInfo.from_info_output(BAZEL_INFO_OUTPUT)
+
+
+def test__bazel_info__from_info_output__parses_all_keys() -> None:
+    assert _bazel_info() == BazelInfo(
+        workspace=Path("/home/user/repo"),
+        execution_root=Path(EXECUTION_ROOT),
+        bazel_bin=Path(f"{EXECUTION_ROOT}/bazel-out/k8-fastbuild/bin"),
+    )
+
+
+def test__bazel_info__bin_dir__is_relative_to_workspace() -> None:
+    assert _bazel_info().bin_dir == "bazel-out/k8-fastbuild/bin"
+
+
+def test__bazel_info__bin_dir__outside_execution_root__falls_back_to_default() -> None:
+    bazel_info = BazelInfo(Path("/home/user/repo"), Path(EXECUTION_ROOT), Path("/remote/output/k8-fastbuild/bin"))
+
+    assert bazel_info.bin_dir == DEFAULT_BIN_DIR
+
+
+def test__get_new_launch_config__for_bin_dir__uses_it_in_program() -> None:
+    config = get_new_launch_config({"//foo/bar:test1"}, _bazel_info().bin_dir)
+    assert config["configurations"][0]["program"] == r"${workspaceFolder}/bazel-out/k8-fastbuild/bin/${binary_path}"
+
+
+def test__find_workspace_root__from_subdirectory__returns_directory_with_module_file(fs: FakeFilesystem) -> None:
+    fs.create_file("/home/user/repo/MODULE.bazel")
+    fs.create_dir("/home/user/repo/foo/bar")
+
+    assert find_workspace_root(Path("/home/user/repo/foo/bar")) == Path("/home/user/repo")
+
+
+def test__find_workspace_root__outside_workspace__returns_none(fs: FakeFilesystem) -> None:
+    fs.create_dir("/home/user/other")
+
+    assert find_workspace_root(Path("/home/user/other")) is None
+
+
+def test__bazel_info_cache__for_changed_args_or_bazelrc__misses(fs: FakeFilesystem) -> None:
+    fs.create_dir(EXECUTION_ROOT)
+    fs.create_file("/home/user/repo/.bazelrc", contents="build -c dbg")
+    cache = BazelInfoCache(Path("/home/user/repo"), Path("/home/user/repo/.vscode/cache.json"))
+
+    cache.save(["--config=dbg"], _bazel_info())
+
+    assert cache.get(["--config=dbg"]) == _bazel_info()
+    assert cache.get([]) is None
+    Path("/home/user/repo/.bazelrc").write_text("build -c opt")
+    assert cache.get(["--config=dbg"]) is None
+
+
+def test__bazel_info_cache__for_removed_execution_root__misses(fs: FakeFilesystem) -> None:
+    fs.create_dir("/home/user/repo")
+    cache = BazelInfoCache(Path("/home/user/repo"), Path("/home/user/repo/.vscode/cache.json"))
+
+    cache.save([], _bazel_info())
+
+    assert cache.get([]) is None
+
+
+def test__get_bazel_info__for_second_run__runs_bazel_info_once(fs: FakeFilesystem) -> None:
+    fs.create_dir(EXECUTION_ROOT)
+    fs.create_file("/home/user/repo/MODULE.bazel")
+    fs.cwd = "/home/user/repo"
+    with patch(
+        "configure_vscode_for_bazel.configure.run_bazel_command_output", MagicMock(return_value=BAZEL_INFO_OUTPUT)
+    ) as run_bazel_command_output:
+        assert get_bazel_info([], use_cache=True) == _bazel_info()
+        assert get_bazel_info([], use_cache=True) == _bazel_info()
+
+    run_bazel_command_output.assert_called_once_with("info", "workspace", "execution_root", "bazel-bin")
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pytest
+from configure_vscode_for_bazel.compile_commands import (
+    get_shard_from_target,
+    get_shard_name,
+    group_patterns_into_shards,
+    merge_compile_commands,
+    store_compile_commands_shard,
+)
+
+if TYPE_CHECKING:
+    from pyfakefs.fake_filesystem import FakeFilesystem
+
+
+@pytest.mark.parametrize(
+    ("pattern", "expected_shard"),
+    [
+        ("//foo/bar/...", "foo"),
+        ("//foo:main", "foo"),
+        ("//...", "root"),
+        ("//:main", "root"),
+        ("@repo//lib/...", "repo_lib"),
+        ("//foo-bar/...", "foo_bar"),
+    ],
+)
+def test__get_shard_name__for_pattern__returns_top_level_package(pattern: str, expected_shard: str) -> None:
+    assert get_shard_name(pattern) == expected_shard
+
+
+def test__group_patterns_into_shards__for_patterns__keeps_order_within_shard() -> None:
+    assert group_patterns_into_shards(["//foo/a/...", "//bar/...", "//foo:b"]) == {
+        "foo": ["//foo/a/...", "//foo:b"],
+        "bar": ["//bar/..."],
+    }
+
+
+def test__get_shard_from_target__for_refresh_targets__returns_shard_only_for_sharded_ones() -> None:
+    assert get_shard_from_target("//.vscode:refresh_compile_commands_foo") == "foo"
+    assert get_shard_from_target("//.vscode:refresh_compile_commands") is None
+
+
+def test__merge_compile_commands__for_shards__writes_single_valid_json_array(fs: FakeFilesystem) -> None:
+    fs.create_file("shards/foo.json", contents='[\n  {"file": "foo.cc"},\n  {"file": "foo.h"}\n]')
+    fs.create_file("shards/empty.json", contents="[]")
+    fs.create_file("shards/bar.json", contents='[{"file": "bar.cc"}]\n')
+
+    merged_shards = merge_compile_commands(
+        [Path("shards/foo.json"), Path("shards/empty.json"), Path("shards/missing.json"), Path("shards/bar.json")],
+        Path("compile_commands.json"),
+    )
+
+    assert merged_shards == 2
+    assert json.loads(Path("compile_commands.json").read_text()) == [
+        {"file": "foo.cc"},
+        {"file": "foo.h"},
+        {"file": "bar.cc"},
+    ]
+
+
+def test__store_compile_commands_shard__for_refresh_output__moves_it_to_shard_directory(fs: FakeFilesystem) -> None:
+    fs.create_file("/repo/compile_commands.json", contents="[]")
+
+    store_compile_commands_shard(Path("/repo"), Path("/repo/.vscode/compile_commands"), "foo")
+
+    assert not Path("/repo/compile_commands.json").exists()
+    assert Path("/repo/.vscode/compile_commands/foo.json").read_text() == "[]"
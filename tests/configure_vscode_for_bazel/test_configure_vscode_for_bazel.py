@@ -3,19 +3,30 @@
 
 from __future__ import annotations
 
+import json
+import subprocess
 from pathlib import Path
 from typing import TYPE_CHECKING
 from unittest.mock import MagicMock, patch
 
 import pytest
 from configure_vscode_for_bazel.configure import (
+    build_combined_query,
     find_executable_labels,
     get_label_from_bazel_query_line,
     get_new_launch_config,
     get_new_tasks_config,
     get_path_from_label,
+    get_refresh_targets,
+    handle_tasks_json_generation,
+    load_jsonc,
     parse_arguments,
+    plan_recommended_actions,
     save_new_json_config,
+    stream_bazel_command_output,
+    update_cc_build_file,
+    update_launch_json,
+    update_tasks_json,
 )
 
 if TYPE_CHECKING:
@@ -24,7 +35,7 @@ if TYPE_CHECKING:
 
 @patch(
     "configure_vscode_for_bazel.configure.query_bazel_for_labels",
-    MagicMock(return_value="cc_test rule //foo/bar:test1"),
+    MagicMock(return_value=iter(["cc_test rule //foo/bar:test1"])),
 )
 def test__find_executable_labels__for_single_label__returns_it() -> None:
     assert find_executable_labels(["//foo/bar:..."], force=True) == {"//foo/bar:test1"}
@@ -32,7 +43,7 @@ def test__find_executable_labels__for_single_label__returns_it() -> None:
 
 @patch(
     "configure_vscode_for_bazel.configure.query_bazel_for_labels",
-    MagicMock(return_value="cc_test rule //foo/bar:test1\ncc_binary rule //foo/bar:main\n"),
+    MagicMock(return_value=iter(["cc_test rule //foo/bar:test1", "cc_binary rule //foo/bar:main"])),
 )
 def test__find_executable_labels__for_bigger_query__returns_combined_labels() -> None:
     assert find_executable_labels(["//foo/bar/..."], force=True) == {
@@ -43,7 +54,7 @@ def test__find_executable_labels__for_bigger_query__returns_combined_labels() ->
 
 @patch(
     "configure_vscode_for_bazel.configure.query_bazel_for_labels",
-    MagicMock(side_effect=["cc_test rule //foo/bar:test1", "cc_binary rule //foo/bar:main"]),
+    MagicMock(side_effect=[iter(["cc_test rule //foo/bar:test1"]), iter(["cc_binary rule //foo/bar:main"])]),
 )
 def test__find_executable_labels__for_two_queries__returns_combined_labels() -> None:
     assert find_executable_labels(["//foo/bar:test1", "//foo/bar:main"], force=True) == {
@@ -52,6 +63,50 @@ def test__find_executable_labels__for_two_queries__returns_combined_labels() ->
     }
 
 
+def test__build_combined_query__for_two_patterns__returns_single_filtered_union() -> None:
+    assert (
+        build_combined_query(["//foo/...", "//bar:main"])
+        == "kind('^(cc_binary|cc_test) rule$', set('//foo/...' '//bar:main'))"
+    )
+
+
+def test__find_executable_labels__for_combined_query__runs_single_query() -> None:
+    with (
+        patch(
+            "configure_vscode_for_bazel.configure.stream_bazel_command_output",
+            MagicMock(return_value=iter(["cc_test rule //foo/bar:test1", "cc_binary rule //baz:main"])),
+        ) as stream_bazel_command_output,
+        patch("configure_vscode_for_bazel.configure.query_bazel_for_labels") as query_bazel_for_labels,
+    ):
+        labels = find_executable_labels(["//foo/bar/...", "//baz:main"], force=True, combined_query=True)
+
+    assert labels == {"//foo/bar:test1", "//baz:main"}
+    stream_bazel_command_output.assert_called_once_with(
+        "query", build_combined_query(["//foo/bar/...", "//baz:main"]), "--output=label_kind"
+    )
+    query_bazel_for_labels.assert_not_called()
+
+
+def test__stream_bazel_command_output__for_successful_command__yields_lines() -> None:
+    process = MagicMock(returncode=0, stdout=["cc_test rule //foo:test\n", "cc_binary rule //foo:main\n"])
+    process.__enter__.return_value = process
+    with patch("configure_vscode_for_bazel.configure.subprocess.Popen", return_value=process):
+        assert list(stream_bazel_command_output("query", "//foo/...")) == [
+            "cc_test rule //foo:test",
+            "cc_binary rule //foo:main",
+        ]
+
+
+def test__stream_bazel_command_output__for_failing_command__raises_after_output() -> None:
+    process = MagicMock(returncode=7, stdout=["cc_test rule //foo:test\n"])
+    process.__enter__.return_value = process
+    with (
+        patch("configure_vscode_for_bazel.configure.subprocess.Popen", return_value=process),
+        pytest.raises(subprocess.CalledProcessError),
+    ):
+        list(stream_bazel_command_output("query", "//foo/..."))
+
+
 def test__get_label_from_bazel_query_line__for_label_with_space__returns_label_with_space() -> None:
     assert get_label_from_bazel_query_line("cc_test rule //foo/bar:test or not") == "//foo/bar:test or not"
 
@@ -98,6 +153,107 @@ def test__save_new_json_config__when_it_exists__overwrites_it(fs: FakeFilesystem
     assert "old_content" not in tmp_file.read_text()
 
 
+def test__update_launch_json__with_merge__keeps_user_entries_and_replaces_generated_ones(fs: FakeFilesystem) -> None:
+    launch_json = Path(fs.create_file("launch.json").path)
+    user_configuration = {"name": "my python debugger", "type": "debugpy"}
+    launch_json.write_text(
+        json.dumps(
+            {
+                "version": "0.2.0",
+                "configurations": [
+                    get_new_launch_config({"//foo:old"})["configurations"][0],
+                    user_configuration,
+                    get_new_launch_config({"//foo:kept"})["configurations"][0],
+                ],
+            }
+        )
+    )
+
+    assert update_launch_json({"//foo:kept", "//foo:new"}, launch_json, merge=True)
+
+    configurations = json.loads(launch_json.read_text())["configurations"]
+    assert [configuration["name"] for configuration in configurations] == [
+        "my python debugger",
+        "(gdb) //foo:kept",
+        "(gdb) //foo:new",
+    ]
+
+
+def test__update_tasks_json__with_merge_and_unchanged_labels__does_not_write(fs: FakeFilesystem) -> None:
+    tasks_json = Path(fs.create_file("tasks.json").path)
+    user_task = {"label": "lint", "type": "shell", "command": "pre-commit"}
+    tasks_config = get_new_tasks_config({"//foo:test1"})
+    tasks_config["tasks"].insert(0, user_task)
+    tasks_json.write_text(json.dumps(tasks_config))
+    modification_time = tasks_json.stat().st_mtime_ns
+
+    assert update_tasks_json({"//foo:test1"}, tasks_json, [], merge=True)
+
+    assert tasks_json.stat().st_mtime_ns == modification_time
+    assert json.loads(tasks_json.read_text())["tasks"][0] == user_task
+
+
+def test__update_tasks_json__with_merge_and_new_debug_args__updates_generated_tasks(fs: FakeFilesystem) -> None:
+    tasks_json = Path(fs.create_file("tasks.json").path)
+    tasks_json.write_text(json.dumps(get_new_tasks_config({"//foo:test1"})))
+
+    assert update_tasks_json({"//foo:test1"}, tasks_json, ["--config=dbg"], merge=True)
+
+    assert json.loads(tasks_json.read_text())["tasks"][0]["args"] == ["build", "--config=dbg", "//foo:test1"]
+
+
+def test__update_launch_json__with_merge_into_invalid_json__keeps_file(fs: FakeFilesystem) -> None:
+    launch_json = Path(fs.create_file("launch.json").path)
+    launch_json.write_text("{ invalid }")
+
+    assert not update_launch_json({"//foo:test1"}, launch_json, merge=True)
+    assert launch_json.read_text() == "{ invalid }"
+
+
+def test__load_jsonc__with_comments_and_trailing_commas__keeps_strings() -> None:
+    text = """{
+        // line comment
+        "url": "https://example.com", /* block
+        comment */
+        "items": ["a,]", "b // c",],
+    }"""
+
+    assert load_jsonc(text) == {"url": "https://example.com", "items": ["a,]", "b // c"]}
+
+
+def test__update_tasks_json__with_merge_into_jsonc__keeps_user_entries(fs: FakeFilesystem) -> None:
+    tasks_json = Path(fs.create_file("tasks.json").path)
+    tasks_json.write_text(
+        '{\n  // See https://go.microsoft.com/fwlink/?LinkId=733558\n  "tasks": [{"label": "lint"},],\n}'
+    )
+
+    assert update_tasks_json({"//foo:test1"}, tasks_json, [], merge=True)
+
+    assert [task["label"] for task in json.loads(tasks_json.read_text())["tasks"]] == [
+        "lint",
+        "bazel: build //foo:test1",
+    ]
+
+
+def test__handle_tasks_json_generation__for_failed_merge__fails_without_no_targets_error(
+    fs: FakeFilesystem, caplog: pytest.LogCaptureFixture
+) -> None:
+    fs.create_file(".vscode/tasks.json", contents="{ invalid }")
+    args = parse_arguments(["//foo:test1", "--merge"])
+
+    assert not handle_tasks_json_generation(args, {"//foo:test1"}, Path(".vscode"))
+    assert "No executable targets found" not in caplog.text
+
+
+@patch("configure_vscode_for_bazel.configure.confirm_or_abort", MagicMock(return_value=False))
+def test__handle_tasks_json_generation__for_declined_overwrite__fails(fs: FakeFilesystem) -> None:
+    fs.create_file(".vscode/tasks.json", contents="{}")
+    args = parse_arguments(["//foo:test1"])
+
+    assert not handle_tasks_json_generation(args, {"//foo:test1"}, Path(".vscode"))
+    assert Path(".vscode/tasks.json").read_text() == "{}"
+
+
 def test__parse_arguments__for_two_patterns__returns_parsed_values() -> None:
     args = parse_arguments(["//foo/bar:test1", "//foo/bar:main"])
     assert args.bazel_pattern == ["//foo/bar:test1", "//foo/bar:main"]
@@ -108,3 +264,69 @@ def test__parse_arguments__for_two_patterns__returns_parsed_values() -> None:
 def test__parse_arguments__for_no_patterns__raises_error() -> None:
     with pytest.raises(SystemExit):
         parse_arguments([])
+
+
+def test__plan_recommended_actions__for_same_flags__builds_everything_at_once() -> None:
+    args = parse_arguments(
+        ["//foo/...", "--additional-debug-arg=--config=dbg", "--additional-compile-commands-arg=--config=dbg"]
+    )
+
+    assert plan_recommended_actions(args, {"//foo:test1", "//foo:main"}, get_refresh_targets(args)) == [
+        (
+            "bazel",
+            "build",
+            "--config=dbg",
+            "//foo:main",
+            "//foo:test1",
+            "//foo/...",
+            "//.vscode:refresh_compile_commands",
+        ),
+        ("bazel", "run", "--config=dbg", "//.vscode:refresh_compile_commands"),
+    ]
+
+
+def test__plan_recommended_actions__for_different_flags__builds_refresh_target_last() -> None:
+    args = parse_arguments(["//foo/...", "--additional-debug-arg=--config=dbg"])
+
+    assert plan_recommended_actions(args, {"//foo:test1"}, get_refresh_targets(args)) == [
+        ("bazel", "build", "--config=dbg", "//foo:test1"),
+        ("bazel", "build", "//foo/...", "//.vscode:refresh_compile_commands"),
+        ("bazel", "run", "//.vscode:refresh_compile_commands"),
+    ]
+
+
+def test__plan_recommended_actions__without_compile_commands__only_builds_debug_targets() -> None:
+    args = parse_arguments(["//foo/..."])
+
+    assert plan_recommended_actions(args, {"//foo:test1"}, {}) == [
+        ("bazel", "build", "//foo:test1"),
+    ]
+
+
+def test__plan_recommended_actions__for_sharded_compile_commands__runs_selected_shards() -> None:
+    args = parse_arguments(["//foo/...", "//bar:lib", "//bar/baz/...", "--compile-commands-shard", "bar"])
+
+    assert plan_recommended_actions(args, set(), get_refresh_targets(args)) == [
+        ("bazel", "build", "//bar:lib", "//bar/baz/...", "//.vscode:refresh_compile_commands_bar"),
+        ("bazel", "run", "//.vscode:refresh_compile_commands_bar"),
+    ]
+
+
+def test__update_cc_build_file__for_sharded_patterns__writes_one_target_per_shard(fs: FakeFilesystem) -> None:
+    build_file = Path(fs.create_file("BUILD.bazel").path)
+
+    assert update_cc_build_file(["//foo/...", "//bar:lib"], ["-c dbg"], build_file, force=True, sharded=True)
+
+    assert build_file.read_text() == (
+        'load("@hedron_compile_commands//:refresh_compile_commands.bzl", "refresh_compile_commands")\n'
+        "\n"
+        "refresh_compile_commands(\n"
+        '    name = "refresh_compile_commands_foo",\n'
+        "    targets = {'//foo/...': '-c dbg'},\n"
+        ")\n"
+        "\n"
+        "refresh_compile_commands(\n"
+        '    name = "refresh_compile_commands_bar",\n'
+        "    targets = {'//bar:lib': '-c dbg'},\n"
+        ")"
+    )
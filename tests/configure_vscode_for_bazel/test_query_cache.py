@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import subprocess
+from pathlib import Path
+from typing import TYPE_CHECKING
+from unittest.mock import MagicMock
+
+import pytest
+from configure_vscode_for_bazel.query_cache import QueryCache, get_package_pathspecs, get_workspace_fingerprint
+
+if TYPE_CHECKING:
+    from pyfakefs.fake_filesystem import FakeFilesystem
+
+
+@pytest.mark.parametrize(
+    ("pattern", "expected"),
+    [
+        ("//...", [":(glob)**/BUILD", ":(glob)**/BUILD.bazel"]),
+        ("//foo/bar/...", [":(glob)foo/bar/**/BUILD", ":(glob)foo/bar/**/BUILD.bazel"]),
+        ("//foo/bar:test1", ["foo/bar/BUILD", "foo/bar/BUILD.bazel"]),
+        ("//:main", ["BUILD", "BUILD.bazel"]),
+    ],
+)
+def test__get_package_pathspecs__for_pattern__returns_build_files_in_scope(pattern: str, expected: list[str]) -> None:
+    assert get_package_pathspecs(pattern) == expected
+
+
+def test__get_workspace_fingerprint__for_external_pattern__returns_none() -> None:
+    assert get_workspace_fingerprint(Path("workspace"), ["@repo//foo/..."]) is None
+
+
+def test__get_workspace_fingerprint__for_modified_build_file__changes(
+    fs: FakeFilesystem, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    fs.create_file("workspace/foo/BUILD.bazel", contents="cc_test(name = 'a')")
+    staged = b"100644 0123abcd 0\tfoo/BUILD.bazel\n"
+    monkeypatch.setattr(
+        "configure_vscode_for_bazel.query_cache.subprocess.check_output",
+        lambda cmd, **__: staged if "-s" in cmd else b"foo/BUILD.bazel\0",
+    )
+    before = get_workspace_fingerprint(Path("workspace"), ["//foo/..."])
+
+    Path("workspace/foo/BUILD.bazel").write_text("cc_test(name = 'b')")
+
+    assert before is not None
+    assert get_workspace_fingerprint(Path("workspace"), ["//foo/..."]) != before
+
+
+def test__get_workspace_fingerprint__outside_git_repository__returns_none(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(
+        "configure_vscode_for_bazel.query_cache.subprocess.check_output",
+        MagicMock(side_effect=subprocess.CalledProcessError(128, "git")),
+    )
+
+    assert get_workspace_fingerprint(Path("workspace"), ["//foo/..."]) is None
+
+
+def test__query_cache__for_unchanged_workspace__reuses_labels(
+    fs: FakeFilesystem, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    fs.create_dir("workspace/.vscode")
+    monkeypatch.setattr("configure_vscode_for_bazel.query_cache.get_workspace_fingerprint", lambda *_: "abc")
+    query = MagicMock(return_value={"//foo:test1"})
+    cache = QueryCache(Path("workspace/.vscode/cache.json"), Path("workspace"))
+
+    assert cache.get_or_query(["//foo/..."], [], query) == {"//foo:test1"}
+    assert cache.get_or_query(["//foo/..."], [], query) == {"//foo:test1"}
+    query.assert_called_once()
+
+
+def test__query_cache__for_changed_workspace_or_flags__queries_again(
+    fs: FakeFilesystem, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    fs.create_dir("workspace/.vscode")
+    fingerprint = MagicMock(side_effect=["abc", "def", "def"])
+    monkeypatch.setattr("configure_vscode_for_bazel.query_cache.get_workspace_fingerprint", fingerprint)
+    query = MagicMock(return_value={"//foo:test1"})
+    cache = QueryCache(Path("workspace/.vscode/cache.json"), Path("workspace"))
+
+    cache.get_or_query(["//foo/..."], [], query)
+    cache.get_or_query(["//foo/..."], [], query)
+    cache.get_or_query(["//foo/..."], ["--combined-query"], query)
+
+    assert query.call_count == 3
+
+
+def test__query_cache__without_fingerprint__always_queries(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("configure_vscode_for_bazel.query_cache.get_workspace_fingerprint", lambda *_: None)
+    query = MagicMock(return_value={"//foo:test1"})
+    cache = QueryCache(Path("workspace/.vscode/cache.json"), Path("workspace"))
+
+    cache.get_or_query(["//foo/..."], [], query)
+    cache.get_or_query(["//foo/..."], [], query)
+
+    assert query.call_count == 2
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import re
+from pathlib import Path
+
+import pytest
+from pre_commit_excludes.exclude_matrix import ExcludeMatrix, _anchored_literal_prefixes
+from pre_commit_excludes.hook_utils import Hook
+from pre_commit_excludes.path_index import PathIndex
+
+FILES = ["README.md", "third_party/a.h", "third_party/b.png", "src/c.png", "uv.lock"]
+
+
+def _hook(hook_id: str, exclude: str) -> Hook:
+    return Hook.from_hook_config(Path("Repo"), {"id": hook_id, "exclude": exclude})
+
+
+def _search_every_file(hooks: list[Hook], files: list[str]) -> list[int]:
+    regexes = [(re.compile(hook.exclude_regex), 1 << index) for index, hook in enumerate(hooks) if hook.exclude_regex]
+    return [sum(bit for regex, bit in regexes if regex.search(file)) for file in files]
+
+
+@pytest.fixture
+def hooks() -> list[Hook]:
+    return [
+        _hook("clang-format", "(?x)^(\n  third_party/  # vendored\n)"),
+        _hook("prettier", r".*\.png$"),
+        _hook("check-added-large-files", r"^third_party/|\.lock$"),
+    ]
+
+
+def test_from_hooks_should_assign_bitset_of_excluding_hooks(hooks: list[Hook]) -> None:
+    matrix = ExcludeMatrix.from_hooks(hooks, PathIndex(Path("Repo"), FILES))
+
+    assert dict(zip(matrix.files, matrix.bitsets, strict=True)) == {
+        "README.md": 0b000,
+        "src/c.png": 0b010,
+        "third_party/a.h": 0b101,
+        "third_party/b.png": 0b111,
+        "uv.lock": 0b100,
+    }
+
+
+def test_from_hooks_for_named_groups_should_match(hooks: list[Hook]) -> None:
+    hooks.append(_hook("named-group", r"(?P<hook0>b)\.png$"))
+
+    matrix = ExcludeMatrix.from_hooks(hooks, PathIndex(Path("Repo"), FILES))
+
+    assert matrix.excluding_hooks("third_party/b.png") == [
+        "clang-format",
+        "prettier",
+        "check-added-large-files",
+        "named-group",
+    ]
+    assert matrix.excluding_hooks("README.md") == []
+
+
+@pytest.mark.parametrize(
+    "exclude",
+    [
+        "(?i)foo",
+        "(?x)^bar  # comment",
+        r"^(a/|a/b/|c\.txt)$",
+        "(?x)^(\n  a/b/  # nested\n  |a/\n)",
+        r"^a/b?/",
+        r"^(a/)?b",
+        r"^a/|b",
+        r"^a/(b|c)\.txt|^c",
+        r"\.txt$",
+        "(?m)^b",
+    ],
+)
+def test_from_hooks_should_agree_with_searching_every_file(exclude: str) -> None:
+    hooks = [_hook("hook", exclude)]
+    files = ["a/Foo.txt", "a/b/c.txt", "a/c.txt", "a/x", "ab", "b.txt", "bar.txt", "baz.txt", "c.txt", "z/a/b/"]
+
+    matrix = ExcludeMatrix.from_hooks(hooks, PathIndex(Path("Repo"), files))
+
+    assert matrix.bitsets == _search_every_file(hooks, matrix.files)
+    assert any(matrix.bitsets)
+
+
+@pytest.mark.parametrize(
+    ("exclude", "expected"),
+    [
+        (r"^third_party/", ["third_party/"]),
+        ("(?x)^(\n  third_party/  # vendored\n  |docs/.*\\.md\n)$", ["third_party/", "docs/"]),
+        (r"^a\.b/c", ["a.b/c"]),
+        (r"^abc*/", ["ab"]),
+        (r"^(abc)?/", None),
+        (r"^a/|b", None),
+        (r"(?i)^a/", None),
+        (r"^\d/", None),
+    ],
+)
+def test_anchored_literal_prefixes_should_find_prefix_of_every_alternative(
+    exclude: str, expected: list[str] | None
+) -> None:
+    assert _anchored_literal_prefixes(exclude) == expected
+
+
+def test_excluding_hooks_for_unknown_file_should_be_empty(hooks: list[Hook]) -> None:
+    matrix = ExcludeMatrix.from_hooks(hooks, PathIndex(Path("Repo"), FILES))
+
+    assert matrix.excluding_hooks("unknown.txt") == []
+
+
+def test_excluded_files_count_should_count_files_per_hook(hooks: list[Hook]) -> None:
+    matrix = ExcludeMatrix.from_hooks(hooks, PathIndex(Path("Repo"), FILES))
+
+    assert matrix.excluded_files_count() == {"clang-format": 2, "prettier": 2, "check-added-large-files": 3}
+
+
+def test_hotspots_should_rank_files_by_number_of_excluding_hooks(hooks: list[Hook]) -> None:
+    matrix = ExcludeMatrix.from_hooks(hooks, PathIndex(Path("Repo"), FILES))
+
+    assert matrix.hotspots(2) == [
+        ("third_party/b.png", ["clang-format", "prettier", "check-added-large-files"]),
+        ("third_party/a.h", ["clang-format", "check-added-large-files"]),
+    ]
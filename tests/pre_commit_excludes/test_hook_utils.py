@@ -1,16 +1,21 @@
 from __future__ import annotations
 
+import os
 from pathlib import Path
 from typing import TYPE_CHECKING
 
 import pytest
 from pre_commit_excludes.hook_utils import (
+    ExcludedFilesCounter,
     Hook,
     extract_literal_exclude_paths,
     has_excludes,
     is_regex_pattern,
+    iter_hooks,
     load_hooks,
+    split_exclude_alternatives,
 )
+from pre_commit_excludes.path_index import PathIndex
 from ruamel.yaml import YAML
 
 if TYPE_CHECKING:
@@ -333,3 +338,174 @@ def test_count_excluded_files_for_empty_exclude_paths() -> None:
     hook_instance = Hook("test_id", [])
 
     assert hook_instance.count_excluded_files() == 0
+
+
+def test_count_excluded_files_with_path_index_should_not_walk_filesystem() -> None:
+    path_index = PathIndex(Path("Repo"), ["single_file.txt", "test_dir/file1.txt", "test_dir/sub/file2.txt"])
+    hook_instance = Hook(
+        "test_id",
+        [Path("Repo/single_file.txt"), Path("Repo/test_dir"), Path("Repo/non_existing_file.txt")],
+    )
+
+    assert hook_instance.count_excluded_files(path_index) == 3
+
+
+def test_find_non_existing_paths_with_path_index_should_return_unindexed_paths() -> None:
+    path_index = PathIndex(Path("Repo"), ["existing_path", "existing_dir/file.txt"])
+    hook_instance = Hook(
+        "test_id",
+        [Path("Repo/existing_path"), Path("Repo/existing_dir"), Path("Repo/non_existing_path")],
+    )
+
+    assert hook_instance.has_non_existing_paths(path_index)
+    assert hook_instance.find_non_existing_paths(path_index) == [Path("Repo/non_existing_path")]
+
+
+def test_count_excluded_files_per_path_should_report_each_path(fs: FakeFilesystem) -> None:
+    fs.create_file(Path("Repo/single_file.txt"))
+    fs.create_file(Path("Repo/test_dir/file1.txt"))
+    fs.create_file(Path("Repo/test_dir/file2.txt"))
+    hook_instance = Hook("test_id", [Path("Repo/single_file.txt"), Path("Repo/test_dir"), Path("Repo/missing")])
+
+    assert hook_instance.count_excluded_files_per_path() == {
+        Path("Repo/single_file.txt"): 1,
+        Path("Repo/test_dir"): 2,
+        Path("Repo/missing"): 0,
+    }
+
+
+def test_excluded_files_counter_should_reuse_counts_across_hooks() -> None:
+    path_index = PathIndex(Path("Repo"), ["third_party/a.h", "third_party/b.h"])
+    counter = ExcludedFilesCounter(path_index)
+    first_hook = Hook("first", [Path("Repo/third_party")])
+    second_hook = Hook("second", [Path("Repo/third_party")])
+
+    assert first_hook.count_excluded_files_per_path(counter) == {Path("Repo/third_party"): 2}
+    assert second_hook.count_excluded_files_per_path(counter) == {Path("Repo/third_party"): 2}
+
+
+def test_split_exclude_alternatives_for_verbose_group_should_keep_flags_anchor_and_suffix() -> None:
+    assert split_exclude_alternatives(
+        r"""(?x)^(
+  # keep-sorted start
+  BUILD.bazel|
+  bar/.*\.png|
+  (foo|baz)/
+  # keep-sorted end
+)$""",
+    ) == {
+        "BUILD.bazel": "(?x)^(?:\n  \n  BUILD.bazel)$",
+        r"bar/.*\.png": "(?x)^(?:\n  bar/.*\\.png)$",
+        "(foo|baz)/": "(?x)^(?:\n  (foo|baz)/\n  \n)$",
+    }
+
+
+@pytest.mark.parametrize(
+    ("exclude", "expected"),
+    [
+        (r"\.lock$", {r"\.lock$": r"(?:\.lock$)"}),
+        ("^(?:a|b)", {"a": "^(?:a)", "b": "^(?:b)"}),
+        ("^a[|]b|c", {"^a[|]b": "(?:^a[|]b)", "c": "(?:c)"}),
+        (r"^(a)|b\|c", {"^(a)": "(?:^(a))", r"b\|c": r"(?:b\|c)"}),
+    ],
+)
+def test_split_exclude_alternatives_should_only_split_top_level_alternatives(
+    exclude: str, expected: dict[str, str]
+) -> None:
+    assert split_exclude_alternatives(exclude) == expected
+
+
+def test_evaluate_exclude_regex_should_count_files_matched_by_full_regex() -> None:
+    path_index = PathIndex(Path("Repo"), ["BUILD.bazel", "bar/a.png", "bar/b.png", "bar/c.txt", "uv.lock"])
+    hook_instance = Hook.from_hook_config(
+        Path("Repo"),
+        {"id": "buildifier", "exclude": "(?x)^(\n  BUILD.bazel|\n  bar/.*\\.png|\n  missing/\n)\n"},
+    )
+
+    evaluation = hook_instance.evaluate_exclude_regex(path_index)
+
+    assert evaluation.excluded_files_count == 3
+    assert evaluation.matches_per_pattern == {"BUILD.bazel": 1, r"bar/.*\.png": 2, "missing/": 0}
+    assert evaluation.unmatched_patterns == ["missing/"]
+
+
+def test_evaluate_exclude_regex_for_hook_without_regex_should_be_empty() -> None:
+    hook_instance = Hook("test_id", [Path("Repo/file.txt")])
+
+    evaluation = hook_instance.evaluate_exclude_regex(PathIndex(Path("Repo"), ["file.txt"]))
+
+    assert evaluation.excluded_files_count == 0
+    assert evaluation.unmatched_patterns == []
+
+
+def test_load_hooks_with_cache_directory_should_skip_parsing_unchanged_config(
+    fs: FakeFilesystem, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    root_directory = Path("Test_directory/")
+    cache_directory = Path("cache")
+    fs.create_dir(root_directory)
+    config_file = root_directory / Path(".pre-commit-config.yaml")
+    _create_yaml_content(config_file, r"(?x)^(python/aws_auth|packages/thirdparty/|.*\.lock$)")
+
+    first_result = load_hooks(root_directory, config_file, cache_directory)
+    monkeypatch.setattr("pre_commit_excludes.hook_utils.load_config", lambda _: pytest.fail("config parsed again"))
+    second_result = load_hooks(root_directory, config_file, cache_directory)
+
+    assert len(list(cache_directory.iterdir())) == 1
+    for result in (first_result, second_result):
+        assert len(result) == 1
+        assert result[0].id == "check-snake-case"
+        assert result[0].exclude_regex == r"(?x)^(python/aws_auth|packages/thirdparty/|.*\.lock$)"
+        assert result[0].exclude_paths == [
+            root_directory / Path("python/aws_auth"),
+            root_directory / Path("packages/thirdparty/"),
+        ]
+
+
+def test_load_hooks_with_cache_directory_for_changed_config_should_parse_again(fs: FakeFilesystem) -> None:
+    root_directory = Path("Test_directory/")
+    cache_directory = Path("cache")
+    fs.create_dir(root_directory)
+    config_file = root_directory / Path(".pre-commit-config.yaml")
+    _create_yaml_content(config_file, "foo")
+    load_hooks(root_directory, config_file, cache_directory)
+    _create_yaml_content(config_file, "bar")
+
+    result = load_hooks(root_directory, config_file, cache_directory)
+
+    assert result[0].exclude_paths == [root_directory / Path("bar")]
+    assert len(list(cache_directory.iterdir())) == 2
+
+
+def test_load_hooks_with_cache_directory_should_keep_only_most_recently_used_entries(
+    fs: FakeFilesystem, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr("pre_commit_excludes.hook_utils.MAX_HOOK_CACHE_ENTRIES", 2)
+    root_directory = Path("Test_directory/")
+    cache_directory = Path("cache")
+    fs.create_dir(root_directory)
+    config_file = root_directory / Path(".pre-commit-config.yaml")
+    for index, exclude in enumerate(["foo", "bar", "foo", "baz"]):
+        _create_yaml_content(config_file, exclude)
+        load_hooks(root_directory, config_file, cache_directory)
+        for cache_file in cache_directory.iterdir():
+            # Order the cache files by the run they were last used in, independent of the timer resolution
+            if cache_file.stat().st_mtime_ns > index:
+                os.utime(cache_file, ns=(index + 1, index + 1))
+
+    monkeypatch.setattr("pre_commit_excludes.hook_utils.load_config", lambda _: pytest.fail("config parsed again"))
+    _create_yaml_content(config_file, "foo")
+    assert load_hooks(root_directory, config_file, cache_directory)[0].exclude_paths == [root_directory / "foo"]
+    assert len(list(cache_directory.iterdir())) == 2
+
+
+def test_iter_hooks_should_create_hooks_lazily(fs: FakeFilesystem) -> None:
+    root_directory = Path("Test_directory/")
+    fs.create_dir(root_directory)
+    config_file = root_directory / Path(".pre-commit-config.yaml")
+    _create_yaml_content(config_file, "foo")
+
+    hooks = iter_hooks(root_directory, config_file)
+
+    assert next(hooks).id == "check-snake-case"
+    assert next(hooks, None) is None
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pytest
+from pre_commit_excludes.path_index import PathIndex
+
+if TYPE_CHECKING:
+    from pyfakefs.fake_filesystem import FakeFilesystem
+
+
+@pytest.fixture
+def path_index() -> PathIndex:
+    return PathIndex(
+        Path("Repo"),
+        ["a.txt", "a/b.txt", "a/c/d.txt", "a0/e.txt", "ab/f.txt", "third_party/lib/g.h"],
+    )
+
+
+@pytest.mark.parametrize("path", ["Repo/a.txt", "Repo/a", "Repo/a/c", "Repo/a/c/d.txt", "Repo/third_party"])
+def test_exists_for_indexed_file_or_directory_should_be_true(path_index: PathIndex, path: str) -> None:
+    assert path_index.exists(Path(path))
+
+
+@pytest.mark.parametrize("path", ["Repo/b", "Repo/a/c/d", "Repo/third", "Other/a.txt"])
+def test_exists_for_unknown_path_should_be_false(path_index: PathIndex, path: str) -> None:
+    assert not path_index.exists(Path(path))
+
+
+@pytest.mark.parametrize(
+    ("path", "expected"),
+    [
+        ("Repo/a.txt", 1),
+        ("Repo/a", 2),
+        ("Repo/a/", 2),
+        ("Repo/a/c", 1),
+        ("Repo/ab", 1),
+        ("Repo/b", 0),
+        ("Repo", 6),
+        ("Other", 0),
+    ],
+)
+def test_count_files_should_count_all_files_below_prefix(path_index: PathIndex, path: str, expected: int) -> None:
+    assert path_index.count_files(Path(path)) == expected
+
+
+def test_from_directory_walk_should_index_all_files(fs: FakeFilesystem) -> None:
+    fs.create_file(Path("Repo/file.txt"))
+    fs.create_file(Path("Repo/dir/sub/file.txt"))
+    fs.create_dir(Path("Repo/empty_dir"))
+
+    path_index = PathIndex.from_directory_walk(Path("Repo"))
+
+    assert path_index.count_files(Path("Repo")) == 2
+    assert path_index.count_files(Path("Repo/dir")) == 1
+    assert not path_index.exists(Path("Repo/empty_dir"))
+
+
+def test_from_git_ls_files_should_index_tracked_files(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(
+        "pre_commit_excludes.path_index.subprocess.check_output",
+        lambda *_, **__: b"README.md\0third_party/lib/a.h\0third_party/lib/b.h\0",
+    )
+
+    path_index = PathIndex.from_git_ls_files(Path("Repo"))
+
+    assert path_index.exists(Path("Repo/README.md"))
+    assert path_index.count_files(Path("Repo/third_party")) == 2
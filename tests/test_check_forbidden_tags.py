@@ -1,16 +1,15 @@
 from __future__ import annotations
 
-import re
 from pathlib import Path
 from typing import TYPE_CHECKING
 
-from dev_tools.check_forbidden_tags import find_files_with_forbidden_tags, main
+from dev_tools.check_forbidden_tags import main
 
 if TYPE_CHECKING:
     from pyfakefs.fake_filesystem import FakeFilesystem
 
 
-def test_find_files_with_forbidden_tags_for_forbidden_tag_should_return_file(fs: FakeFilesystem) -> None:
+def test_main_for_forbidden_tag_should_return_one(fs: FakeFilesystem) -> None:
     fs.create_file(
         Path("repo/BUILD.bazel"),
         contents="""
@@ -21,10 +20,10 @@ py_venv(
 """,
     )
 
-    assert find_files_with_forbidden_tags([Path("repo/BUILD.bazel")], "no-remote", None) == [Path("repo/BUILD.bazel")]
+    assert main(["--forbidden-tag=no-remote", "repo/BUILD.bazel"]) == 1
 
 
-def test_find_files_with_forbidden_tags_for_allowed_rule_kind_should_return_empty_list(fs: FakeFilesystem) -> None:
+def test_main_for_allowed_rule_kind_should_return_zero(fs: FakeFilesystem) -> None:
     fs.create_file(
         Path("repo/BUILD.bazel"),
         contents="""
@@ -35,7 +34,7 @@ pkg_tar(
 """,
     )
 
-    assert find_files_with_forbidden_tags([Path("repo/BUILD.bazel")], "no-remote", re.compile("pkg_tar")) == []
+    assert main(["--forbidden-tag=no-remote", "--allow-in-rule-kind=pkg_tar", "repo/BUILD.bazel"]) == 0
 
 
 def test_main_for_violation_should_return_one(fs: FakeFilesystem, capsys) -> None:
@@ -5,14 +5,16 @@ from __future__ import annotations
 
 from pathlib import Path
 from typing import TYPE_CHECKING
+from unittest.mock import patch
 
 import pytest
 
 from dev_tools.check_jira_reference_in_todo import (
-    find_files_with_incorrect_jira_reference_in_todo,
-    has_any_file_incorrect_jira_reference_in_todo,
+    find_incorrect_todos,
     line_has_incorrect_todo,
+    main,
 )
+from dev_tools.utils.git_diff_utils import LineRange
 
 if TYPE_CHECKING:
     from pyfakefs.fake_filesystem import FakeFilesystem
@@ -48,33 +50,29 @@ def test_line_has_incorrect_todo_for_non_jira_todos(content: str) -> None:
 
 
 @pytest.mark.parametrize("content", ["TODO(ABC-1234):", "# TODO(ABC-1234):", "TODO(ABC-1234): remove code"])
-def test_find_files_with_correct_jira_reference_in_todo(fs: FakeFilesystem, content: str) -> None:
-    fs.create_file(Path("Repo/file.py"), contents=content)
-
-    assert find_files_with_incorrect_jira_reference_in_todo([Path("Repo/file.py")]) == []
+def test_find_incorrect_todos_for_correct_jira_reference_in_todo(content: str) -> None:
+    assert find_incorrect_todos(Path("Repo/file.py"), content) == []
 
 
 @pytest.mark.parametrize(
     "content",
     ["TODO(ABC-1234)", "TODO ABC-1234:", "TODO (ABC-1234):", "ToDo ABC:", "Todo(ABC-1234):", "To-Do(ABC-1234):"],
 )
-def test_find_files_with_incorrect_jira_reference_in_todo(fs: FakeFilesystem, content: str) -> None:
-    fs.create_file(Path("Repo/file.py"), contents=content)
-
-    assert find_files_with_incorrect_jira_reference_in_todo([Path("Repo/file.py")]) == [
+def test_find_incorrect_todos_for_incorrect_jira_reference_in_todo(content: str) -> None:
+    assert find_incorrect_todos(Path("Repo/file.py"), content) == [
         {"file_path": Path("Repo/file.py"), "line_number": 1, "line_content": content},
     ]
 
 
 @pytest.mark.parametrize("content", ["TODO(ABC-1234):", "# TODO(ABC-1234):", "TODO(ABC-1234): remove code"])
-def test_has_any_file_incorrect_jira_reference_in_todo_for_no_incorrect_todo(
+def test_main_for_no_incorrect_todo_should_return_zero(
     fs: FakeFilesystem,
     content: str,
     capsys: pytest.CaptureFixture,
 ) -> None:
     fs.create_file(Path("Repo/file.py"), contents=content)
 
-    assert not has_any_file_incorrect_jira_reference_in_todo([Path("Repo/file.py")])
+    assert main(["Repo/file.py"]) == 0
     assert not capsys.readouterr().out
 
 
@@ -82,16 +80,32 @@ def test_has_any_file_incorrect_jira_reference_in_todo_for_no_incorrect_todo(
     "content",
     ["TODO(ABC-1234)", "TODO ABC-1234:", "TODO (ABC-1234):", "ToDo ABC:", "Todo(ABC-1234):", "To-Do(ABC-1234):"],
 )
-def test_has_any_file_incorrect_jira_reference_in_todo_for_incorrect_todo(
+def test_main_for_incorrect_todo_should_return_one(
     fs: FakeFilesystem,
     content: str,
     capsys: pytest.CaptureFixture,
 ) -> None:
     fs.create_file(Path("Repo/file.py"), contents=content)
 
-    assert has_any_file_incorrect_jira_reference_in_todo([Path("Repo/file.py")])
+    assert main(["Repo/file.py"]) == 1
     output = capsys.readouterr().out
     assert "JIRA-Ticket" in output
     assert "TODO format" in output
     assert "TODO(ABC-1234):" in output
     assert content in output
+
+
+def test_main_with_diff_base_checks_only_changed_lines(fs: FakeFilesystem, capsys: pytest.CaptureFixture) -> None:
+    fs.create_file(Path("Repo/file.py"), contents="# TODO: old\n# TODO: new\n")
+    fs.create_file(Path("Repo/unchanged.py"), contents="# TODO: old\n")
+
+    with patch(
+        "dev_tools.utils.git_diff_utils.get_changed_lines",
+        return_value={Path("Repo/file.py"): [LineRange(2, 3)]},
+    ) as get_changed_lines_mock:
+        assert main(["--diff-base=origin/main", "Repo/file.py", "Repo/unchanged.py"]) == 1
+
+    get_changed_lines_mock.assert_called_with("origin/main")
+    output = capsys.readouterr().out
+    assert "Repo/file.py:2: error: '# TODO: new'" in output
+    assert "old" not in output
@@ -2,10 +2,12 @@ from __future__ import annotations
 
 from pathlib import Path
 from typing import TYPE_CHECKING
+from unittest.mock import patch
 
 import pytest
 
-from dev_tools.check_max_one_sentence_per_line import main
+from dev_tools.check_max_one_sentence_per_line import fix_content, main
+from dev_tools.utils.git_diff_utils import LineRange
 
 if TYPE_CHECKING:
     from pyfakefs.fake_filesystem import FakeFilesystem
@@ -134,3 +136,46 @@ def test_multiple_files_one_failing(fs: FakeFilesystem) -> None:
     assert main([str(file_a), str(file_b)]) == 1
     assert file_a.read_text() == "This.\nSplits."
     assert file_b.read_text() == "One sentence."
+
+
+@pytest.mark.parametrize(
+    ("input", "line_ranges", "expected_output"),
+    [
+        pytest.param(
+            "Old. Unchanged.\nNew. Changed.\nOld. Unchanged.",
+            [LineRange(2, 3)],
+            "Old. Unchanged.\nNew.\nChanged.\nOld. Unchanged.",
+            id="fixes_only_changed_lines",
+        ),
+        pytest.param(
+            "```\nCode. Block.\n```\nNew. Changed.",
+            [LineRange(2, 3), LineRange(4, 5)],
+            "```\nCode. Block.\n```\nNew.\nChanged.",
+            id="does_not_split_changed_lines_in_code_blocks",
+        ),
+        pytest.param(
+            "Old. Unchanged.\nNew. Changed.",
+            [],
+            "Old. Unchanged.\nNew. Changed.",
+            id="does_not_fix_without_changed_lines",
+        ),
+        pytest.param(
+            "Old.\x0c Unchanged.\nNew. Changed.\n",
+            [LineRange(2, 3)],
+            "Old.\x0c Unchanged.\nNew.\nChanged.\n",
+            id="counts_only_newlines_as_line_breaks",
+        ),
+    ],
+)
+def test_fix_content_with_line_ranges(input: str, line_ranges: list[LineRange], expected_output: str) -> None:
+    assert fix_content(input, line_ranges) == expected_output
+
+
+def test_main_with_diff_base_fixes_only_changed_lines(fs: FakeFilesystem) -> None:
+    file = Path("Repo/file.md")
+    fs.create_file(file, contents="Old. Unchanged.\nNew. Changed.\n")
+
+    with patch("dev_tools.utils.git_diff_utils.get_changed_lines", return_value={file: [LineRange(2, 3)]}):
+        assert main(["--diff-base=HEAD", str(file)]) == 1
+
+    assert file.read_text() == "Old. Unchanged.\nNew.\nChanged.\n"
@@ -4,10 +4,14 @@
 from __future__ import annotations
 
 from typing import TYPE_CHECKING
+from unittest.mock import patch
 
 from dev_tools.check_number_of_lines_count import main
 
 if TYPE_CHECKING:
+    from pathlib import Path
+
+    import pytest
     from pyfakefs.fake_filesystem import FakeFilesystem
 
 LONG_FILE_CONTENTS = "foo\n" * 60
@@ -26,3 +30,17 @@ def test_return_1_as_soon_as_one_file_is_too_long(fs: FakeFilesystem) -> None:
     fs.create_file(file_a, contents=SHORT_FILE_CONTENTS)
     fs.create_file(file_b, contents=LONG_FILE_CONTENTS)
     assert main([file_a, file_b]) == 1
+
+
+def test_main_with_cache_replays_result_of_unchanged_file(tmp_path: Path, capsys: pytest.CaptureFixture) -> None:
+    file = tmp_path / "foo.py"
+    file.write_text(LONG_FILE_CONTENTS)
+    argv = ["--cache", f"--cache-file={tmp_path / 'results.sqlite'}", str(file)]
+    assert main(argv) == 1
+    first_output = capsys.readouterr().out
+
+    with patch("dev_tools.check_number_of_lines_count.check_file_content") as check_file_content_mock:
+        assert main(argv) == 1
+
+    check_file_content_mock.assert_not_called()
+    assert capsys.readouterr().out == first_output
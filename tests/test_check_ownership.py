@@ -224,6 +224,15 @@ def test__perform_all_codeowners_checks__for_valid_file__should_pass(
     assert perform_all_codeowners_checks(repo_dir) == ReturnCode.SUCCESS
 
 
+def test__perform_all_codeowners_checks__for_trailing_backslash__should_pass(
+    fs: FakeFilesystem, repo_dir: Path, codeowners: Path
+) -> None:
+    fs.create_file(codeowners, contents="/src/ @myorg/devs\\\n")
+    fs.create_file(repo_dir / "src/test_a.c")
+
+    assert perform_all_codeowners_checks(repo_dir) == ReturnCode.SUCCESS
+
+
 def test__perform_all_codeowners_checks__for_single_problem__should_fail_with_error_folder_doenst_exist(
     fs: FakeFilesystem, repo_dir: Path, codeowners: Path
 ) -> None:
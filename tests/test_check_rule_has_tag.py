@@ -3,13 +3,13 @@ from __future__ import annotations
 from pathlib import Path
 from typing import TYPE_CHECKING
 
-from dev_tools.check_rule_has_tag import find_invalid_files
+from dev_tools.check_rule_has_tag import main
 
 if TYPE_CHECKING:
     from pyfakefs.fake_filesystem import FakeFilesystem
 
 
-def test_find_invalid_files_for_rule_without_tag_should_return_file(fs: FakeFilesystem) -> None:
+def test_main_for_rule_without_tag_should_return_one(fs: FakeFilesystem) -> None:
     fs.create_file(
         Path("repo/BUILD.bazel"),
         contents="""
@@ -23,10 +23,10 @@ py_venv(
 """,
     )
 
-    assert find_invalid_files([Path("repo/BUILD.bazel")], "py_venv", "manual") == [Path("repo/BUILD.bazel")]
+    assert main(["--rule-name=py_venv", "--tag=manual", "repo/BUILD.bazel"]) == 1
 
 
-def test_find_invalid_files_for_file_without_target_rule_should_return_empty_list(fs: FakeFilesystem) -> None:
+def test_main_for_file_without_target_rule_should_return_zero(fs: FakeFilesystem) -> None:
     fs.create_file(
         Path("repo/BUILD.bazel"),
         contents="""
@@ -37,10 +37,10 @@ pkg_tar(
 """,
     )
 
-    assert find_invalid_files([Path("repo/BUILD.bazel")], "py_venv", "manual") == []
+    assert main(["--rule-name=py_venv", "--tag=manual", "repo/BUILD.bazel"]) == 0
 
 
-def test_find_invalid_files_for_rule_with_nested_parentheses_should_return_empty_list(fs: FakeFilesystem) -> None:
+def test_main_for_rule_with_nested_parentheses_should_return_zero(fs: FakeFilesystem) -> None:
     fs.create_file(
         Path("repo/BUILD.bazel"),
         contents="""
@@ -53,4 +53,4 @@ py_venv(
 """,
     )
 
-    assert find_invalid_files([Path("repo/BUILD.bazel")], "py_venv", "manual") == []
+    assert main(["--rule-name=py_venv", "--tag=manual", "repo/BUILD.bazel"]) == 0
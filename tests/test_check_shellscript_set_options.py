@@ -11,6 +11,7 @@ import pyfakefs.helpers
 from dev_tools.check_shellscript_set_options import main
 
 if TYPE_CHECKING:
+    import pytest
     from pyfakefs.fake_filesystem import FakeFilesystem
 
 
@@ -163,7 +164,7 @@ date
     assert main([str(valid_file), str(invalid_file)]) == 1
 
 
-def test_fail_for_file_without_shebang(fs: FakeFilesystem) -> None:
+def test_fail_for_file_without_shebang(fs: FakeFilesystem, capsys: pytest.CaptureFixture) -> None:
     file = "sh_file.sh"
     fs.create_file(
         file,
@@ -174,6 +175,9 @@ date
     )
 
     assert main([str(file)]) == 1
+    output = capsys.readouterr()
+    assert "Unknown shell in sh_file.sh" in output.err
+    assert not output.out
 
 
 def test_fail_for_invalid_file(fs: FakeFilesystem) -> None:
@@ -9,8 +9,12 @@ from typing import TYPE_CHECKING
 from pre_commit_excludes.hook_utils import (
     Hook,
 )
+from pre_commit_excludes.path_index import PathIndex
 
-from dev_tools.check_useless_exclude_paths_hooks import have_non_existent_paths_or_duplicates
+from dev_tools.check_useless_exclude_paths_hooks import (
+    have_non_existent_paths_or_duplicates,
+    have_unmatched_patterns_or_duplicates,
+)
 
 if TYPE_CHECKING:
     import pytest
@@ -61,3 +65,30 @@ def test_have_non_existent_paths_or_duplicates_for_duplicate_paths(
     assert "duplicates" in output
     assert "existing_path1" in output
     assert "existing_path2" in output
+
+
+def test_have_unmatched_patterns_or_duplicates_for_regex_matching_nothing(
+    capsys: pytest.CaptureFixture,
+) -> None:
+    path_index = PathIndex(Path("Repo"), ["existing_path", "third_party/lib.h"])
+    hook_instance = Hook.from_hook_config(
+        Path("Repo"), {"id": "test_id", "exclude": r"(?x)^(existing_path|third_party/.*\.h|.*\.png$)"}
+    )
+
+    assert have_unmatched_patterns_or_duplicates([hook_instance], path_index)
+    output = capsys.readouterr().out
+    assert "test_id" in output
+    assert r".*\.png$" in output
+    assert "existing_path" not in output
+
+
+def test_have_unmatched_patterns_or_duplicates_for_matching_regex_should_pass(
+    capsys: pytest.CaptureFixture,
+) -> None:
+    path_index = PathIndex(Path("Repo"), ["existing_path", "third_party/lib.h"])
+    hook_instance = Hook.from_hook_config(
+        Path("Repo"), {"id": "test_id", "exclude": r"(?x)^(existing_path|third_party/.*\.h)"}
+    )
+
+    assert not have_unmatched_patterns_or_duplicates([hook_instance], path_index)
+    assert capsys.readouterr().out == ""
@@ -0,0 +1,80 @@
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).parent.parent
+# Dependencies which are slow to import and therefore only imported by the code paths that need them
+LAZY_IMPORTED_MODULES = ("ruamel.yaml", "pre_commit.clientlib", "pre_commit.constants", "regex", "pyjson5")
+# Import time of every entry point in microseconds, about twice the fastest of several local runs to avoid flaky
+# failures on slow CI runners
+STARTUP_BUDGETS_US = {
+    "dev_tools.check_jira_reference_in_todo": 160_000,
+    "dev_tools.check_load_statement": 120_000,
+    "dev_tools.check_rule_has_tag": 140_000,
+    "dev_tools.check_forbidden_tags": 160_000,
+    "dev_tools.check_max_one_sentence_per_line": 80_000,
+    "dev_tools.check_number_of_lines_count": 120_000,
+    "dev_tools.check_ownership": 90_000,
+    "dev_tools.check_shellscript_set_options": 120_000,
+    "dev_tools.check_useless_exclude_paths_hooks": 130_000,
+    "dev_tools.run_hooks": 150_000,
+    "dev_tools.generate_hook_docs": 50_000,
+    "dev_tools.print_pre_commit_metrics": 130_000,
+    "dev_tools.sync_vscode_config": 150_000,
+    "dev_tools.sync_tool_versions": 80_000,
+    "configure_vscode_for_bazel.configure": 100_000,
+    "whoowns.find_owner": 80_000,
+}
+
+
+def get_entry_point_modules() -> list[str]:
+    modules = []
+    for pyproject in [REPO_ROOT / "pyproject.toml", *sorted(REPO_ROOT.glob("packages/*/pyproject.toml"))]:
+        scripts = re.search(r"^\[project\.scripts\]\n(.*?)(?:^\[|\Z)", pyproject.read_text(), re.MULTILINE | re.DOTALL)
+        if scripts:
+            modules.extend(re.findall(r'^[\w-]+\s*=\s*"([\w.]+):\w+"', scripts.group(1), re.MULTILINE))
+    return modules
+
+
+def measure_import(module: str) -> dict[str, int]:
+    """Return the cumulative import time in microseconds of every module imported by importing the given one."""
+    output = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stderr
+    return {
+        name.strip(): int(cumulative)
+        for cumulative, name in re.findall(r"^import time:\s+\d+ \|\s+(\d+) \|(.*)$", output, re.MULTILINE)
+    }
+
+
+def test__get_entry_point_modules__finds_scripts_of_all_packages() -> None:
+    modules = get_entry_point_modules()
+
+    assert "dev_tools.check_ownership" in modules
+    assert "whoowns.find_owner" in modules
+    assert "configure_vscode_for_bazel.configure" in modules
+
+
+def test__startup_budgets__cover_every_entry_point() -> None:
+    assert set(STARTUP_BUDGETS_US) == set(get_entry_point_modules())
+
+
+@pytest.mark.parametrize("module", get_entry_point_modules())
+def test__entry_point__imports_no_heavy_dependency(module: str) -> None:
+    imported_modules = measure_import(module)
+
+    heavy_modules = [
+        name for name in imported_modules if any(name.startswith(prefix) for prefix in LAZY_IMPORTED_MODULES)
+    ]
+    assert heavy_modules == []
+
+
+@pytest.mark.parametrize("module", get_entry_point_modules())
+def test__entry_point__starts_within_budget(module: str) -> None:
+    assert measure_import(module)[module] < STARTUP_BUDGETS_US[module]
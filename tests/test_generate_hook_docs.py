@@ -3,6 +3,7 @@
 
 from __future__ import annotations
 
+import os
 from pathlib import Path
 from typing import TYPE_CHECKING
 
@@ -64,3 +65,22 @@ def test_update_hooks_documentation_in_readme__no_markers__should_not_update_rea
     update_hooks_documentation_in_readme(readme, "### `my-hook`\n\nMy hook description")
 
     assert readme.read_text() == content
+
+
+def test_update_hooks_documentation_in_readme__up_to_date_docs__should_not_write_readme(fs: FakeFilesystem) -> None:
+    readme = Path("README.md")
+    fs.create_file(readme, contents="# Main title\n\n<!-- hooks-doc start -->\n\nMy docs\n<!-- hooks-doc end -->\n")
+    os.utime(readme, ns=(0, 0))
+
+    assert not update_hooks_documentation_in_readme(readme, "My docs\n")
+    assert readme.stat().st_mtime_ns == 0
+
+
+def test_update_hooks_documentation_in_readme__changed_docs__should_return_true(fs: FakeFilesystem) -> None:
+    readme = Path("README.md")
+    fs.create_file(
+        readme, contents="<!-- hooks-doc start -->\n\nOld docs\n<!-- hooks-doc end -->\n<!-- hooks-doc end -->"
+    )
+
+    assert update_hooks_documentation_in_readme(readme, "New docs\n")
+    assert readme.read_text() == "<!-- hooks-doc start -->\n\nNew docs\n<!-- hooks-doc end -->\n<!-- hooks-doc end -->"
@@ -5,10 +5,17 @@ from pathlib import Path
 from typing import TYPE_CHECKING
 
 from pre_commit_excludes.hook_utils import Hook
+from pre_commit_excludes.path_index import PathIndex
 
-from dev_tools.print_pre_commit_metrics import create_excluded_files_report, write_pre_commit_metrics
+from dev_tools.print_pre_commit_metrics import (
+    create_exclude_hotspots_report,
+    create_excluded_files_report,
+    create_regex_excluded_files_report,
+    write_pre_commit_metrics,
+)
 
 if TYPE_CHECKING:
+    import pytest
     from pyfakefs.fake_filesystem import FakeFilesystem
 
 
@@ -28,7 +35,12 @@ def test_create_excluded_files_report__hook_with_excludes__should_be_two(fs: Fak
 
     result = create_excluded_files_report([hook])
 
-    assert result == {"total_excluded_files": 2, "hooks": [{"hook_id": "test-hook", "excluded_files_count": 2}]}
+    assert result == {
+        "total_excluded_files": 2,
+        "hooks": [
+            {"hook_id": "test-hook", "excluded_files_count": 2, "excluded_paths": {"file1.txt": 1, "dir1": 1}},
+        ],
+    }
 
 
 def test_create_excluded_files_report__two_hooks_with_excludes__should_be_three_in_total(fs: FakeFilesystem) -> None:
@@ -43,12 +55,59 @@ def test_create_excluded_files_report__two_hooks_with_excludes__should_be_three_
     assert result == {
         "total_excluded_files": 3,
         "hooks": [
-            {"hook_id": "test-hook-1", "excluded_files_count": 1},
-            {"hook_id": "test-hook-2", "excluded_files_count": 2},
+            {"hook_id": "test-hook-1", "excluded_files_count": 1, "excluded_paths": {"file1.txt": 1}},
+            {"hook_id": "test-hook-2", "excluded_files_count": 2, "excluded_paths": {"file1.txt": 1, "dir1": 1}},
         ],
     }
 
 
+def test_create_excluded_files_report__paths_shared_by_hooks__should_count_each_path_once(
+    fs: FakeFilesystem, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    fs.create_file("dir1/file1.txt")
+    counted_paths: list[Path] = []
+    monkeypatch.setattr(
+        "pre_commit_excludes.hook_utils.count_files_on_disk", lambda path: counted_paths.append(path) or 1
+    )
+    hooks = [Hook(f"test-hook-{index}", [Path("dir1")]) for index in range(3)]
+
+    result = create_excluded_files_report(hooks)
+
+    assert result["total_excluded_files"] == 3
+    assert counted_paths == [Path("dir1")]
+
+
+def test_create_regex_excluded_files_report__regex_excludes__should_count_matched_files() -> None:
+    path_index = PathIndex(Path(), ["file1.txt", "dir1/file2.txt", "dir1/file3.lock", "uv.lock"])
+    hook = Hook.from_hook_config(Path(), {"id": "test-hook", "exclude": r"(?x)^(file1\.txt|.*\.lock$)"})
+    hook_without_matches = Hook.from_hook_config(Path(), {"id": "other-hook", "exclude": "missing/"})
+
+    result = create_regex_excluded_files_report([hook, hook_without_matches], path_index)
+
+    assert result == {
+        "total_excluded_files": 3,
+        "hooks": [
+            {
+                "hook_id": "test-hook",
+                "excluded_files_count": 3,
+                "excluded_patterns": {r"file1\.txt": 1, r".*\.lock$": 2},
+            },
+        ],
+    }
+
+
+def test_create_exclude_hotspots_report__should_list_files_excluded_by_most_hooks() -> None:
+    path_index = PathIndex(Path(), ["file1.txt", "third_party/lib.h", "uv.lock"])
+    hooks = [
+        Hook.from_hook_config(Path(), {"id": "test-hook-1", "exclude": "^third_party/"}),
+        Hook.from_hook_config(Path(), {"id": "test-hook-2", "exclude": r"(?x)^(third_party/|.*\.lock$)"}),
+    ]
+
+    result = create_exclude_hotspots_report(hooks, path_index, 1)
+
+    assert result == [{"file": "third_party/lib.h", "hook_ids": ["test-hook-1", "test-hook-2"]}]
+
+
 def test_write_pre_commit_metrics__should_create_file_with_json_data(fs: FakeFilesystem) -> None:  # noqa: ARG001
     output_data = {"total_excluded_files": 5, "hooks": [{"hook_id": "test-hook", "excluded_files_count": 5}]}
     output_file = Path("output/metrics.json")
@@ -57,3 +116,17 @@ def test_write_pre_commit_metrics__should_create_file_with_json_data(fs: FakeFil
 
     assert output_file.exists()
     assert json.loads(output_file.read_text()) == output_data
+
+
+def test_create_excluded_files_report__with_path_index__should_count_indexed_files() -> None:
+    path_index = PathIndex(Path(), ["file1.txt", "dir1/file2.txt", "dir1/file3.txt"])
+    hook = Hook("test-hook", [Path("file1.txt"), Path("dir1/")])
+
+    result = create_excluded_files_report([hook], path_index)
+
+    assert result == {
+        "total_excluded_files": 3,
+        "hooks": [
+            {"hook_id": "test-hook", "excluded_files_count": 3, "excluded_paths": {"file1.txt": 1, "dir1": 2}},
+        ],
+    }
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import json
+import stat
+from pathlib import Path
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+import pytest
+
+from dev_tools.run_hooks import FILE_CHECKS, decode, get_file_tags, load_configured_hooks, main
+from dev_tools.utils.pre_commit_utils import get_hook_by_id
+
+if TYPE_CHECKING:
+    from pyfakefs.fake_filesystem import FakeFilesystem
+
+REPO_ROOT = Path(__file__).parent.parent
+
+
+def create_config(fs: FakeFilesystem, hooks: list[dict]) -> str:
+    # JSON is a subset of YAML
+    fs.create_file(
+        ".pre-commit-config.yaml",
+        contents=json.dumps(
+            {"repos": [{"repo": "https://github.com/hofbi/dev-tools", "rev": "1.0.0", "hooks": hooks}]}
+        ),
+    )
+    return ".pre-commit-config.yaml"
+
+
+@pytest.mark.parametrize("hook_id", FILE_CHECKS)
+def test_file_checks__match_defaults_of_hooks_manifest(hook_id: str) -> None:
+    manifest_hook = get_hook_by_id(hook_id, REPO_ROOT)
+    check = FILE_CHECKS[hook_id]
+
+    assert check.args == tuple(manifest_hook.get("args", []))
+    assert check.stages == tuple(manifest_hook.get("stages", []))
+    assert check.types == tuple(manifest_hook.get("types", ["file"]))
+    assert check.types_or == tuple(manifest_hook.get("types_or", []))
+    assert check.exclude_types == tuple(manifest_hook.get("exclude_types", []))
+    assert check.exclude == manifest_hook.get("exclude", "^$")
+
+
+def test_load_configured_hooks__ignores_local_and_non_file_check_hooks() -> None:
+    config = {
+        "repos": [
+            {"repo": "local", "hooks": [{"id": "check-jira-reference-in-todo"}]},
+            {
+                "repo": "https://github.com/hofbi/dev-tools",
+                "hooks": [
+                    {"id": "check-ownership"},
+                    {"id": "check-number-of-lines-count", "args": ["--max-lines=3"], "types_or": ["python"]},
+                ],
+            },
+        ]
+    }
+
+    hooks = load_configured_hooks(config)
+
+    assert [hook.id for hook in hooks] == ["check-number-of-lines-count"]
+    assert hooks[0].args.max_lines == 3
+    assert hooks[0].types_or == {"python"}
+
+
+def test_load_configured_hooks__without_args__uses_manifest_args() -> None:
+    config = {
+        "repos": [{"repo": "https://github.com/hofbi/dev-tools", "hooks": [{"id": "check-number-of-lines-count"}]}]
+    }
+
+    assert load_configured_hooks(config)[0].args.max_lines == 50
+
+
+@pytest.mark.parametrize(
+    ("hook_stage", "expected_hook_ids"),
+    [
+        ("pre-commit", ["check-number-of-lines-count"]),
+        ("pre-push", ["check-number-of-lines-count", "check-jira-reference-in-todo"]),
+        ("manual", ["check-max-one-sentence-per-line"]),
+    ],
+)
+def test_load_configured_hooks__selects_hooks_of_stage(hook_stage: str, expected_hook_ids: list[str]) -> None:
+    config = {
+        "default_stages": ["commit", "pre-push"],
+        "repos": [
+            {
+                "repo": "https://github.com/hofbi/dev-tools",
+                "hooks": [
+                    {"id": "check-number-of-lines-count"},
+                    {"id": "check-jira-reference-in-todo", "stages": ["push"]},
+                    {"id": "check-max-one-sentence-per-line", "stages": ["manual"]},
+                ],
+            }
+        ],
+    }
+
+    assert [hook.id for hook in load_configured_hooks(config, hook_stage)] == expected_hook_ids
+
+
+def test_load_configured_hooks__without_stages__runs_in_every_stage() -> None:
+    config = {
+        "repos": [{"repo": "https://github.com/hofbi/dev-tools", "hooks": [{"id": "check-number-of-lines-count"}]}]
+    }
+
+    assert [hook.id for hook in load_configured_hooks(config, "post-checkout")] == ["check-number-of-lines-count"]
+
+
+def test_get_file_tags__for_executable_without_extension__uses_shebang(fs: FakeFilesystem) -> None:
+    fs.create_file("script", contents="#!/bin/bash\necho hello\n", st_mode=stat.S_IFREG | 0o755)
+
+    assert get_file_tags(Path("script"), b"#!/bin/bash\necho hello\n") >= {
+        "file",
+        "executable",
+        "shell",
+        "bash",
+        "text",
+    }
+
+
+def test_main__decodes_every_file_once_and_reports_diagnostics_per_hook(
+    fs: FakeFilesystem, capsys: pytest.CaptureFixture
+) -> None:
+    config = create_config(
+        fs,
+        [
+            {"id": "check-number-of-lines-count", "args": ["--max-lines=2"]},
+            {"id": "check-shellscript-set-options"},
+            {"id": "check-jira-reference-in-todo"},
+        ],
+    )
+    fs.create_file("run.sh", contents="#!/bin/bash\nset -euxo pipefail\n# TODO: fix\n")
+    fs.create_file("README.md", contents="# TODO(ABC-123): correct\n")
+
+    with patch("dev_tools.run_hooks.decode", side_effect=decode) as decode_mock:
+        assert main(["run", f"--config={config}", "run.sh", "README.md"]) == 1
+
+    assert decode_mock.call_count == 2
+    output = capsys.readouterr().out
+    assert "- hook id: check-number-of-lines-count\nrun.sh (3 lines) exceeds 2 lines." in output
+    assert "- hook id: check-jira-reference-in-todo\n\nThe following TODOs" in output
+    assert "run.sh:3: error: '# TODO: fix'" in output
+    assert "check-shellscript-set-options" not in output
+
+
+def test_main__respects_hook_excludes(fs: FakeFilesystem, capsys: pytest.CaptureFixture) -> None:
+    config = create_config(fs, [{"id": "check-jira-reference-in-todo", "exclude": "^third_party/"}])
+    fs.create_file("third_party/lib.cc", contents="// TODO: fix\n")
+
+    assert main(["run", f"--config={config}", "third_party/lib.cc"]) == 0
+    assert not capsys.readouterr().out
+
+
+def test_main__with_hook_stage__runs_only_hooks_of_stage(fs: FakeFilesystem) -> None:
+    config = create_config(fs, [{"id": "check-jira-reference-in-todo", "stages": ["manual"]}])
+    fs.create_file("main.cc", contents="// TODO: fix\n")
+
+    assert main(["run", f"--config={config}", "main.cc"]) == 0
+    assert main(["run", f"--config={config}", "--hook-stage=manual", "main.cc"]) == 1
+
+
+def test_main__without_filenames__checks_staged_files(fs: FakeFilesystem) -> None:
+    config = create_config(fs, [{"id": "check-jira-reference-in-todo"}])
+    fs.create_file("main.cc", contents="// TODO: fix\n")
+
+    with patch("subprocess.check_output", return_value=b"main.cc\0deleted.cc\0") as check_output_mock:
+        assert main(["run", f"--config={config}"]) == 1
+
+    assert check_output_mock.call_args.args[0][:3] == ["git", "diff", "--staged"]
@@ -629,3 +629,91 @@ def test_sync_versions_for_missing_file_should_return_error(fs: FakeFilesystem)
 
     assert not changed
     assert errors
+
+
+def test_sync_tool_versions_with_check_should_print_diff_without_writing(
+    capsys: pytest.CaptureFixture[str],
+    fs: FakeFilesystem,
+) -> None:
+    repo_root = Path("Repo")
+    fs.create_dir(repo_root)
+    module_file = repo_root / "MODULE.bazel"
+    module_file.write_text('RUST_VERSION = "1.87.0"\n')
+
+    config_path = repo_root / ".versions.yaml"
+    _write_versions_config(
+        config_path,
+        {
+            "name": "tool-versions",
+            "sync_versions": [
+                {
+                    "name": "rust",
+                    "version": "1.91.0",
+                    "entries": [{"path": "MODULE.bazel", "pattern": 'RUST_VERSION\\s*=\\s*"THE_VERSION"'}],
+                },
+            ],
+        },
+    )
+
+    result = main(["--config", str(config_path), "--check"])
+    output = capsys.readouterr().out
+
+    assert result == 1
+    assert module_file.read_text() == 'RUST_VERSION = "1.87.0"\n'
+    assert "--- a/Repo/MODULE.bazel" in output
+    assert '-RUST_VERSION = "1.87.0"' in output
+    assert '+RUST_VERSION = "1.91.0"' in output
+
+
+def test_sync_tool_versions_with_check_for_synced_versions_should_pass(
+    capsys: pytest.CaptureFixture[str],
+    fs: FakeFilesystem,
+) -> None:
+    repo_root = Path("Repo")
+    fs.create_dir(repo_root)
+    module_file = repo_root / "MODULE.bazel"
+    module_file.write_text('RUST_VERSION = "1.91.0"\n')
+
+    config_path = repo_root / ".versions.yaml"
+    _write_versions_config(
+        config_path,
+        {
+            "name": "tool-versions",
+            "sync_versions": [
+                {
+                    "name": "rust",
+                    "version": "1.91.0",
+                    "entries": [{"path": "MODULE.bazel", "pattern": 'RUST_VERSION\\s*=\\s*"THE_VERSION"'}],
+                },
+            ],
+        },
+    )
+
+    result = main(["--config", str(config_path), "--check"])
+
+    assert result == 0
+    assert capsys.readouterr().out == ""
+
+
+def test_sync_versions_with_check_for_shared_file_should_report_each_location_once(
+    capsys: pytest.CaptureFixture[str],
+    fs: FakeFilesystem,
+) -> None:
+    repo_root = Path("Repo")
+    fs.create_dir(repo_root)
+    config_file = repo_root / ".pre-commit-config.yaml"
+    config_file.write_text("rust: 1.87.0\npython: 3.13\n")
+
+    specs = [
+        VersionSyncSpec(name="rust", version="1.91.0", entries=[SyncEntry(config_file, "rust:\\s*([0-9.]+)")]),
+        VersionSyncSpec(name="python", version="3.14", entries=[SyncEntry(config_file, "python:\\s*([0-9.]+)")]),
+    ]
+    changed, errors = sync_versions(specs, check=True)
+    output = capsys.readouterr().out
+
+    assert changed
+    assert errors == []
+    assert config_file.read_text() == "rust: 1.87.0\npython: 3.13\n"
+    assert output.count("--- a/Repo/.pre-commit-config.yaml") == 2
+    assert "+rust: 1.91.0" in output
+    assert "+python: 3.14" in output
@@ -2,7 +2,9 @@
 # Licensed under the MIT License.
 
 import re
+import sys
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 from pyfakefs.fake_filesystem import FakeFilesystem
@@ -11,6 +13,9 @@ from dev_tools.sync_vscode_config import (
     DictOverwriteRecord,
     combine_lists_without_duplicates,
     load_devcontainer_config,
+    main,
+    merge_dicts_recursively,
+    report_settings_findings,
     update_vscode_extensions_json,
     update_vscode_settings_json,
 )
@@ -201,3 +206,106 @@ def test__combine_lists_without_duplicates__combines_overlapping_lists() -> None
     expected_items = {"a", "b", "c", "d"}
     assert all(item in combined for item in expected_items)
     assert len(combined) == len(expected_items)
+
+
+def test__update_vscode_settings_json__for_unchanged_settings__does_not_write(fs: FakeFilesystem) -> None:  # noqa: ARG001
+    settings_json_path = Path("settings.json")
+    settings_json_path.write_text('{\n  // keep me\n  "redhat.telemetry.enabled": false\n}')
+
+    overwrite_records = update_vscode_settings_json(settings_json_path, {"redhat.telemetry.enabled": False})
+
+    assert overwrite_records == []
+    assert "// keep me" in settings_json_path.read_text()
+
+
+def test__update_vscode_extensions_json__for_known_recommendations__does_not_write(fs: FakeFilesystem) -> None:  # noqa: ARG001
+    extensions_json_path = Path("extensions.json")
+    extensions_json_path.write_text('{"recommendations": ["charliermarsh.ruff", "ms-python.python"]}')
+
+    update_vscode_extensions_json(extensions_json_path, ["ms-python.python"])
+
+    assert extensions_json_path.read_text() == '{"recommendations": ["charliermarsh.ruff", "ms-python.python"]}'
+
+
+def test__main__for_unchanged_files_since_last_sync__skips_parsing(
+    fs: FakeFilesystem,  # noqa: ARG001
+    simple_devcontainer_json: str,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    Path("devcontainer.json").write_text(simple_devcontainer_json)
+    argv = [
+        "sync-vscode-config",
+        "--devcontainer-json=devcontainer.json",
+        "--settings-path=.vscode/settings.json",
+        "--extensions-path=.vscode/extensions.json",
+        "--state-file=state.json",
+    ]
+    monkeypatch.setattr(sys, "argv", argv)
+    assert main() == 0
+
+    with patch("dev_tools.sync_vscode_config.load_devcontainer_config") as load_devcontainer_config_mock:
+        assert main() == 0
+        load_devcontainer_config_mock.assert_not_called()
+
+        Path(".vscode/settings.json").write_text("{}")
+        assert main() == 0
+        load_devcontainer_config_mock.assert_called_once()
+
+
+def test__main__after_upgrade_of_dev_tools__syncs_again(
+    fs: FakeFilesystem,  # noqa: ARG001
+    simple_devcontainer_json: str,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    Path("devcontainer.json").write_text(simple_devcontainer_json)
+    monkeypatch.setattr(sys, "argv", ["sync-vscode-config", "--devcontainer-json=devcontainer.json", "--state-file=s"])
+    monkeypatch.setattr("dev_tools.sync_vscode_config.get_tool_version", lambda: "1.0.0")
+    assert main() == 0
+
+    monkeypatch.setattr("dev_tools.sync_vscode_config.get_tool_version", lambda: "2.0.0")
+    with patch("dev_tools.sync_vscode_config.load_devcontainer_config") as load_devcontainer_config_mock:
+        assert main() == 0
+        load_devcontainer_config_mock.assert_called_once()
+
+
+def test__update_vscode_settings_json__merges_nested_settings(fs: FakeFilesystem) -> None:  # noqa: ARG001
+    settings_json_path = Path("settings.json")
+    settings_json_path.write_text('{"files.exclude": {"**/.git": true, "**/bazel-*": false}}')
+
+    overwrite_records = update_vscode_settings_json(
+        settings_json_path, {"files.exclude": {"**/bazel-*": True, "**/.cache": True}}
+    )
+
+    assert read_text_without_whitespace(settings_json_path) == (
+        '{"files.exclude":{"**/.git":true,"**/bazel-*":true,"**/.cache":true}}'
+    )
+    assert overwrite_records == [
+        DictOverwriteRecord(key="**/bazel-*", old_value=False, new_value=True, parent_keys=("files.exclude",))
+    ]
+
+
+def test__merge_dicts_recursively__records_key_path_of_every_change() -> None:
+    settings = {"[python]": {"editor.rulers": [88], "editor.tabSize": 4}, "a": {"b": 1}}
+
+    records = merge_dicts_recursively(settings, {"[python]": {"editor.rulers": [120], "editor.tabSize": 4}, "a": 2})
+
+    assert settings == {"[python]": {"editor.rulers": [120], "editor.tabSize": 4}, "a": 2}
+    assert [(record.key_path, record.added) for record in records] == [
+        (("[python]", "editor.rulers"), False),
+        (("a",), False),
+    ]
+
+
+def test__merge_dicts_recursively__for_equal_value_of_other_type__records_overwrite() -> None:
+    records = merge_dicts_recursively({"a": 1}, {"a": True})
+
+    assert records == [DictOverwriteRecord(key="a", old_value=1, new_value=True)]
+
+
+def test__report_settings_findings__for_many_findings__reports_limited_number(caplog: pytest.LogCaptureFixture) -> None:
+    findings = [DictOverwriteRecord(str(index), old_value=False, new_value=True) for index in range(25)]
+
+    report_settings_findings(findings, Path("settings.json"))
+
+    assert len(caplog.records) == 21
+    assert "5 more values were overwritten" in caplog.records[-1].getMessage()
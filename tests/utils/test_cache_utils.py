@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from dev_tools.utils.cache_utils import get_cache_directory
+
+if TYPE_CHECKING:
+    import pytest
+
+
+def test_get_cache_directory__respects_xdg_cache_home(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("XDG_CACHE_HOME", "/home/user/.cache")
+
+    assert get_cache_directory("dev-tools") == Path("/home/user/.cache/dev-tools")
+
+
+def test_get_cache_directory__without_xdg_cache_home__uses_home(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("XDG_CACHE_HOME", raising=False)
+    monkeypatch.setenv("HOME", "/home/user")
+
+    assert get_cache_directory("dev-tools") == Path("/home/user/.cache/dev-tools")
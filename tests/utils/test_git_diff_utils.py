@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import subprocess
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pytest
+
+from dev_tools.utils.git_diff_utils import LineRange, get_changed_lines, iter_lines_in_ranges, parse_changed_lines
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+DIFF = """diff --git a/docs/guide.md b/docs/guide.md
+index 1111111..2222222 100644
+--- a/docs/guide.md
++++ b/docs/guide.md
+@@ -3 +3 @@ Title
+-Old line.
++New line.
+@@ -10,0 +11,2 @@ Section
++++ an added line starting with two plus signs
++Another added line.
+@@ -20,2 +21,0 @@ Other section
+-Removed line.
+-Removed line.
+diff --git a/removed.md b/removed.md
+deleted file mode 100644
+index 3333333..0000000
+--- a/removed.md
++++ /dev/null
+@@ -1 +0,0 @@
+-Removed file.
+diff --git a/new.md b/new.md
+new file mode 100644
+index 0000000..4444444
+--- /dev/null
++++ b/new.md
+@@ -0,0 +1,3 @@
++New file.
++With three
++lines.
+"""
+
+
+@pytest.fixture(autouse=True)
+def clear_changed_lines_cache() -> Iterator[None]:
+    get_changed_lines.cache_clear()
+    yield
+    get_changed_lines.cache_clear()
+
+
+def test_parse_changed_lines__returns_added_and_modified_line_ranges_per_file() -> None:
+    assert parse_changed_lines(DIFF) == {
+        Path("docs/guide.md"): [LineRange(3, 4), LineRange(11, 13)],
+        Path("new.md"): [LineRange(1, 4)],
+    }
+
+
+def test_iter_lines_in_ranges__skips_lines_outside_of_ranges() -> None:
+    lines = ["one", "two", "three", "four"]
+
+    assert list(iter_lines_in_ranges(lines, [LineRange(2, 3), LineRange(4, 6)])) == [(2, "two"), (4, "four")]
+
+
+def test_get_changed_lines__for_modified_file__returns_changed_lines(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    Path("file.md").write_text("one\ntwo\nthree\n")
+    subprocess.check_call(["git", "init", "-q"])  # noqa: S607
+    subprocess.check_call(["git", "add", "file.md"])  # noqa: S607
+    subprocess.check_call(["git", "-c", "user.name=test", "-c", "user.email=test@test", "commit", "-qm", "init"])  # noqa: S607
+    Path("file.md").write_text("one\nchanged\nthree\nfour\n")
+
+    assert get_changed_lines("HEAD") == {Path("file.md"): [LineRange(2, 3), LineRange(4, 5)]}
+
+
+def test_get_changed_lines__for_paths_with_space_and_quote__returns_unquoted_paths(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    subprocess.check_call(["git", "init", "-q"])  # noqa: S607
+    subprocess.check_call(
+        ["git", "-c", "user.name=test", "-c", "user.email=test@test", "commit", "-qm", "init", "--allow-empty"]  # noqa: S607
+    )
+    Path("a b.md").write_text("TODO: foo\n")
+    Path('quote"ä.md').write_text("line\n")
+    subprocess.check_call(["git", "add", "."])  # noqa: S607
+
+    assert get_changed_lines("HEAD") == {Path("a b.md"): [LineRange(1, 2)], Path('quote"ä.md'): [LineRange(1, 2)]}
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import os
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+import pytest
+
+from dev_tools.utils.pre_commit_utils import MANIFEST_FILE, get_hook_by_id, load_hook_manifest
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+MANIFEST = """- id: first-hook
+  name: First hook
+  entry: first-hook
+  language: python
+- id: second-hook
+  name: Second hook
+  entry: second-hook
+  language: python
+"""
+
+
+@pytest.fixture
+def manifest_file(tmp_path: Path) -> Path:
+    manifest_file = tmp_path / MANIFEST_FILE
+    manifest_file.write_text(MANIFEST)
+    return manifest_file
+
+
+def test_load_hook_manifest__applies_defaults_and_keeps_order(manifest_file: Path) -> None:
+    manifest = load_hook_manifest(manifest_file)
+
+    assert [hook["id"] for hook in manifest.hooks] == ["first-hook", "second-hook"]
+    assert manifest.get_hook("second-hook")["types"] == ["file"]
+
+
+def test_load_hook_manifest__for_unchanged_file__parses_it_once(manifest_file: Path) -> None:
+    with patch("pre_commit.clientlib.load_manifest", return_value=[{"id": "first-hook"}]) as load_manifest_mock:
+        manifest = load_hook_manifest(manifest_file)
+
+        assert load_hook_manifest(manifest_file) is manifest
+        assert get_hook_by_id("first-hook", manifest_file.parent) == {"id": "first-hook"}
+
+    load_manifest_mock.assert_called_once()
+
+
+def test_load_hook_manifest__for_changed_file__parses_it_again(manifest_file: Path) -> None:
+    load_hook_manifest(manifest_file)
+    manifest_file.write_text(MANIFEST.replace("second-hook", "third-hook"))
+    # Make the change visible on file systems with a coarse modification time
+    os.utime(manifest_file, ns=(0, 0))
+
+    assert [hook["id"] for hook in load_hook_manifest(manifest_file).hooks] == ["first-hook", "third-hook"]
+
+
+def test_get_hook_by_id__unknown_hook__raises(manifest_file: Path) -> None:
+    with pytest.raises(ValueError, match="unknown-hook not found in hooks manifest"):
+        get_hook_by_id("unknown-hook", manifest_file.parent)
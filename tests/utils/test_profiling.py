@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING
+
+import pytest
+
+from dev_tools.utils.profiling import (
+    PROFILE_ENVIRONMENT_VARIABLE,
+    accumulate,
+    count,
+    count_file,
+    find_profile_output,
+    get_profiler,
+    profiled,
+    span,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from pathlib import Path
+
+
+@profiled
+def main(argv: Sequence[str] | None = None) -> int:
+    with span("phase", files=len(argv or [])), span("git ls-files", "subprocess"):
+        count("cache_hits", 2)
+        count("cache_misses")
+    with accumulate("hook"):
+        pass
+    return 3
+
+
+def test_profiled__when_disabled__runs_without_profiler(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.delenv(PROFILE_ENVIRONMENT_VARIABLE, raising=False)
+
+    assert main([]) == 3
+    assert get_profiler() is None
+    assert not list(tmp_path.iterdir())
+
+
+def test_profiled__with_profile_argument__appends_json_lines(tmp_path: Path) -> None:
+    profile = tmp_path / "profile.jsonl"
+
+    assert main([f"--profile={profile}"]) == 3
+    assert main([f"--profile={profile}"]) == 3
+
+    events = [json.loads(line) for line in profile.read_text().splitlines()]
+    assert [event["name"] for event in events] == ["git ls-files", "phase", __name__, "counters"] * 2
+    assert events[0]["cat"] == "subprocess"
+    assert events[1]["args"] == {"files": 1}
+    assert events[1]["dur"] >= events[0]["dur"]
+    assert events[3]["args"] == {"cache_hits": 2, "cache_misses": 1, "hook_seconds": pytest.approx(0, abs=1)}
+    assert get_profiler() is None
+
+
+def test_profiled__with_environment_variable__writes_chrome_trace(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    profile = tmp_path / "trace.json"
+    monkeypatch.setenv(PROFILE_ENVIRONMENT_VARIABLE, str(profile))
+
+    assert main([]) == 3
+
+    trace = json.loads(profile.read_text())
+    assert [event["ph"] for event in trace["traceEvents"]] == ["X", "X", "X", "C"]
+
+
+def test_find_profile_output__prefers_argument_over_environment_variable(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    monkeypatch.setenv(PROFILE_ENVIRONMENT_VARIABLE, "environment.jsonl")
+    profile = tmp_path / "argument.jsonl"
+
+    assert find_profile_output(["file.txt", "--profile", str(profile)]) == profile
+    assert str(find_profile_output(["file.txt"])) == "environment.jsonl"
+
+
+def test_count_file__counts_files_and_bytes(tmp_path: Path) -> None:
+    file = tmp_path / "file.txt"
+    file.write_text("12345")
+
+    @profiled
+    def count_files(_: Sequence[str]) -> int:
+        count_file(file)
+        count_file(tmp_path / "missing.txt")
+        profiler = get_profiler()
+        assert profiler is not None
+        assert profiler.counters == {"files": 2, "bytes_read": 5}
+        return 0
+
+    assert count_files([f"--profile={tmp_path / 'profile.jsonl'}"]) == 0
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from unittest.mock import Mock
+
+import pytest
+
+from dev_tools.utils.git_hook_utils import create_default_parser
+from dev_tools.utils.result_cache import check_files, compute_blob_hash, compute_cache_key
+
+if TYPE_CHECKING:
+    from argparse import Namespace
+    from pathlib import Path
+
+
+@pytest.fixture
+def files(tmp_path: Path) -> list[Path]:
+    files = [tmp_path / "a.txt", tmp_path / "b.txt"]
+    for file in files:
+        file.write_text(f"content of {file.name}")
+    return files
+
+
+def create_args(files: list[Path], cache_file: Path, *extra_args: str) -> Namespace:
+    parser = create_default_parser(cacheable=True)
+    parser.add_argument("--option", default="default")
+    return parser.parse_args(["--cache", f"--cache-file={cache_file}", *extra_args, *map(str, files)])
+
+
+def test_create_default_parser__without_cacheable__has_no_cache_arguments() -> None:
+    assert not hasattr(create_default_parser().parse_args([]), "cache")
+
+
+def test_check_files__without_cache__checks_all_files(files: list[Path], tmp_path: Path) -> None:
+    check = Mock(side_effect=lambda filename: [filename.name])
+    args = create_default_parser(cacheable=True).parse_args(list(map(str, files)))
+
+    assert check_files(args, "hook", check) == {files[0]: ["a.txt"], files[1]: ["b.txt"]}
+    assert check_files(args, "hook", check) == {files[0]: ["a.txt"], files[1]: ["b.txt"]}
+    assert check.call_count == 4
+    assert not (tmp_path / "cache").exists()
+
+
+def test_check_files__with_warm_cache__replays_diagnostics(files: list[Path], tmp_path: Path) -> None:
+    check = Mock(side_effect=lambda filename: [filename.name] if filename.name == "a.txt" else [])
+    args = create_args(files, tmp_path / "cache" / "results.sqlite")
+
+    assert check_files(args, "hook", check) == {files[0]: ["a.txt"], files[1]: []}
+    assert check_files(args, "hook", check) == {files[0]: ["a.txt"], files[1]: []}
+    assert check.call_count == 2
+
+
+def test_check_files__for_changed_file__checks_only_changed_file(files: list[Path], tmp_path: Path) -> None:
+    check = Mock(return_value=[])
+    args = create_args(files, tmp_path / "results.sqlite")
+    check_files(args, "hook", check)
+    check.reset_mock()
+
+    files[1].write_text("changed content")
+    check_files(args, "hook", check)
+
+    check.assert_called_once_with(files[1])
+
+
+@pytest.mark.parametrize(
+    ("hook_id", "extra_args"),
+    [
+        ("other-hook", []),
+        ("hook", ["--option=other"]),
+    ],
+)
+def test_check_files__for_other_hook_or_arguments__checks_all_files(
+    files: list[Path], tmp_path: Path, hook_id: str, extra_args: list[str]
+) -> None:
+    check = Mock(return_value=[])
+    check_files(create_args(files, tmp_path / "results.sqlite"), "hook", check)
+    check.reset_mock()
+
+    check_files(create_args(files, tmp_path / "results.sqlite", *extra_args), hook_id, check)
+
+    assert check.call_count == 2
+
+
+def test_check_files__for_unusable_cache_file__checks_all_files(files: list[Path], tmp_path: Path) -> None:
+    check = Mock(return_value=["error"])
+    cache_file = tmp_path / "no_database"
+    cache_file.write_text("not a database")
+
+    assert check_files(create_args(files, cache_file), "hook", check) == {files[0]: ["error"], files[1]: ["error"]}
+
+
+def test_compute_cache_key__ignores_filenames_and_cache_options(files: list[Path], tmp_path: Path) -> None:
+    assert compute_cache_key("hook", create_args(files, tmp_path / "a")) == compute_cache_key(
+        "hook", create_args(files[:1], tmp_path / "b")
+    )
+
+
+def test_compute_blob_hash__for_executable_file__differs(files: list[Path]) -> None:
+    blob_hash = compute_blob_hash(files[0])
+    files[0].chmod(0o755)
+
+    assert compute_blob_hash(files[0]) != blob_hash
@@ -39,6 +39,19 @@ def test_find_owner_for_non_codeowners_file_at_root(
     assert get_owners(file_in_repo, 0) == {"file.txt": ()}
 
 
+def test_find_owner_for_trailing_backslash_in_codeowners_keeps_it_literal(
+    fs: FakeFilesystem, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    repo_dir = Path("repo").resolve()
+    file_in_repo = repo_dir / "file.txt"
+    fs.create_file(file_in_repo)
+    fs.create_file(repo_dir / "CODEOWNERS", contents="* @org/devs\\\n")
+
+    monkeypatch.setattr("whoowns.find_owner.check_git", lambda *_, **__: str(repo_dir))
+
+    assert get_owners(file_in_repo, 0) == {"file.txt": ("@org/devs\\",)}
+
+
 def test_get_subitems(fs: FakeFilesystem) -> None:
     # Level 0
     parent_dir = Path("parent").resolve()
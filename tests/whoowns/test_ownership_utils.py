@@ -7,7 +7,14 @@ from pathlib import Path
 from typing import TYPE_CHECKING
 
 import pytest
-from whoowns.ownership_utils import GithubOwnerShip, find_codeowners_file, get_ownership_entries
+from whoowns.ownership_utils import (
+    GithubOwnerShip,
+    OwnerShipRules,
+    OwnerShipStatistics,
+    find_codeowners_file,
+    get_ownership_entries,
+    split_codeowners_line,
+)
 
 if TYPE_CHECKING:
     from pyfakefs.fake_filesystem import FakeFilesystem
@@ -198,6 +205,42 @@ def test_github_ownership_get_owners__second_overwrites_first__should_be_differe
     assert unit.get_owners(repo_dir / "foo" / "bar" / "something_else") == ("bar-owner",)
 
 
+def test_github_ownership_get_owners__with_statistics__counts_attempts_and_hits_per_rule(fs: FakeFilesystem) -> None:
+    repo_dir = _create_repo_path_with_codeowners_file(
+        fs,
+        codeowners_content="""*.md docs
+/src/ devs""",
+    )
+    statistics = OwnerShipStatistics()
+    unit = GithubOwnerShip(repo_dir, repo_dir / ".github" / "CODEOWNERS", statistics)
+
+    assert unit.get_owners(repo_dir / "src" / "main.py") == ("devs",)
+    assert unit.get_owners(repo_dir / "README.md") == ("docs",)
+    assert unit.get_owners(repo_dir / "docs" / "index.md") == ("docs",)
+
+    assert statistics.lookups == 3
+    assert statistics.regex_evaluations == 2
+    assert statistics.regex_compilations == 1
+    assert {(rule.pattern, rule.line_number, rule.attempts, rule.hits) for rule in statistics.rules} == {
+        ("/src/", 2, 3, 1),
+        ("*.md", 1, 2, 2),
+    }
+
+
+def test_ownership_statistics_report__lists_most_expensive_rules_first(fs: FakeFilesystem) -> None:
+    repo_dir = _create_repo_path_with_codeowners_file(fs, codeowners_content="/docs/ docs\n/src/ devs")
+    statistics = OwnerShipStatistics()
+    unit = GithubOwnerShip(repo_dir, repo_dir / ".github" / "CODEOWNERS", statistics)
+    unit.get_owners(repo_dir / "docs" / "index.md")
+    # The last rule is matched first
+    statistics.rules[0].seconds = 1.0
+
+    report = statistics.report(limit=1).splitlines()
+
+    assert report[0] == "Ownership lookups: 1"
+    assert report[-1] == "  line 2 /src/: 1000.000ms, 1 attempts, 0 hits"
+
+
 def test_get_ownership_entries_should_be_parsed_correctly(fs: FakeFilesystem) -> None:
     codeowners = Path("CODEOWNERS")
     fs.create_file(
@@ -215,6 +258,38 @@ def test_get_ownership_entries_should_be_parsed_correctly(fs: FakeFilesystem) ->
     assert result[1].owners == ("devs", "management")
 
 
+@pytest.mark.parametrize(
+    ("line", "expected_fields"),
+    [
+        ("/src/ devs management\n", ["/src/", "devs", "management"]),
+        ("# comment\n", []),
+        ("   \n", []),
+        ("/src/ devs # inline comment\n", ["/src/", "devs"]),
+        ("/src/#1 devs\n", ["/src/#1", "devs"]),
+        ("/my\\ folder/ devs\n", ["/my folder/", "devs"]),
+        ("/\\#hash devs # comment\n", ["/#hash", "devs"]),
+        ("/src/\\* devs\n", ["/src/\\*", "devs"]),
+        ("/src/ devs\\\n", ["/src/", "devs\\"]),
+    ],
+)
+def test_split_codeowners_line__returns_pattern_and_owners(line: str, expected_fields: list[str]) -> None:
+    assert split_codeowners_line(line) == expected_fields
+
+
+def test_ownership_rules_from_file__shares_equal_owners(fs: FakeFilesystem) -> None:
+    codeowners = Path("CODEOWNERS")
+    fs.create_file(codeowners, contents="/src/ devs\n# comment\n/docs/ docs\n/tests/ devs\n")
+
+    rules = OwnerShipRules.from_file(codeowners)
+
+    assert [(entry.pattern, entry.owners, entry.line_number) for entry in rules.iter_entries_by_precedence()] == [
+        ("/tests/", ("devs",), 4),
+        ("/docs/", ("docs",), 3),
+        ("/src/", ("devs",), 1),
+    ]
+    assert rules.get_owners(0) is rules.get_owners(2)
+
+
 def test_is_file_covered_by_pattern__exact_entries__returns_true() -> None:
     path = "a/b/c"
     prefix = "a/b/c"